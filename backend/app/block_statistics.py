@@ -0,0 +1,205 @@
+"""
+블록별 시간 가중 KPI 수집기
+엔티티 도착/이탈, 스크립트 실행 시작/종료, 하류 블록 대기(go ... wait) 같은 상태 변화가 있을 때만
+O(1)로 누적하므로 스텝 스냅샷을 모으거나 이력을 훑지 않고 언제든 조회할 수 있습니다.
+
+블록 상태 (우선순위 순서)
+- blocked: 블록의 엔티티가 가득 찬 하류 블록 앞에서 기다리는 중
+- busy: 스크립트 실행 중
+- idle: 엔티티는 있지만 스크립트가 실행되지 않음
+- starved: 엔티티도 없고 실행 중인 스크립트도 없음
+
+분포(p50/p90/p99)는 고정 크기 분위수 스케치로 누적합니다 (quantile_sketch 참고).
+- 블록별: 체류 시간(블록 이탈 시), 하류 블록 대기 시간(대기열에서 빠져나올 때)
+- 시스템 전체: 리드 타임(dispose 시 생성 시각부터), 하류 블록 대기 시간
+"""
+from typing import Any, Dict, Optional
+
+from .quantile_sketch import QuantileSketch
+
+BLOCK_STATES = ('busy', 'idle', 'blocked', 'starved')
+BUSY, IDLE, BLOCKED, STARVED = range(4)  # BLOCK_STATES 인덱스
+
+
+class BlockStatistics:
+    """블록 하나의 누적 통계 (WIP 면적, 상태별 시간, 처리량, 체류 시간)"""
+    
+    __slots__ = ('env', 'registry', 'start_time', 'last_time', 'state', 'state_time', 'wip', 'wip_area', 'max_wip',
+                 'executing', 'blocked_entities', 'arrivals', 'departures', 'cycle_time_total', 'cycle_time_max',
+                 'cycle_times', 'waiting_times')
+    
+    def __init__(self, env: Any, start_time: float = 0.0, registry: Optional['StatisticsRegistry'] = None):
+        self.env = env
+        self.registry = registry  # 시스템 전체 분포 (리드 타임, 대기 시간)
+        self.start_time = start_time
+        self.last_time = start_time
+        self.state = STARVED
+        self.state_time = [0.0] * len(BLOCK_STATES)
+        self.wip = 0
+        self.wip_area = 0.0  # 엔티티 수 x 시간
+        self.max_wip = 0
+        self.executing = False
+        self.blocked_entities = 0
+        self.arrivals = 0
+        self.departures = 0
+        self.cycle_time_total = 0.0
+        self.cycle_time_max = 0.0
+        self.cycle_times = QuantileSketch()
+        self.waiting_times = QuantileSketch()
+    
+    # 상태 변화마다 호출되므로 누적은 메서드 안에 직접 풀어 씀 (경과 시간이 0이면 건너뜀)
+    
+    def _advance(self, now: float):
+        """마지막 변경 이후 경과 시간을 현재 상태와 WIP에 누적"""
+        elapsed = now - self.last_time
+        if elapsed > 0:
+            self.wip_area += self.wip * elapsed
+            self.state_time[self.state] += elapsed
+            self.last_time = now
+    
+    def _update_state(self):
+        self.state = (BLOCKED if self.blocked_entities else BUSY if self.executing
+                      else IDLE if self.wip else STARVED)
+    
+    def entity_entered(self, entity: Any):
+        now = self.env.now
+        if now != self.last_time:
+            self._advance(now)
+        self.wip = wip = self.wip + 1
+        if wip > self.max_wip:
+            self.max_wip = wip
+        self.arrivals += 1
+        entity.entered_at = now
+        if self.state == STARVED:
+            self.state = BLOCKED if self.blocked_entities else BUSY if self.executing else IDLE
+    
+    def entity_left(self, entity: Any):
+        now = self.env.now
+        if now != self.last_time:
+            self._advance(now)
+        self.wip -= 1
+        self.departures += 1
+        entered_at = entity.entered_at
+        if entered_at is not None:
+            cycle_time = now - entered_at
+            self.cycle_time_total += cycle_time
+            if cycle_time > self.cycle_time_max:
+                self.cycle_time_max = cycle_time
+            self.cycle_times.add(cycle_time)
+        if not self.wip:
+            self._update_state()
+    
+    def set_executing(self, executing: bool):
+        now = self.env.now
+        if now != self.last_time:
+            self._advance(now)
+        self.executing = executing
+        self._update_state()
+    
+    def change_blocked(self, delta: int, waited: Optional[float] = None):
+        """블록의 엔티티가 하류 블록 대기열에 들어가거나(+1) 빠져나옴(-1, waited는 대기한 시간)"""
+        self._advance(self.env.now)
+        self.blocked_entities += delta
+        self._update_state()
+        if waited is not None:
+            self.waiting_times.add(waited)
+            if self.registry is not None:
+                self.registry.waiting_times.add(waited)
+    
+    def entity_disposed(self, entity: Any):
+        """엔티티가 이 블록에서 배출됨 (생성 시각부터의 리드 타임 기록)"""
+        if self.registry is not None and entity.created_at is not None:
+            self.registry.lead_times.add(self.env.now - entity.created_at)
+    
+    def restart(self):
+        """현재 상태(WIP, 실행/대기 여부)는 유지하고 누적값만 지금부터 다시 모음 (워밍업 제거)"""
+        now = self.env.now
+        self._advance(now)
+        self.start_time = self.last_time = now
+        self.state_time = [0.0] * len(BLOCK_STATES)
+        self.wip_area = 0.0
+        self.max_wip = self.wip
+        self.arrivals = 0
+        self.departures = 0
+        self.cycle_time_total = 0.0
+        self.cycle_time_max = 0.0
+        self.cycle_times = QuantileSketch()
+        self.waiting_times = QuantileSketch()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 시점까지의 KPI"""
+        now = self.env.now
+        self._advance(now)
+        elapsed = now - self.start_time
+        state_time = dict(zip(BLOCK_STATES, self.state_time))
+        return {
+            'average_wip': self.wip_area / elapsed if elapsed > 0 else 0.0,
+            'current_wip': self.wip,
+            'max_wip': self.max_wip,
+            'state_time': state_time,
+            'utilization': state_time['busy'] / elapsed if elapsed > 0 else 0.0,
+            'arrivals': self.arrivals,
+            'departures': self.departures,
+            'throughput_per_hour': self.departures / elapsed * 3600 if elapsed > 0 else 0.0,
+            'average_cycle_time': self.cycle_time_total / self.departures if self.departures else 0.0,
+            'max_cycle_time': self.cycle_time_max,
+            'cycle_time_quantiles': self.cycle_times.summary(),
+            'waiting_time_quantiles': self.waiting_times.summary(),
+        }
+
+
+class StatisticsRegistry:
+    """엔진의 블록별 통계 수집기 목록 (블록 생성 시 등록)"""
+    
+    def __init__(self):
+        self.env: Optional[Any] = None
+        self.enabled = False  # False면 블록에 수집기를 붙이지 않음 (최대 처리 속도용)
+        self.blocks: Dict[str, tuple] = {}  # block_id -> (블록 이름, BlockStatistics)
+        self.lead_times = QuantileSketch()  # 생성부터 dispose까지
+        self.waiting_times = QuantileSketch()  # 모든 블록의 하류 블록 대기 시간
+    
+    def reset(self, env: Optional[Any] = None, enabled: bool = True):
+        self.env = env
+        self.enabled = env is not None and enabled
+        self.blocks = {}
+        self.lead_times = QuantileSketch()
+        self.waiting_times = QuantileSketch()
+    
+    def restart(self):
+        """모든 블록과 시스템 분포의 누적값을 현재 시각부터 다시 모음"""
+        if not self.enabled:
+            return
+        for _, stats in self.blocks.values():
+            stats.restart()
+        self.lead_times = QuantileSketch()
+        self.waiting_times = QuantileSketch()
+    
+    def register(self, block_id: str, block_name: str) -> BlockStatistics:
+        stats = BlockStatistics(self.env, self.env.now, self)
+        self.blocks[block_id] = (block_name, stats)
+        return stats
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """블록 ID별 KPI (이름 포함)"""
+        if not self.enabled:
+            return {}
+        return {block_id: {'name': name, **stats.snapshot()} for block_id, (name, stats) in self.blocks.items()}
+    
+    def distributions(self) -> Dict[str, Dict[str, Any]]:
+        """시스템 전체 리드 타임/대기 시간 분포 요약"""
+        if not self.enabled:
+            return {}
+        return {'lead_time': self.lead_times.summary(), 'waiting_time': self.waiting_times.summary()}
+    
+    def sketches(self) -> Dict[str, Any]:
+        """복제/워커 간 병합용 스케치 원본 (QuantileSketch.to_dict 형식)"""
+        if not self.enabled:
+            return {}
+        return {
+            'lead_time': self.lead_times.to_dict(),
+            'waiting_time': self.waiting_times.to_dict(),
+            'blocks': {
+                block_id: {'cycle_time': stats.cycle_times.to_dict(), 'waiting_time': stats.waiting_times.to_dict()}
+                for block_id, (_, stats) in self.blocks.items()
+            },
+        }
@@ -33,6 +33,8 @@ class Settings(BaseSettings):
     
     # Performance settings
     max_concurrent_simulations: int = Field(default=10, env="MAX_CONCURRENT_SIMULATIONS")
+    session_idle_ttl: int = Field(default=1800, env="SESSION_IDLE_TTL")  # seconds before an idle session is evicted
+    model_cache_size: int = Field(default=32, env="MODEL_CACHE_SIZE")  # validated layouts kept for repeated setup (0 disables)
     request_timeout: int = Field(default=300, env="REQUEST_TIMEOUT")
     
     # Health check settings
@@ -3,56 +3,75 @@ Integer Variable Manager
 
 This module manages integer variables separately from boolean signals.
 It provides similar interface to SimpleSignalManager for consistency.
+Values live in a slot-indexed VariableStore; this class is the name-based facade.
 """
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional
 from app.core.signal_types import SignalType, TypedSignal
+from app.core.variable_store import INTEGER, VariableStore, VariableView
 
 
 class IntegerVariableManager:
     """Manager for integer type variables"""
     
-    def __init__(self):
-        self.variables: Dict[str, int] = {}
-        self.initial_variables: Dict[str, int] = {}
+    def __init__(self, store: Optional[VariableStore] = None):
+        # May share a store with the signal manager (the engine uses one store)
+        self.store = store if store is not None else VariableStore()
+        # Read-only name -> value view (legacy dict API)
+        self.variables = VariableView(self.store, INTEGER)
+        self._slots = self.store.slots[INTEGER]
+    
+    @property
+    def initial_variables(self) -> Dict[str, int]:
+        return dict(self.store.initial_items(INTEGER))
+    
+    def slot(self, variable_name: str) -> int:
+        """Slot of a variable (scripts resolve names once, at compile time)"""
+        return self.store.slot(INTEGER, variable_name)
     
     def initialize_variables(self, variables: Dict[str, int]):
         """Initialize integer variables"""
-        self.initial_variables = variables.copy()
-        self.variables = variables.copy()
+        # Compiled code holds slots into the store, so update it in place
+        self.store.initialize(INTEGER, variables)
     
     def set_variable(self, variable_name: str, value: int):
         """Set integer variable value"""
         if not isinstance(value, int) or isinstance(value, bool):
             raise ValueError(f"Value must be an integer, not {type(value)}")
-        self.variables[variable_name] = value
+        slot = self._slots.get(variable_name)
+        if slot is None:
+            slot = self.store.slot(INTEGER, variable_name)
+        self.store.set(slot, value)
     
     def get_variable(self, variable_name: str, default: int = 0) -> int:
         """Get integer variable value"""
-        return self.variables.get(variable_name, default)
+        return self.store.get(INTEGER, variable_name, default)
     
     def get_all_variables(self) -> Dict[str, int]:
         """Get all integer variables"""
-        return self.variables.copy()
+        return dict(self.store.items(INTEGER))
     
     def reset(self):
         """Reset variables to initial values"""
-        self.variables = self.initial_variables.copy()
+        self.store.reset(INTEGER)
     
     def add_variable(self, variable_name: str, initial_value: int = 0):
         """Add new integer variable"""
         if not isinstance(initial_value, int) or isinstance(initial_value, bool):
             raise ValueError(f"Initial value must be an integer, not {type(initial_value)}")
-        if variable_name not in self.variables:
-            self.variables[variable_name] = initial_value
-            self.initial_variables[variable_name] = initial_value
+        if not self.store.is_defined(INTEGER, variable_name):
+            self.store.define(self.store.slot(INTEGER, variable_name), initial_value)
+    
+    def subscribe(self, variable_name: str, event):
+        """Register a one-shot event fired when the variable's value actually changes"""
+        self.store.subscribe(self.store.slot(INTEGER, variable_name), event)
     
     def has_variable(self, variable_name: str) -> bool:
         """Check if variable exists"""
-        return variable_name in self.variables
+        return self.store.is_defined(INTEGER, variable_name)
     
     def perform_operation(self, variable_name: str, operation: str, operand: int) -> int:
         """Perform arithmetic operation on variable"""
-        if variable_name not in self.variables:
+        if not self.has_variable(variable_name):
             # Auto-create variable if it doesn't exist
             self.add_variable(variable_name, 0)
         
@@ -78,7 +97,7 @@ class IntegerVariableManager:
     
     def compare(self, variable_name: str, operator: str, operand: int) -> bool:
         """Compare variable with operand"""
-        if variable_name not in self.variables:
+        if not self.has_variable(variable_name):
             # Auto-create with default value if doesn't exist
             self.add_variable(variable_name, 0)
         
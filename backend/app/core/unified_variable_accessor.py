@@ -55,6 +55,16 @@ class UnifiedVariableAccessor:
         return (name in self.signal_manager.signals or 
                 self.integer_manager.has_variable(name))
     
+    def subscribe(self, names, event):
+        """Fire event once any of the named signals/variables changes value.
+        
+        Names are registered with both managers because a wait condition may
+        reference an integer variable that is only created later at run time.
+        """
+        for name in names:
+            self.signal_manager.subscribe(name, event)
+            self.integer_manager.subscribe(name, event)
+    
     def get_all_variables(self) -> Dict[str, TypedSignal]:
         """Get all variables as TypedSignal objects"""
         result = {}
@@ -95,29 +105,38 @@ class UnifiedVariableAccessor:
         self.signal_manager.initialize_signals(boolean_signals)
         self.integer_manager.initialize_variables(integer_variables)
     
+    @staticmethod
+    def config_entry(signal_type: str, name: str, value: Union[bool, int], initial_value: Union[bool, int, None]) -> dict:
+        """One variable in frontend config format"""
+        if signal_type == "boolean":
+            return {
+                "id": f"signal_{name}",
+                "name": name,
+                "type": "boolean",
+                "value": value,
+                "initialValue": initial_value if initial_value is not None else False
+            }
+        return {
+            "id": f"int_{name}",
+            "name": name,
+            "type": "integer",
+            "value": value,
+            "initialValue": initial_value if initial_value is not None else 0
+        }
+    
     def to_config_format(self) -> list:
         """Convert to frontend config format"""
         result = []
         
         # Add boolean signals
+        initial_signals = self.signal_manager.initial_signals
         for name, value in self.signal_manager.get_all_signals().items():
-            result.append({
-                "id": f"signal_{name}",
-                "name": name,
-                "type": "boolean",
-                "value": value,
-                "initialValue": self.signal_manager.initial_signals.get(name, False)
-            })
+            result.append(self.config_entry("boolean", name, value, initial_signals.get(name)))
         
         # Add integer variables
+        initial_variables = self.integer_manager.initial_variables
         for name, value in self.integer_manager.get_all_variables().items():
-            result.append({
-                "id": f"int_{name}",
-                "name": name,
-                "type": "integer",
-                "value": value,
-                "initialValue": self.integer_manager.initial_variables.get(name, 0)
-            })
+            result.append(self.config_entry("integer", name, value, initial_variables.get(name)))
         
         return result
     
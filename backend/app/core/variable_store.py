@@ -0,0 +1,190 @@
+"""
+Slot-indexed Variable Store
+
+Boolean signals and integer variables live in one flat table. A name is
+resolved to an integer slot once (scripts do it at compile time) and values
+are then read and written by slot index, without hashing the name.
+
+Booleans and integers are separate namespaces, so the same name can own one
+slot of each kind. A slot can exist before its variable is defined (a script
+may reference an integer that an ``int`` command creates later); its value is
+then None. Slots are never removed, so compiled code stays bound across
+re-initialization and reset.
+
+Every change bumps the store version and records it on the slot, so callers
+can ask which slots changed since a version they saw.
+"""
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+BOOLEAN = 'boolean'
+INTEGER = 'integer'
+
+# Compact a subscription list once this many already-fired events pile up
+_WAITER_COMPACT_THRESHOLD = 16
+
+
+class VariableStore:
+    """Flat, slot-indexed storage for signals and integer variables"""
+    
+    def __init__(self):
+        # Name -> slot per kind (the managers keep a reference for their fast path)
+        self.slots: Dict[str, Dict[str, int]] = {BOOLEAN: {}, INTEGER: {}}
+        self.names: List[str] = []
+        self.kinds: List[str] = []
+        self.values: List[Any] = []  # None means "not defined"
+        self.initial: List[Any] = []  # value restored by reset (None: undefined after reset)
+        self.versions: List[int] = []  # store version of the slot's last change
+        self.version = 0
+        # Defined slots per kind, in definition order
+        self._order: Dict[str, List[int]] = {BOOLEAN: [], INTEGER: []}
+        # Slots with an initial value per kind, in definition order
+        self._initial_order: Dict[str, List[int]] = {BOOLEAN: [], INTEGER: []}
+        # Change subscriptions: slot -> pending simpy.Event list
+        self._waiters: Dict[int, List[Any]] = {}
+    
+    def slot(self, kind: str, name: str) -> int:
+        """Slot for a name, allocating an undefined one on first use"""
+        slots = self.slots[kind]
+        slot = slots.get(name)
+        if slot is None:
+            slot = len(self.values)
+            slots[name] = slot
+            self.names.append(name)
+            self.kinds.append(kind)
+            self.values.append(None)
+            self.initial.append(None)
+            self.versions.append(0)
+        return slot
+    
+    def find(self, kind: str, name: str) -> Optional[int]:
+        """Slot for a name if one was ever allocated"""
+        return self.slots[kind].get(name)
+    
+    def get(self, kind: str, name: str, default: Any = None) -> Any:
+        slot = self.slots[kind].get(name)
+        if slot is None:
+            return default
+        value = self.values[slot]
+        return default if value is None else value
+    
+    def is_defined(self, kind: str, name: str) -> bool:
+        slot = self.slots[kind].get(name)
+        return slot is not None and self.values[slot] is not None
+    
+    def set(self, slot: int, value: Any) -> bool:
+        """Write a slot; returns True (and wakes subscribers) when the value changed"""
+        old_value = self.values[slot]
+        if old_value is None:
+            self._order[self.kinds[slot]].append(slot)
+        elif old_value == value:
+            return False
+        self.values[slot] = value
+        self.version += 1
+        self.versions[slot] = self.version
+        if self._waiters:
+            self._notify(slot)
+        return True
+    
+    def define(self, slot: int, value: Any):
+        """Define a slot with an initial value that reset() restores"""
+        if self.initial[slot] is None:
+            self._initial_order[self.kinds[slot]].append(slot)
+        self.initial[slot] = value
+        self.set(slot, value)
+    
+    def initialize(self, kind: str, values: Mapping[str, Any]):
+        """Replace all variables of a kind (in place; slots and bindings survive)"""
+        # Pending subscriptions belong to the previous run and are dropped, not woken
+        self.clear_waiters(kind)
+        self._clear(kind)
+        initial_order = self._initial_order[kind]
+        for slot in initial_order:
+            self.initial[slot] = None
+        initial_order.clear()
+        for name, value in values.items():
+            self.define(self.slot(kind, name), value)
+    
+    def reset(self, kind: str):
+        """Restore a kind's initial values"""
+        self.clear_waiters(kind)
+        self._clear(kind)
+        for slot in self._initial_order[kind]:
+            self.set(slot, self.initial[slot])
+    
+    def _clear(self, kind: str):
+        order = self._order[kind]
+        for slot in order:
+            self.values[slot] = None
+            self.versions[slot] = self.version + 1
+        if order:
+            self.version += 1
+        order.clear()
+    
+    def initial_items(self, kind: str) -> Iterator[Tuple[str, Any]]:
+        """(name, initial value) of a kind, in definition order"""
+        return ((self.names[slot], self.initial[slot]) for slot in self._initial_order[kind])
+    
+    def items(self, kind: str) -> Iterator[Tuple[str, Any]]:
+        """(name, value) of the defined variables of a kind, in definition order"""
+        names = self.names
+        values = self.values
+        return ((names[slot], values[slot]) for slot in self._order[kind])
+    
+    def count(self, kind: str) -> int:
+        return len(self._order[kind])
+    
+    def changed_since(self, version: int) -> List[int]:
+        """Slots whose value changed after the given store version"""
+        return [slot for slot, slot_version in enumerate(self.versions) if slot_version > version]
+    
+    def subscribe(self, slot: int, event):
+        """Register a one-shot event fired when the slot's value actually changes"""
+        waiters = self._waiters.setdefault(slot, [])
+        if len(waiters) >= _WAITER_COMPACT_THRESHOLD:
+            # Drop events already woken through another slot
+            waiters[:] = [waiter for waiter in waiters if not waiter.triggered]
+        waiters.append(event)
+    
+    def clear_waiters(self, kind: str):
+        for slot in [slot for slot in self._waiters if self.kinds[slot] == kind]:
+            del self._waiters[slot]
+    
+    def _notify(self, slot: int):
+        """Wake the events subscribed to a slot"""
+        waiters = self._waiters.pop(slot, None)
+        if waiters:
+            for waiter in waiters:
+                if not waiter.triggered:
+                    waiter.succeed()
+
+
+class VariableView(Mapping):
+    """Read-only name -> value mapping over one kind of a store (the managers' legacy dict API)"""
+    
+    def __init__(self, store: VariableStore, kind: str):
+        self.store = store
+        self.kind = kind
+    
+    def __getitem__(self, name: str) -> Any:
+        value = self.store.get(self.kind, name)
+        if value is None:
+            raise KeyError(name)
+        return value
+    
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.store.is_defined(self.kind, name)
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.store.get(self.kind, name, default)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self.store.items(self.kind))
+    
+    def __len__(self) -> int:
+        return self.store.count(self.kind)
+    
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.store.items(self.kind))
+    
+    def __repr__(self):
+        return repr(self.copy())
@@ -0,0 +1,207 @@
+"""
+교착(deadlock)/무한 반복(livelock) 감지기
+헤드리스 실행이 진행 없이 시간만 소모하면 일찍 끝내고 원인을 알려줍니다.
+
+- 교착: 실행 중인 모든 스크립트가 wait / go ... wait / seize에서 멈춘 채(park)
+  엔티티 이동도 새로운 park도 없이 deadlock_timeout(설정의 settings.deadlockTimeout) 동안 지속
+  (엔티티 속성 wait는 0.01초 간격 확인만 반복되므로 이벤트 큐가 비지 않아도 감지)
+  진행 여부는 timeout의 절반 간격으로만 확인하므로 멈춘 뒤 timeout ~ 1.5 x timeout 사이에 종료
+- 무한 반복: 같은 시각에 연속으로 처리된 이벤트 수가 한도를 넘음 (지연 없는 jump 루프 등)
+
+진단은 멈춘 블록들의 대기 그래프(wait-for graph)로 만듭니다.
+- wait: 조건이 참조하는 신호/변수를 쓰는 블록 (스크립트를 정적으로 훑어 찾음)
+- go ... wait: 대상 블록 (go any는 후보 블록 전부)
+- seize: 자원 이름 (점유한 블록은 추적하지 않음)
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from .simple_script_compiler import OP_DELAY, OP_GO, OP_INT_OPERATION, OP_JUMP, OP_SEIZE, OP_SIGNAL_SET, OP_WAIT
+
+logger = logging.getLogger(__name__)
+
+# 같은 시각에 연속으로 처리해도 되는 이벤트 수 (이보다 많으면 무한 반복으로 판단)
+ZERO_TIME_EVENT_LIMIT = 100000
+
+
+def find_instruction_line(program: Any, kind: str, operand: Any) -> int:
+    """멈춘 명령의 스크립트 줄 번호 (1부터, 찾지 못하면 0)"""
+    for index, instruction in enumerate(program.instructions):
+        if instruction.operand is operand:
+            return index + 1
+        if kind == 'seize' and instruction.opcode == OP_SEIZE and instruction.operand[0] == operand:
+            return index + 1
+    return 0
+
+
+def variable_writers(blocks: Iterable[Any]) -> Dict[str, List[str]]:
+    """신호/정수 변수 이름 -> 값을 바꾸는 명령이 있는 블록 이름 목록"""
+    writers: Dict[str, List[str]] = {}
+    for block in blocks:
+        for instruction in block.program.instructions:
+            if instruction.opcode in (OP_SIGNAL_SET, OP_INT_OPERATION):
+                names = writers.setdefault(instruction.operand[0], [])
+                if block.name not in names:
+                    names.append(block.name)
+    return writers
+
+
+def zero_time_loops(program: Any) -> List[Dict[str, Any]]:
+    """시간이 걸리는 명령 없이 되돌아가는 jump (같은 시각에 계속 반복될 수 있는 루프)"""
+    loops = []
+    instructions = program.instructions
+    for index, instruction in enumerate(instructions):
+        if instruction.opcode != OP_JUMP or not 0 <= instruction.operand <= index:
+            continue
+        body = instructions[instruction.operand:index]
+        if not any(i.opcode in (OP_DELAY, OP_WAIT, OP_SEIZE) or (i.opcode == OP_GO and (i.operand.delay or i.operand.blocking))
+                   for i in body):
+            loops.append({'line': index + 1, 'text': instruction.text, 'loop_start': instruction.operand + 1})
+    return loops
+
+
+def find_cycle(graph: Dict[str, List[str]]) -> List[str]:
+    """대기 그래프에서 순환 하나 (없으면 빈 목록)"""
+    visiting: List[str] = []
+    done = set()
+    
+    def visit(node):
+        if node in visiting:
+            return visiting[visiting.index(node):]
+        if node in done or node not in graph:
+            return None
+        visiting.append(node)
+        for next_node in graph[node]:
+            cycle = visit(next_node)
+            if cycle:
+                return cycle
+        visiting.pop()
+        done.add(node)
+        return None
+    
+    for node in graph:
+        cycle = visit(node)
+        if cycle:
+            return list(cycle)
+    return []
+
+
+class DeadlockDetector:
+    """엔진의 진행 상황을 확인해 교착/무한 반복을 판단하고 진단을 만듦"""
+    
+    def __init__(self, timeout: Optional[float] = None, zero_time_limit: int = ZERO_TIME_EVENT_LIMIT):
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.zero_time_limit = zero_time_limit
+        self.blocks: List[Any] = []
+        self.journal: Any = None
+        self.token: Optional[tuple] = None
+        self.stuck_since = 0.0
+        self.next_check = float('inf')
+    
+    def attach(self, blocks: Iterable[Any], journal: Any, start_time: float = 0.0):
+        """감시할 블록과 이동 기록 연결 (시뮬레이션 설정 후)"""
+        self.blocks = list(blocks)
+        self.journal = journal
+        self.token = None
+        self.stuck_since = start_time
+        self.next_check = start_time + self.timeout / 2 if self.timeout is not None else float('inf')
+    
+    def _progress(self) -> tuple:
+        """이동 저널 순번(엔티티 이동/변경)과 park 횟수 - 바뀌지 않았으면 그 사이 아무 스크립트도 진행하지 않음"""
+        return self.journal.seq, sum(block.park_count for block in self.blocks)
+    
+    def _all_parked(self) -> bool:
+        """멈춘 블록이 있고 실행 중인 스크립트가 모두 멈춰 있는지"""
+        parked = False
+        for block in self.blocks:
+            if block.is_executing_script:
+                if block.waiting_on is None:
+                    return False
+                parked = True
+        return parked
+    
+    def check(self, now: float) -> Optional[Dict[str, Any]]:
+        """next_check 시각에 호출 - 교착이면 진단 반환"""
+        token = self._progress()
+        if token != self.token or not self._all_parked():
+            self.token = token
+            self.stuck_since = now
+            self.next_check = now + self.timeout / 2
+            return None
+        if now - self.stuck_since >= self.timeout:
+            return self.diagnose(now, 'deadlock')
+        self.next_check = self.stuck_since + self.timeout
+        return None
+    
+    def parked_blocks(self) -> List[Any]:
+        return [block for block in self.blocks if block.waiting_on is not None]
+    
+    def diagnose(self, now: float, reason: str) -> Dict[str, Any]:
+        """멈춘 블록의 줄/신호/대상과 대기 그래프 순환, 무한 반복 루프 후보를 정리"""
+        writers = variable_writers(self.blocks)
+        graph: Dict[str, List[str]] = {}
+        entries = []
+        unwritten = set()
+        for block in self.parked_blocks():
+            kind, operand = block.waiting_on
+            line = find_instruction_line(block.program, kind, operand)
+            entry = {'block': block.name, 'line': line, 'waiting_for': kind,
+                     'text': block.program.instructions[line - 1].text if line else ''}
+            if kind == 'wait':
+                names = operand[1]
+                if names is None:
+                    entry['signals'] = []
+                    entry['note'] = 'condition depends on entity attributes (polled)'
+                    edges = []
+                else:
+                    entry['signals'] = list(names)
+                    edges = [writer for name in names for writer in writers.get(name, [])]
+                    unwritten.update(name for name in names if name not in writers)
+            elif kind == 'go':
+                edges = list(operand.candidates) if operand.candidates else [operand.target_block]
+                entry['targets'] = edges
+            else:
+                entry['resource'] = operand
+                edges = []
+            graph[block.name] = edges
+            entries.append(entry)
+        
+        diagnosis: Dict[str, Any] = {
+            'reason': reason,
+            'time': now,
+            'blocks': entries,
+            'cycle': find_cycle(graph),
+            'unwritten_signals': sorted(unwritten),
+        }
+        if reason == 'livelock':
+            diagnosis['running'] = [
+                {'block': block.name, 'zero_time_loops': zero_time_loops(block.program)}
+                for block in self.blocks if block.is_executing_script and block.waiting_on is None
+            ]
+        diagnosis['message'] = self.describe(diagnosis)
+        logger.warning(diagnosis['message'])
+        return diagnosis
+    
+    @staticmethod
+    def describe(diagnosis: Dict[str, Any]) -> str:
+        """진단 요약 한 줄"""
+        if diagnosis['reason'] == 'livelock':
+            parts = [f"{r['block']} line {loop['line']} ({loop['text']})"
+                     for r in diagnosis['running'] for loop in r['zero_time_loops']]
+            running = ', '.join(parts) or ', '.join(r['block'] for r in diagnosis['running']) or 'unknown blocks'
+            return f"Livelock at {diagnosis['time']:.2f}s: zero-time events keep repeating in {running}"
+        parts = []
+        for entry in diagnosis['blocks']:
+            if entry['waiting_for'] == 'go':
+                detail = f"space in {', '.join(entry['targets'])}"
+            elif entry['waiting_for'] == 'seize':
+                detail = f"resource {entry['resource']}"
+            else:
+                detail = f"signals {', '.join(entry['signals'])}" if entry['signals'] else 'entity attributes'
+            parts.append(f"{entry['block']} line {entry['line']} ({entry['text']}) waits for {detail}")
+        message = f"Deadlock at {diagnosis['time']:.2f}s: " + '; '.join(parts)
+        if diagnosis['cycle']:
+            message += f" | cycle: {' -> '.join(diagnosis['cycle'] + diagnosis['cycle'][:1])}"
+        if diagnosis['unwritten_signals']:
+            message += f" | never written: {', '.join(diagnosis['unwritten_signals'])}"
+        return message
@@ -0,0 +1,148 @@
+"""
+go ... to any(...) 명령의 대상 선택 (디스패치 규칙)
+여러 후보 블록 중 엔티티를 받을 수 있는 블록을 규칙에 따라 고릅니다.
+
+- 후보 블록은 엔티티가 들어오고 나갈 때마다 그룹에 알려 가용성 인덱스를 갱신 (폴링 없음)
+- first_free / shortest_queue: (키, 후보 번호) 힙, 오래된 항목은 꺼낼 때 버림 - O(log N)
+- round_robin: 마지막으로 고른 후보 다음부터 가용 후보 탐색
+- least_utilized: 후보별 시간 가중 점유율을 증분 누적해 가장 낮은 후보 선택
+- 고를 블록이 없고 wait이면 그룹 대기열에 넣고, 후보 중 하나에 자리가 나면 바로 옮김
+- 스크립트가 대상 블록을 알 수 없으므로 보낸 블록의 스크립트는 on_dispatch로 바로 시작 (execute와 같음)
+"""
+import heapq
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_RULES = ('first_free', 'round_robin', 'shortest_queue', 'least_utilized')
+
+
+class DispatchGroup:
+    """같은 후보 목록/규칙을 쓰는 go any 명령들이 공유하는 디스패처"""
+    
+    def __init__(self, blocks: List[Any], rule: str = 'first_free', start_time: float = 0.0,
+                 on_dispatch: Optional[Callable[[Any], None]] = None):
+        if rule not in DISPATCH_RULES:
+            raise ValueError(f"Unknown dispatch rule: {rule}")
+        self.blocks = blocks
+        self.rule = rule
+        self.on_dispatch = on_dispatch  # 엔티티를 보낸 블록의 스크립트 시작
+        self.index = {block.id: i for i, block in enumerate(blocks)}
+        
+        # 가용성 힙: (키, 후보 번호) - 키가 현재 값과 다르거나 자리가 없으면 꺼낼 때 버림
+        self.heap: List[Tuple[Any, int]] = []
+        self.next_index = 0  # round_robin 다음 탐색 시작 위치
+        
+        # least_utilized용 후보별 점유 면적 (엔티티 수 x 시간)
+        self.start_time = start_time
+        self.areas = [0.0] * len(blocks)
+        self.counts = [len(block.entities_in_block) for block in blocks]
+        self.last_times = [start_time] * len(blocks)
+        
+        # 고를 블록이 없을 때의 대기열: (-우선순위, 도착 순번, 엔티티, 출발 블록, 깨우기 이벤트, 대기 시작 시간)
+        self.waiters: List[tuple] = []
+        self.sequence = 0
+        
+        for block in blocks:
+            block.dispatch_groups.append(self)
+        for i in range(len(blocks)):
+            self._push(i)
+    
+    def _key(self, i: int) -> Any:
+        if self.rule == 'shortest_queue':
+            return len(self.blocks[i].entities_in_block)
+        return 0
+    
+    def _push(self, i: int):
+        if self.blocks[i].can_accept_entity():
+            heapq.heappush(self.heap, (self._key(i), i))
+            # 오래된 항목이 쌓이면 다시 만듦
+            if len(self.heap) > 4 * len(self.blocks) + 16:
+                self.heap = [(self._key(j), j) for j in range(len(self.blocks)) if self.blocks[j].can_accept_entity()]
+                heapq.heapify(self.heap)
+    
+    def block_changed(self, block: Any, now: float):
+        """후보 블록의 엔티티 수가 바뀜 (블록의 add_entity/remove_entity에서 호출)"""
+        i = self.index[block.id]
+        count = len(block.entities_in_block)
+        self.areas[i] += self.counts[i] * (now - self.last_times[i])
+        self.last_times[i] = now
+        freed = count < self.counts[i]
+        self.counts[i] = count
+        if self.rule != 'first_free' or freed:
+            self._push(i)
+        if freed and self.waiters:
+            self._admit_waiting(now)
+    
+    def select(self, now: float) -> Optional[Any]:
+        """규칙에 따라 엔티티를 받을 수 있는 후보 블록 선택 (없으면 None)"""
+        blocks = self.blocks
+        if self.rule == 'round_robin':
+            count = len(blocks)
+            for step in range(count):
+                i = (self.next_index + step) % count
+                if blocks[i].can_accept_entity():
+                    self.next_index = i + 1
+                    return blocks[i]
+            return None
+        if self.rule == 'least_utilized':
+            best, best_value = None, None
+            elapsed = now - self.start_time
+            for i, block in enumerate(blocks):
+                if not block.can_accept_entity():
+                    continue
+                area = self.areas[i] + self.counts[i] * (now - self.last_times[i])
+                value = area / (block.max_capacity * elapsed) if elapsed > 0 else 0.0
+                if best_value is None or value < best_value:
+                    best, best_value = block, value
+            return best
+        heap = self.heap
+        while heap:
+            key, i = heap[0]
+            if blocks[i].can_accept_entity() and key == self._key(i):
+                return blocks[i]
+            heapq.heappop(heap)
+        return None
+    
+    def wait_for_entry(self, env: Any, entity: Any, source_block: Any, wakeup: Any, priority: int = 0):
+        """후보가 모두 가득 찬 경우 자리가 날 때까지 대기 (옮긴 뒤 wakeup 발생)"""
+        self.sequence += 1
+        heapq.heappush(self.waiters, (-priority, self.sequence, entity, source_block, wakeup, env.now))
+        if source_block.stats is not None:
+            source_block.stats.change_blocked(1)
+    
+    def _admit_waiting(self, now: float):
+        waiters = self.waiters
+        while waiters:
+            target_block = self.select(now)
+            if target_block is None:
+                return
+            _, _, entity, source_block, wakeup, since = heapq.heappop(waiters)
+            source_block.blocked_time += now - since
+            source_block.blocked_count += 1
+            if source_block.stats is not None:
+                source_block.stats.change_blocked(-1, now - since)
+            if entity not in source_block.entities_in_block:
+                wakeup.succeed(False)
+                continue
+            moved = target_block.receive_entity(entity, source_block)
+            if moved:
+                entity.movement_completed = True
+                entity.movement_requested = False
+                self.dispatched(target_block)
+            wakeup.succeed(moved)
+    
+    def dispatched(self, target_block: Any):
+        """엔티티를 target_block으로 보낸 뒤 호출"""
+        if self.on_dispatch is not None:
+            self.on_dispatch(target_block)
+    
+    def get_statistics(self, now: float) -> Dict[str, Any]:
+        """후보별 시간 가중 점유율과 대기 엔티티 수"""
+        elapsed = now - self.start_time
+        utilization = {}
+        for i, block in enumerate(self.blocks):
+            area = self.areas[i] + self.counts[i] * (now - self.last_times[i])
+            utilization[block.name] = area / (block.max_capacity * elapsed) if elapsed > 0 else 0.0
+        return {'rule': self.rule, 'waiting': len(self.waiters), 'utilization': utilization}
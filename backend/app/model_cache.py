@@ -0,0 +1,87 @@
+"""
+컴파일된 모델 캐시
+프런트엔드는 같은 레이아웃을 /simulation/setup, /simulation/step(config_data)으로 반복해서 보내므로
+설정 내용의 해시를 키로 검증/변환 결과를 재사용하고, 설정은 런타임 상태만 새로 만듭니다.
+
+- 키: 설정을 키 정렬 JSON으로 직렬화한 SHA-256 (config_fingerprint, 키 순서와 무관)
+- 값: 검증된 SimulationSetup, 엔진 설정(simple_config), 초기 신호 - 세션 간에 공유하므로 읽기 전용
+- 크기는 settings.model_cache_size로 제한하고 가장 오래 쓰지 않은 항목부터 제거 (0이면 사용 안 함)
+- 스크립트 컴파일 결과는 엔진의 신호/정수 저장소에 바인딩되므로 엔진마다 따로 보관
+  (SimpleSimulationEngine.programs, 스크립트 줄 목록이 키)
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable
+
+from .config import settings
+
+# 엔진 하나가 보관하는 스크립트 컴파일 결과 수
+PROGRAM_CACHE_SIZE = 256
+
+
+def config_fingerprint(config: Any) -> str:
+    """설정 내용의 해시 (dict 키 순서와 무관)"""
+    payload = json.dumps(config, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """크기가 제한된 LRU 캐시 (스레드 안전, 적중/미스 횟수 기록)"""
+    
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값 조회 (있으면 가장 최근 사용으로 이동)"""
+        with self._lock:
+            value = self.entries.get(key, default)
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """값 저장 (가득 차면 가장 오래 쓰지 않은 항목 제거)"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+    
+    def info(self) -> Dict[str, int]:
+        return {'entries': len(self.entries), 'max_entries': self.max_entries, 'hits': self.hits, 'misses': self.misses}
+
+
+@dataclass(frozen=True)
+class CompiledModel:
+    """설정 하나의 검증/변환 결과 (런타임 상태 없음)"""
+    key: str
+    setup: Any  # SimulationSetup
+    simple_config: Dict[str, Any]
+    initial_signals: Dict[str, Any]
+
+
+# 세션 간 공유 캐시 (설정 해시 -> CompiledModel)
+model_cache = LRUCache(settings.model_cache_size)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 
 # Models are currently defined in main.py for simplicity.
 # This file can be used if model definitions become more complex or numerous.
@@ -38,6 +38,10 @@ class ConnectionConfig(BaseModel):
     to_block_id: str
     to_connector_id: str
 
+class ResourceConfig(BaseModel): # seize/release 명령으로 점유하는 공유 자원 (작업자, 로봇, AGV 등)
+    name: str
+    capacity: int = 1
+
 class SimulationSetup(BaseModel):
     blocks: List[ProcessBlockConfig]
     connections: List[ConnectionConfig]
@@ -47,6 +51,14 @@ class SimulationSetup(BaseModel):
     initial_signals: Optional[Dict[str, bool]] = None # 전역 신호 초기값
     signals: Optional[Dict[str, bool]] = None # 호환성을 위한 signals 필드 추가
     globalSignals: Optional[List[Dict[str, Any]]] = None # 타입 정보를 포함한 전역 변수/신호
+    seed: Optional[int] = None # 난수 시드 (지정하면 delay 범위 값이 재현 가능)
+    entity_pool: bool = False # 배출된 엔티티 객체를 create product에서 재사용
+    instruction_fusion: bool = False # 시간이 걸리지 않는 스크립트 명령을 양보 없이 연달아 실행
+    kernel: Literal['simpy', 'native'] = 'simpy' # 이벤트 커널 (native: 헤드리스 실행용 경량 커널, 브레이크포인트 미지원)
+    resources: List[ResourceConfig] = [] # 공유 자원 풀
+    block_statistics: bool = True # 블록별 KPI(WIP, 상태별 시간, 체류 시간) 수집
+    settings: Optional[Dict[str, Any]] = None # 화면 설정 (deadlockTimeout 사용)
+    deadlock_timeout: Optional[float] = None # 진행 없이 멈춘 상태가 이 시간(초) 지속되면 교착으로 종료 (없으면 settings.deadlockTimeout)
     
     def __init__(self, **data):
         super().__init__(**data)
@@ -74,6 +86,10 @@ class SimulationStepResult(BaseModel):
     block_states: Optional[Dict[str, Any]] = None # 블록 상태 정보 (경고, 처리량 등)
     script_logs: Optional[List[Dict[str, Any]]] = None # 스크립트 로그 추가
     debug_info: Optional[Dict[str, Any]] = None # 디버그 정보 추가
+    version: Optional[int] = None # 상태 버전 (다음 요청의 since_version)
+    is_delta: bool = False # True이면 since_version 이후 바뀐 부분만 포함 (state_diff 참고)
+    removed_entity_ids: Optional[List[str]] = None # 증분 응답에서 사라진 엔티티
+    deadlock: Optional[Dict[str, Any]] = None # 교착/무한 반복이 감지되면 진단 (멈춘 블록, 줄, 신호)
 
 class SimulationRunResult(BaseModel): # 전체 실행 결과 모델
     message: str
@@ -84,6 +100,7 @@ class SimulationRunResult(BaseModel): # 전체 실행 결과 모델
 
 class BatchStepRequest(BaseModel): # 배치 스텝 요청 모델
     steps: int = 5  # 한 번에 실행할 스텝 수
+    since_version: Optional[int] = None  # 지정하면 step_results를 직전 상태 대비 증분으로 반환
 
 class BatchStepResult(BaseModel): # 배치 스텝 결과 모델
     message: str
@@ -93,7 +110,81 @@ class BatchStepResult(BaseModel): # 배치 스텝 결과 모델
     current_time: float
     active_entities: List[EntityState] = []
     total_entities_processed: int
-    step_results: Optional[List[Dict[str, Any]]] = []  # 각 스텝의 전체 결과
+    step_results: Optional[List[Dict[str, Any]]] = []  # 각 스텝의 전체 결과 (증분 모드에서는 직전 스텝 대비 증분)
+    version: Optional[int] = None  # 마지막 스텝의 상태 버전
+
+class SteadyStateConfig(BaseModel): # 워밍업 감지와 자동 종료 규칙 (steady_state 참고)
+    kpi: Literal['throughput', 'wip'] = 'throughput'  # 신뢰구간으로 종료를 판단할 KPI
+    tolerance: float = 0.05  # 신뢰구간 반폭 허용값
+    relative: bool = True  # True면 tolerance를 평균 대비 비율로 사용
+    sample_interval: float = 60.0  # 관측 간격 (초)
+    batches: int = 20  # batch means 구간 수
+    confidence: float = 0.95
+    min_warmup_batches: int = 10  # 워밍업 판단 전 최소 MSER 묶음 수 (묶음당 관측 5개)
+
+class RunUntilRequest(BaseModel): # 빠른 연속 실행 요청 모델 (중간 스냅샷 없음)
+    until: Optional[float] = None  # 이 시뮬레이션 시간까지 실행
+    entities_disposed: Optional[int] = None  # 또는 이만큼 배출될 때까지 실행
+    max_events: Optional[int] = None  # 처리할 최대 이벤트 수 (안전장치)
+    include_snapshot: bool = True  # 종료 시점의 전체 상태 포함 여부
+    steady_state: Optional[SteadyStateConfig] = None  # 정상 상태에 이르고 KPI가 충분히 정확해지면 종료
+
+class RunUntilResult(BaseModel): # 빠른 연속 실행 결과 모델
+    message: str
+    stop_reason: str  # "time" | "entities_disposed" | "max_events" | "no_events" | "paused" | "deadlock" | "livelock" | "steady_state"
+    start_time: float
+    final_time: float
+    events_processed: int
+    wall_time: float
+    total_entities_processed: int
+    entities_in_system: int
+    throughput_per_hour: float
+    resources: Dict[str, Dict[str, Any]] = {}  # 자원별 가동률/대기열 통계
+    block_statistics: Dict[str, Dict[str, Any]] = {}  # 블록별 WIP/상태별 시간/처리량/체류 시간
+    time_distributions: Dict[str, Dict[str, Any]] = {}  # 리드 타임/대기 시간 분위수 (p50, p90, p99)
+    deadlock: Optional[Dict[str, Any]] = None  # 교착/무한 반복 진단 (멈춘 블록, 줄, 신호, 대기 순환)
+    steady_state: Optional[Dict[str, Any]] = None  # 워밍업 시점과 batch means 추정치 (steady_state 요청 시)
+    final_state: Optional[SimulationStepResult] = None  # 종료 시점의 전체 상태
+
+class ReplicationRequest(BaseModel): # 복제 실행 요청 모델
+    config: Dict[str, Any]  # /simulation/setup과 같은 형식의 설정
+    seeds: Optional[List[int]] = None  # 복제별 시드 (없으면 base_seed부터 replications개)
+    replications: int = 10
+    base_seed: int = 0
+    until: Optional[float] = None  # 각 복제를 이 시뮬레이션 시간까지 실행
+    entities_disposed: Optional[int] = None  # 또는 이만큼 배출될 때까지 실행
+    max_events: Optional[int] = None
+    max_workers: Optional[int] = None  # 프로세스 수 (없으면 CPU 코어 수)
+    confidence: float = 0.95  # 신뢰구간 수준
+
+class ReplicationResult(BaseModel): # 복제 실행 결과 모델
+    replications: List[Dict[str, Any]]  # 복제별 KPI
+    summary: Dict[str, Dict[str, float]]  # KPI별 평균, 표준편차, 신뢰구간
+    confidence: float
+    workers: int
+    wall_time: float
+    distributions: Dict[str, Any] = {}  # 전체 복제를 병합한 리드 타임/대기 시간/블록별 체류 시간 분위수
+
+class SweepFactor(BaseModel): # 파라미터 스윕 요인
+    kind: str  # "capacity" | "delay" | "go_delay" | "signal"
+    block: Optional[str] = None  # 대상 블록 이름 (signal 제외)
+    name: Optional[str] = None  # 전역 신호/변수 이름 (signal)
+    index: int = 0  # 블록 스크립트에서 몇 번째 delay/go 명령인지
+    values: Optional[List[Any]] = None  # grid 값 목록 (lhs에서는 이산 값 목록)
+    low: Optional[float] = None  # lhs 연속 구간
+    high: Optional[float] = None
+
+class SweepRequest(BaseModel): # 파라미터 스윕 요청 모델
+    config: Dict[str, Any]  # /simulation/setup과 같은 형식의 기본 설정
+    factors: List[SweepFactor]
+    design: str = "grid"  # "grid" | "lhs"
+    samples: int = 10  # lhs 표본 수
+    design_seed: int = 0  # lhs 표본 추출 시드
+    seeds: List[int] = [0]  # 변형마다 실행할 복제 시드 (하나 이상, 비어 있으면 400)
+    until: Optional[float] = None
+    entities_disposed: Optional[int] = None
+    max_events: Optional[int] = None
+    max_workers: Optional[int] = None
 
 class ExecutionModeRequest(BaseModel):
     mode: str = Field(default="default", description="실행 모드: default, time_step, high_speed")
@@ -0,0 +1,69 @@
+"""
+엔티티 이동 저널
+블록의 엔티티 목록이 바뀔 때마다(추가/제거) 순번과 함께 기록합니다.
+엔티티가 블록 안에서 상태/색상/속성만 바뀐 경우도 변화량 0인 항목(touch)으로 남겨
+증분 응답(state_diff)이 바뀐 엔티티만 다시 만들 수 있게 합니다.
+
+스텝 경계 판단은 순번 하나만 비교하고, 순번이 바뀌었을 때만 그 이후 기록을 확인합니다.
+비용은 블록/엔티티 수가 아니라 실제로 일어난 이동 수에 비례합니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+# (블록 ID, 엔티티 ID, +1 추가 / -1 제거 / 0 블록 안에서 변경 - 블록 ID 없음)
+JournalEntry = Tuple[Optional[str], Any, int]
+
+
+class MovementJournal:
+    """추가 전용 엔티티 이동 기록 (엔진마다 하나)
+    
+    스텝 없이 오래 실행(run_until, 시간 스텝)해도 메모리가 늘지 않도록 max_entries를 넘으면 앞쪽 절반을 버립니다.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.seq = 0  # 지금까지 기록된 항목 수 (단조 증가)
+        self.entries: List[JournalEntry] = []
+        self.base = 0  # entries[0]의 순번 (앞부분을 버린 만큼)
+        self.max_entries = max_entries
+    
+    def reset(self):
+        self.seq = 0
+        self.entries.clear()
+        self.base = 0
+    
+    def record(self, block_id: str, entity_id: str, delta: int):
+        self.entries.append((block_id, entity_id, delta))
+        self.seq += 1
+        if len(self.entries) > self.max_entries:
+            dropped = len(self.entries) // 2
+            del self.entries[:dropped]
+            self.base += dropped
+    
+    def touch(self, entity_id: Any):
+        """엔티티의 상태/색상/속성이 바뀜 (이동이 아니므로 has_net_change_since에는 영향 없음)"""
+        self.record(None, entity_id, 0)
+    
+    def covers(self, seq: int) -> bool:
+        """seq 이후의 기록이 모두 남아 있는지"""
+        return self.base <= seq <= self.seq
+    
+    def truncate(self):
+        """기록을 비움 (순번은 유지) - 더 이상 참조하지 않는 과거 기록 정리용"""
+        self.entries.clear()
+        self.base = self.seq
+    
+    def since(self, seq: int) -> List[JournalEntry]:
+        """seq 이후의 기록"""
+        return self.entries[max(seq - self.base, 0):]
+    
+    def has_net_change_since(self, seq: int) -> bool:
+        """seq 이후 어느 블록의 엔티티 구성이라도 달라졌는지 (나갔다 같은 블록으로 돌아온 경우는 변화 없음)"""
+        if self.seq == seq:
+            return False
+        if seq < self.base:
+            # 기록이 이미 버려져 확인할 수 없으면 변화가 있었던 것으로 간주
+            return True
+        net: Dict[Tuple[str, str], int] = {}
+        for block_id, entity_id, delta in self.since(seq):
+            key = (block_id, entity_id)
+            net[key] = net.get(key, 0) + delta
+        return any(net.values())
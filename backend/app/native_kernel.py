@@ -0,0 +1,372 @@
+"""
+네이티브 이벤트 커널
+컴파일된 블록 스크립트를 SimPy 없이 실행하는 가벼운 이벤트 커널입니다 (설정의 kernel: 'native').
+
+- 이벤트 큐는 (시각, 순번, 콜백, 인자) 힙 하나 (Timeout/Event 객체, 콜백 목록 없음)
+- 블록 스크립트 실행은 명시적 프로그램 카운터(pc)를 가진 ProgramRun 상태 기계
+  (process_entity → execute_program → execute_* 제너레이터 체인 없음)
+- 엔진이 쓰는 simpy.Environment 인터페이스(now, peek, step, run)를 제공하므로
+  기본 스텝, 시간 스텝, run_until, 복제 실행이 그대로 동작
+
+명령 의미는 SimPy 커널의 명령어 융합 모드(instruction_fusion)와 같습니다.
+시간이 걸리지 않는 명령은 한 차례에 연달아 실행하고 delay, go 이동 딜레이, 만족되지 않은 wait,
+뒤로 가는 jump, yield 명령에서만 다른 블록에 차례를 넘깁니다.
+디버그 브레이크포인트는 지원하지 않습니다 (헤드리스 실행용).
+"""
+import heapq
+import logging
+from itertools import count
+from typing import Any, Callable, List, Optional, Tuple
+
+from simpy.core import EmptySchedule
+
+from .simple_script_compiler import (
+    CompiledScript, OP_NOP, OP_DELAY, OP_SIGNAL_SET, OP_WAIT, OP_GO, OP_IF, OP_ELIF, OP_ELSE, OP_JUMP,
+    OP_PRODUCT_TYPE_ASSIGN, OP_PRODUCT_TYPE_ADD, OP_PRODUCT_TYPE_REMOVE, OP_LOG, OP_CREATE, OP_DISPOSE,
+    OP_FORCE_EXECUTION, OP_INT_OPERATION, OP_BLOCK_STATUS, OP_EXECUTE, OP_YIELD,
+    OP_SEIZE, OP_RELEASE
+)
+from .simple_script_executor import sample_delay
+
+logger = logging.getLogger(__name__)
+
+# 엔티티 속성처럼 변경 구독이 불가능한 wait 조건의 확인 간격 (SimPy 커널과 동일)
+WAIT_POLL_INTERVAL = 0.01
+
+# (시각, 순번, 콜백, 인자)
+KernelEvent = Tuple[float, int, Callable[[Any], None], Any]
+
+
+class Wakeup:
+    """한 번만 발생하는 깨우기 (신호 구독, 블록 활성화에서 simpy.Event 대신 사용)"""
+    
+    __slots__ = ('kernel', 'callback', 'arg', 'triggered')
+    
+    def __init__(self, kernel: 'NativeKernel', callback: Callable[[Any], None], arg: Any):
+        self.kernel = kernel
+        self.callback = callback
+        self.arg = arg
+        self.triggered = False
+    
+    def succeed(self, value: Any = None):
+        if not self.triggered:
+            self.triggered = True
+            self.kernel.schedule(0, self.callback, self.arg)
+
+
+class ProgramRun:
+    """블록 스크립트 실행 하나의 상태 (pc와 if 블록 스택)"""
+    
+    __slots__ = ('block', 'entity', 'program', 'pc', 'if_stack', 'current_if_block', 'on_exit', 'go_entity')
+    
+    def __init__(self, block: Any, entity: Any, program: CompiledScript, on_exit: Callable[[Any], None]):
+        self.block = block
+        self.entity = entity
+        self.program = program
+        self.pc = 0
+        self.if_stack: List[Tuple[int, bool]] = []
+        self.current_if_block: Optional[list] = None
+        self.on_exit = on_exit  # 실행 종료 후 on_exit(block) 호출
+        self.go_entity = None  # 이동 딜레이 중인 go 명령의 대상 엔티티
+
+
+class NativeKernel:
+    """힙 기반 이벤트 커널 (엔진에는 simpy.Environment처럼 보임)"""
+    
+    def __init__(self):
+        self.now = 0  # simpy.Environment와 같은 초기값
+        self._queue: List[KernelEvent] = []
+        self._seq = count()
+    
+    # simpy.Environment 호환 인터페이스
+    
+    def schedule(self, delay: float, callback: Callable[[Any], None], arg: Any = None):
+        heapq.heappush(self._queue, (self.now + delay, next(self._seq), callback, arg))
+    
+    def peek(self) -> float:
+        return self._queue[0][0] if self._queue else float('inf')
+    
+    def step(self):
+        try:
+            self.now, _, callback, arg = heapq.heappop(self._queue)
+        except IndexError:
+            raise EmptySchedule()
+        callback(arg)
+    
+    def run(self, until: Optional[float] = None):
+        """until 직전 시각의 이벤트까지 처리 (SimPy처럼 until 시각의 이벤트는 남김)"""
+        if until is None:
+            while self._queue:
+                self.step()
+            return
+        if until <= self.now:
+            raise ValueError(f"until (={until}) must be greater than the current simulation time")
+        queue = self._queue
+        while queue and queue[0][0] < until:
+            self.step()
+        self.now = until
+    
+    # 블록 프로세스
+    
+    def start(self, engine: Any):
+        """엔진의 블록 프로세스 시작 (SimPy 커널의 create_block_process에 해당)"""
+        for block in engine.blocks.values():
+            block.engine_ref = engine
+            block.env = self
+            # force execution이 아닌 블록은 execute 명령으로만 실행되므로 대기 프로세스가 필요 없음
+            if block.has_force_execution():
+                self.schedule(0, self._force_loop, block)
+    
+    def _force_loop(self, block: Any):
+        """블록이 비어 있고 실행 중이 아니면 스크립트 실행, 아니면 다음 활성화까지 대기"""
+        block.activation = None
+        state = block.script_state.get_state(block.id)
+        if not block.entities_in_block and not block.is_executing_script and not state.is_executing:
+            block.set_executing(True)
+            self._start_run(block, None, self._force_done)
+        else:
+            block.activation = Wakeup(self, self._force_loop, block)
+    
+    def _force_done(self, block: Any):
+        block.set_executing(False)
+        # 지연 없는 스크립트가 같은 시각에 무한 반복되지 않도록 최소 간격 유지
+        self.schedule(block.force_execution_interval, self._force_loop, block)
+    
+    def start_execute(self, block: Any):
+        """execute 명령으로 블록 스크립트 실행 (이미 실행 중이면 무시)"""
+        if block.execution_state == "running":
+            logger.info(f"Block {block.name} is already running, execute command ignored")
+            return
+        block.execution_state = "running"
+        block.set_executing(True)
+        entity = block.entities_in_block[0] if block.entities_in_block else None
+        self._start_run(block, entity, self._execute_done)
+    
+    def _execute_done(self, block: Any):
+        block.execution_state = "idle"
+        block.set_executing(False)
+        if block.execute_requested:
+            block.execute_requested = False
+            if block.entities_in_block:
+                self.schedule(0, self.start_execute, block)
+        block.activate()
+    
+    # 스크립트 실행
+    
+    def _start_run(self, block: Any, entity: Any, on_exit: Callable[[Any], None]):
+        block.script_state.start_execution(block.id, entity.id if entity else None, entity)
+        executor = block.script_executor
+        executor.current_entity = entity
+        executor.current_block = block
+        self._resume(ProgramRun(block, entity, block.program, on_exit))
+    
+    def _finish_run(self, run: ProgramRun):
+        """스크립트 종료 처리 (SimPy 커널의 process_entity 종료 부분과 같은 순서)"""
+        block = run.block
+        entity = run.entity
+        if entity:
+            entity.processed_by_blocks.add(block.id)
+        block.script_state.end_execution(block.id)
+        block.activate()
+        if entity is not None and entity.disposed and block.entity_pool is not None:
+            block.entity_pool.release(entity)
+        run.on_exit(block)
+    
+    def _resume(self, run: ProgramRun):
+        """run.pc부터 다음 대기 지점까지 명령 실행"""
+        try:
+            self._execute(run)
+        except Exception as e:
+            logger.error(f"Block {run.block.name} script error: {e}")
+            run.pc = len(run.program.instructions)
+            self._finish_run(run)
+    
+    def _execute(self, run: ProgramRun):
+        block = run.block
+        entity = run.entity
+        executor = block.script_executor
+        instructions = run.program.instructions
+        instruction_count = len(instructions)
+        if_stack = run.if_stack
+        pc = run.pc
+        
+        while pc < instruction_count:
+            instruction = instructions[pc]
+            opcode = instruction.opcode
+            
+            if opcode == OP_NOP:
+                pc += 1
+                continue
+            
+            if if_stack and executor._leave_branches(if_stack, instruction.indent):
+                pc += 1
+                continue
+            
+            operand = instruction.operand
+            
+            if opcode == OP_DELAY:
+                run.pc = pc + 1
+                self.schedule(sample_delay(operand, executor.rng), self._resume, run)
+                return
+            
+            elif opcode == OP_SIGNAL_SET:
+                executor._apply_signal_set(*operand)
+            
+            elif opcode == OP_INT_OPERATION:
+                executor._apply_int_operation(*operand)
+            
+            elif opcode == OP_WAIT:
+                if not operand[0](entity, None):
+                    run.pc = pc
+                    block.park('wait', operand)
+                    self._wait(run, operand)
+                    return
+            
+            elif opcode == OP_GO:
+                target_entity = executor._start_go(self, operand, block)
+                if target_entity is not None:
+                    delay_time = sample_delay(operand.delay, executor.rng) if operand.delay is not None else 0
+                    if delay_time > 0:
+                        run.pc = pc + 1
+                        run.go_entity = target_entity
+                        self.schedule(delay_time, self._arrive, run)
+                        return
+                    if operand.blocking:
+                        if self._park(run, pc + 1, operand, target_entity):
+                            return
+                    else:
+                        executor._finish_go(self, operand, block, target_entity)
+            
+            elif opcode == OP_IF or opcode == OP_ELIF or opcode == OP_ELSE:
+                condition_met, run.current_if_block = executor._enter_branch(
+                    instruction, pc, entity, block, if_stack, run.current_if_block)
+                # 조건이 false면 컴파일 시 계산된 위치로 블록 스킵
+                if not condition_met:
+                    if instruction.ends_if_block:
+                        run.current_if_block = None
+                    pc = instruction.skip_target
+                    continue
+            
+            elif opcode == OP_JUMP:
+                if 0 <= operand < instruction_count:
+                    if operand <= pc:
+                        # 루프 반복마다 차례를 넘김
+                        run.pc = operand
+                        self.schedule(0, self._resume, run)
+                        return
+                    pc = operand
+                    continue
+            
+            elif opcode == OP_PRODUCT_TYPE_ASSIGN:
+                executor._apply_product_type_assign(self, operand[0], operand[1], operand[2], operand[3], block)
+            
+            elif opcode == OP_PRODUCT_TYPE_ADD:
+                executor._apply_product_type_add(entity, operand[0], operand[1])
+            
+            elif opcode == OP_PRODUCT_TYPE_REMOVE:
+                executor._apply_product_type_remove(entity, operand[0], operand[1])
+            
+            elif opcode == OP_LOG:
+                executor._apply_log(self, operand, block.name)
+            
+            elif opcode == OP_CREATE:
+                created_entity = block.spawn_entity(self)
+                if created_entity:
+                    logger.info(f"[{self.now:.1f}s] Block {block.name} created entity {created_entity.id}")
+                    # 이후 log 명령에서 사용하고, 이미 처리된 것으로 표시
+                    executor.current_entity = created_entity
+                    created_entity.processed_by_blocks.add(block.id)
+            
+            elif opcode == OP_DISPOSE:
+                if entity:
+                    block.discard_entity(entity)
+                    logger.info(f"[{self.now:.1f}s] Block {block.name} disposed entity {entity.id}")
+            
+            elif opcode == OP_FORCE_EXECUTION:
+                pass
+            
+            elif opcode == OP_BLOCK_STATUS:
+                executor._apply_block_status(self, operand, block, block.engine_ref)
+            
+            elif opcode == OP_EXECUTE:
+                target_block = executor._find_execute_target(operand, block.engine_ref)
+                if target_block is not None:
+                    # SimPy 커널처럼 다음 차례에 시작 (호출한 스크립트는 계속 실행)
+                    self.schedule(0, self.start_execute, target_block)
+            
+            elif opcode == OP_YIELD:
+                run.pc = pc + 1
+                self.schedule(0, self._resume, run)
+                return
+            
+            elif opcode == OP_SEIZE:
+                pool = executor._find_resource(operand[0], block)
+                if pool is not None:
+                    wakeup = Wakeup(self, self._resume_parked, run)
+                    if pool.seize(self, operand[1], wakeup) is not None:
+                        # 자원을 넘겨받으면 다음 명령부터 재개
+                        run.pc = pc + 1
+                        block.park('seize', operand[0])
+                        return
+            
+            elif opcode == OP_RELEASE:
+                pool = executor._find_resource(operand, block)
+                if pool is not None:
+                    pool.release(self)
+            
+            else:
+                logger.warning(f"Unknown command: {instruction.text}")
+            
+            pc += 1
+        
+        # 스크립트 종료 시 남은 컨텍스트 정리
+        if executor.debug_manager:
+            while if_stack:
+                if_stack.pop()
+                executor.debug_manager.pop_execution_context()
+        run.pc = pc
+        self._finish_run(run)
+    
+    def _wait(self, run: ProgramRun, operand: tuple):
+        """wait 조건이 참조하는 신호/변수가 바뀌면(또는 일정 간격으로) 다시 확인"""
+        dependencies = operand[1]
+        if dependencies is None:
+            self.schedule(WAIT_POLL_INTERVAL, self._recheck_wait, run)
+        else:
+            run.block.script_executor._subscribe_to_variables(dependencies, Wakeup(self, self._recheck_wait, run))
+    
+    def _recheck_wait(self, run: ProgramRun):
+        operand = run.program.instructions[run.pc].operand
+        if operand[0](run.entity, None):
+            run.pc += 1
+            run.block.unpark()
+            self._resume(run)
+        else:
+            self._wait(run, operand)
+    
+    def _arrive(self, run: ProgramRun):
+        """go 명령의 이동 딜레이 종료 - 대상 블록으로 옮기고 스크립트 계속"""
+        go = run.program.instructions[run.pc - 1].operand
+        target_entity = run.go_entity
+        run.go_entity = None
+        if go.blocking:
+            if self._park(run, run.pc, go, target_entity):
+                return
+        else:
+            run.block.script_executor._finish_go(self, go, run.block, target_entity)
+        self._resume(run)
+    
+    def _park(self, run: ProgramRun, next_pc: int, go: Any, target_entity: Any) -> bool:
+        """go ... wait 이동을 시도하고, 대상 블록 대기열에 들어갔으면 True (빈 자리가 나면 next_pc부터 재개)"""
+        wakeup = Wakeup(self, self._resume_parked, run)
+        if run.block.script_executor._finish_go(self, go, run.block, target_entity, wakeup) is not wakeup:
+            # 바로 이동했거나 실패함 - 같은 시점에 계속 진행
+            return False
+        run.pc = next_pc
+        run.block.park('go', go)
+        return True
+    
+    def _resume_parked(self, run: ProgramRun):
+        """go ... wait / seize 대기가 끝난 실행 재개"""
+        run.block.unpark()
+        self._resume(run)
@@ -0,0 +1,293 @@
+"""
+파라미터 스윕 (실험 계획)
+기본 설정에서 블록 용량, 스크립트의 delay/go 지연 값, 전역 신호/변수 초기값을 바꾼 변형들을 만들고
+프로세스 풀에서 실행하여 변형별 KPI를 결과 표의 행으로 하나씩 반환합니다.
+
+요인(factor) 형식 (dict):
+    {'kind': 'capacity', 'block': '공정1', 'values': [1, 2, 3]}
+    {'kind': 'delay', 'block': '공정1', 'index': 0, 'low': 5, 'high': 15}   # index번째 delay 명령
+    {'kind': 'go_delay', 'block': '투입', 'index': 0, 'values': [8, 10]}     # index번째 go 명령의 이동 시간
+    {'kind': 'signal', 'name': '목표', 'values': [10, 20]}                    # globalSignals 초기값
+
+signal 요인의 수준은 globalSignals의 type에 맞춰 변환합니다.
+boolean 신호는 0/1 또는 true/false 수준(lhs 구간은 [0, 1] 안)만, integer 변수는 정수 수준만 받고
+맞지 않는 수준/구간은 변형을 실행하기 전에 ValueError로 거부합니다.
+grid 설계는 values의 모든 조합을, lhs(Latin hypercube) 설계는 samples개의 층화 표본을 만듭니다.
+lhs에서 values가 있는 요인은 층에 해당하는 값을 고르고, 없으면 [low, high] 구간에서 추출합니다.
+"""
+import copy
+import itertools
+import logging
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .replication_runner import init_worker, run_replication, summarize_replications
+
+logger = logging.getLogger(__name__)
+
+FACTOR_KINDS = ('capacity', 'delay', 'go_delay', 'signal')
+
+# boolean 신호 요인에 쓸 수 있는 수준 (1 == True, 0 == False이므로 숫자 0/1도 포함)
+BOOLEAN_LEVELS = {True: True, False: False, 'true': True, 'false': False}
+
+RE_DELAY_LINE = re.compile(r'^(\s*delay\s+)(\S+)(\s*)$')
+RE_GO_LINE = re.compile(r'^(\s*go\s+\S+\s+to\s+[^(]+?)\s*(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(\s*)$', re.IGNORECASE)
+
+
+def factor_label(factor: Dict[str, Any]) -> str:
+    """결과 표의 열 이름으로 쓸 요인 이름"""
+    kind = factor['kind']
+    if kind == 'capacity':
+        return f"capacity:{factor['block']}"
+    if kind == 'signal':
+        return f"signal:{factor['name']}"
+    return f"{kind}:{factor['block']}[{factor.get('index', 0)}]"
+
+
+def _validate_factor(factor: Dict[str, Any], design: str):
+    kind = factor.get('kind')
+    if kind not in FACTOR_KINDS:
+        raise ValueError(f"Unknown factor kind: {kind}")
+    if kind == 'signal' and not factor.get('name'):
+        raise ValueError("signal factor requires a name")
+    if kind != 'signal' and not factor.get('block'):
+        raise ValueError(f"{kind} factor requires a block")
+    if factor.get('values'):
+        return
+    if design == 'grid':
+        raise ValueError(f"{factor_label(factor)}: grid design requires values")
+    if factor.get('low') is None or factor.get('high') is None:
+        raise ValueError(f"{factor_label(factor)}: values or low/high required")
+
+
+def _round_value(factor: Dict[str, Any], value: float) -> Any:
+    """연속 구간에서 뽑은 값을 요인 종류에 맞게 정리"""
+    if factor['kind'] == 'capacity':
+        return max(1, int(round(value)))
+    if factor['kind'] == 'signal':
+        level = int(round(value))
+        return bool(level) if factor.get('type') == 'boolean' else level
+    return round(value, 3)
+
+
+def _signal_type(config: Dict[str, Any], name: str) -> str:
+    """globalSignals에서 신호/변수의 타입 ('boolean' 또는 'integer')"""
+    for signal in config.get('globalSignals') or []:
+        if signal.get('name') == name:
+            return signal.get('type', 'boolean')
+    raise ValueError(f"Global signal '{name}' not found")
+
+
+def _signal_level(factor: Dict[str, Any], signal_type: str, value: Any) -> Any:
+    """신호 요인의 수준을 신호 타입의 값으로 변환 (타입과 맞지 않으면 ValueError)"""
+    if signal_type == 'boolean':
+        key = value.lower() if isinstance(value, str) else value
+        if isinstance(key, (bool, int, float, str)) and key in BOOLEAN_LEVELS:
+            return BOOLEAN_LEVELS[key]
+        raise ValueError(f"{factor_label(factor)}: boolean signal levels must be 0/1 or true/false, got {value!r}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer():
+        return int(value)
+    raise ValueError(f"{factor_label(factor)}: integer signal levels must be integers, got {value!r}")
+
+
+def resolve_signal_factors(base_config: Dict[str, Any], factors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """signal 요인에 globalSignals 타입을 붙이고 수준을 그 타입의 값으로 변환한 요인 목록"""
+    resolved = []
+    for factor in factors:
+        if factor.get('kind') == 'signal' and factor.get('name'):
+            signal_type = _signal_type(base_config, factor['name'])
+            factor = {**factor, 'type': signal_type}
+            if factor.get('values'):
+                factor['values'] = [_signal_level(factor, signal_type, value) for value in factor['values']]
+            elif factor.get('low') is not None and factor.get('high') is not None:
+                low, high = factor['low'], factor['high']
+                if signal_type == 'boolean' and not (0 <= low <= 1 and 0 <= high <= 1):
+                    raise ValueError(f"{factor_label(factor)}: boolean signal range must lie within [0, 1]")
+        resolved.append(factor)
+    return resolved
+
+
+def build_design(factors: List[Dict[str, Any]], design: str = 'grid', samples: int = 10,
+                 seed: int = 0) -> List[Dict[str, Any]]:
+    """요인 목록에서 변형별 {요인 이름: 값} 목록을 만듦"""
+    if design not in ('grid', 'lhs'):
+        raise ValueError(f"Unknown design: {design}")
+    if not factors:
+        raise ValueError("At least one factor is required")
+    for factor in factors:
+        _validate_factor(factor, design)
+    
+    labels = [factor_label(factor) for factor in factors]
+    if len(set(labels)) != len(labels):
+        raise ValueError("Duplicate factors")
+    
+    if design == 'grid':
+        return [dict(zip(labels, combination)) for combination in itertools.product(*(f['values'] for f in factors))]
+    
+    # Latin hypercube: 요인마다 samples개 층을 무작위 순서로 한 번씩 사용
+    if samples < 1:
+        raise ValueError("samples must be positive")
+    rng = random.Random(seed)
+    columns = []
+    for factor in factors:
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        column = []
+        for stratum in strata:
+            u = (stratum + rng.random()) / samples
+            values = factor.get('values')
+            if values:
+                column.append(values[min(int(u * len(values)), len(values) - 1)])
+            else:
+                column.append(_round_value(factor, factor['low'] + u * (factor['high'] - factor['low'])))
+        columns.append(column)
+    return [dict(zip(labels, row)) for row in zip(*columns)]
+
+
+def _find_block(config: Dict[str, Any], block_name: str) -> Dict[str, Any]:
+    for block in config.get('blocks', []):
+        if block.get('name') == block_name:
+            return block
+    raise ValueError(f"Block '{block_name}' not found")
+
+
+def _replace_nth_line(script: str, pattern: re.Pattern, index: int, replace: Callable) -> Optional[str]:
+    """스크립트에서 pattern에 맞는 index번째 줄을 바꾼 결과 (해당 줄이 없으면 None)"""
+    lines = script.split('\n')
+    count = 0
+    for i, line in enumerate(lines):
+        match = pattern.match(line)
+        if match:
+            if count == index:
+                lines[i] = replace(match)
+                return '\n'.join(lines)
+            count += 1
+    return None
+
+
+def _set_script_value(block: Dict[str, Any], factor: Dict[str, Any], value: Any):
+    """블록 스크립트의 delay/go 지연 값을 변경 (script 필드와 script 액션을 모두 갱신)"""
+    index = factor.get('index', 0)
+    if factor['kind'] == 'delay':
+        pattern = RE_DELAY_LINE
+        replace = lambda m: f"{m.group(1)}{value}{m.group(3)}"
+    else:
+        pattern = RE_GO_LINE
+        replace = lambda m: f"{m.group(1)}({m.group(2) or 0},{value}){m.group(4)}"
+    
+    scripts = [block] if block.get('script') else []
+    scripts += [action['parameters'] for action in block.get('actions', [])
+                if action.get('type') == 'script' and action.get('parameters', {}).get('script')]
+    
+    changed = False
+    for holder in scripts:
+        updated = _replace_nth_line(holder['script'], pattern, index, replace)
+        if updated is not None:
+            holder['script'] = updated
+            changed = True
+    if not changed:
+        raise ValueError(f"{factor_label(factor)}: no such command in block script")
+
+
+def apply_variant(base_config: Dict[str, Any], factors: List[Dict[str, Any]], values: Dict[str, Any]) -> Dict[str, Any]:
+    """기본 설정을 복사하여 변형 값을 적용"""
+    config = copy.deepcopy(base_config)
+    for factor in factors:
+        value = values[factor_label(factor)]
+        kind = factor['kind']
+        if kind == 'capacity':
+            # 프론트엔드는 maxCapacity와 capacity(ProcessBlockConfig)를 모두 보냄
+            block = _find_block(config, factor['block'])
+            block['maxCapacity'] = block['capacity'] = int(value)
+        elif kind == 'signal':
+            for signal in config.get('globalSignals') or []:
+                if signal.get('name') == factor['name']:
+                    value = _signal_level(factor, signal.get('type', 'boolean'), value)
+                    signal['value'] = value
+                    if 'initialValue' in signal:
+                        signal['initialValue'] = value
+                    break
+            else:
+                raise ValueError(f"Global signal '{factor['name']}' not found")
+        else:
+            _set_script_value(_find_block(config, factor['block']), factor, value)
+    return config
+
+
+def prepare_sweep(base_config: Dict[str, Any], factors: List[Dict[str, Any]], prepare: Callable[[Dict[str, Any]], Dict[str, Any]],
+                  design: str = 'grid', samples: int = 10, design_seed: int = 0) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """변형 목록을 만들고 각 변형을 엔진 설정으로 한 번씩 변환 ((변형 값, 엔진 설정) 목록)"""
+    factors = resolve_signal_factors(base_config, factors)
+    variants = []
+    for values in build_design(factors, design, samples, design_seed):
+        variants.append((values, prepare(apply_variant(base_config, factors, values))))
+    return variants
+
+
+def run_variant(simple_config: Dict[str, Any], seeds: List[int], until: Optional[float] = None,
+                entities_disposed: Optional[int] = None, max_events: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """변형 하나를 시드별로 실행하고 KPI 요약을 반환 (워커 프로세스에서 호출)"""
+    if not seeds:
+        raise ValueError('At least one seed is required')
+    replications = [run_replication(simple_config, seed, until, entities_disposed, max_events) for seed in seeds]
+    return summarize_replications(replications)
+
+
+def iter_sweep(variants: List[Tuple[Dict[str, Any], Dict[str, Any]]], seeds: List[int], until: Optional[float] = None,
+               entities_disposed: Optional[int] = None, max_events: Optional[int] = None,
+               max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """변형들을 프로세스 풀에서 실행하며 결과 표를 header, 완료 순서대로 row, summary 순으로 반환
+    
+    잘못된 인자는 첫 행을 읽기 전에(호출 시점에) ValueError로 알림
+    """
+    if until is None and entities_disposed is None:
+        raise ValueError('Either until or entities_disposed must be given')
+    if not seeds:
+        raise ValueError('At least one seed is required')
+    return _sweep_rows(variants, seeds, until, entities_disposed, max_events, max_workers)
+
+
+def _sweep_rows(variants: List[Tuple[Dict[str, Any], Dict[str, Any]]], seeds: List[int], until: Optional[float],
+                entities_disposed: Optional[int], max_events: Optional[int],
+                max_workers: Optional[int]) -> Iterator[Dict[str, Any]]:
+    workers = min(max_workers or os.cpu_count() or 1, max(len(variants), 1))
+    yield {
+        'type': 'header',
+        'variants': len(variants),
+        'factors': list(variants[0][0].keys()) if variants else [],
+        'seeds': seeds,
+        'workers': workers,
+    }
+    
+    start = time.perf_counter()
+    completed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = {
+            pool.submit(run_variant, simple_config, seeds, until, entities_disposed, max_events): (index, values)
+            for index, (values, simple_config) in enumerate(variants)
+        }
+        for future in as_completed(futures):
+            index, values = futures[future]
+            row = {'type': 'row', 'variant': index, 'parameters': values}
+            try:
+                summary = future.result()
+                row['kpis'] = {name: stats['mean'] for name, stats in summary.items()}
+                if len(seeds) > 1:
+                    row['half_width'] = {name: stats['half_width'] for name, stats in summary.items()}
+            except Exception as e:
+                logger.error(f"Sweep variant {index} failed: {e}")
+                row['error'] = str(e)
+            completed += 1
+            yield row
+    
+    wall_time = time.perf_counter() - start
+    yield {
+        'type': 'summary',
+        'variants': completed,
+        'wall_time': wall_time,
+        'variants_per_minute': completed / wall_time * 60 if wall_time > 0 else 0.0,
+    }
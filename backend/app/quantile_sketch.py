@@ -0,0 +1,150 @@
+"""
+스트리밍 분위수 스케치 (리드 타임, 대기 시간 분포)
+엔티티별 타임스탬프를 보관하지 않고 p50/p90/p99를 추정합니다.
+
+- 로그 간격 버킷(DDSketch 방식): 값 x는 ceil(log_gamma(x)) 버킷에 세므로
+  추정 분위수의 상대 오차가 relative_accuracy 이하
+- 버킷 수가 max_bins를 넘으면 가장 작은 버킷끼리 합쳐 메모리 고정 (높은 분위수 정확도 유지)
+- 버킷별 개수만 더하면 되므로 복제/워커 간 병합이 정확함 (to_dict/from_dict로 프로세스 간 전달)
+"""
+import math
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+MIN_INDEXABLE_VALUE = 1e-9  # 이보다 작은 값(0 포함)은 zero_count로 셈
+
+
+class QuantileSketch:
+    """고정 크기 메모리의 병합 가능한 분위수 스케치 (0 이상의 값)"""
+    
+    __slots__ = ('relative_accuracy', 'max_bins', 'gamma', 'log_gamma', 'bins', 'zero_count',
+                 'count', 'total', 'min', 'max')
+    
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError('relative_accuracy must be between 0 and 1')
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max(1, int(max_bins))
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}  # 버킷 번호 -> 개수
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float):
+        """값 하나 추가 (음수는 0으로 취급)"""
+        if value < 0:
+            value = 0.0
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < MIN_INDEXABLE_VALUE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        bins = self.bins
+        if key in bins:
+            bins[key] += 1
+        else:
+            bins[key] = 1
+            if len(bins) > self.max_bins:
+                self._collapse()
+    
+    def _collapse(self):
+        """가장 작은 버킷들을 하나로 합쳐 버킷 수를 max_bins로 줄임"""
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        self.bins[target] += sum(self.bins.pop(key) for key in keys[:excess])
+    
+    def merge(self, other: 'QuantileSketch'):
+        """다른 스케치의 값을 합침 (같은 relative_accuracy여야 함)"""
+        if other.gamma != self.gamma:
+            raise ValueError('Cannot merge sketches with different relative accuracy')
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+        if len(bins) > self.max_bins:
+            self._collapse()
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 추정 (값이 없으면 None)"""
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # 버킷 (gamma^(k-1), gamma^k]의 대표값 - 상대 오차가 가장 작은 지점
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """개수, 평균, 최소/최대와 분위수 (p50, p90, p99 ...)"""
+        result: Dict[str, Any] = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """프로세스 간 전달/저장용 직렬화 (JSON 호환)"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'bins': sorted(self.bins.items()),
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'], data['max_bins'])
+        sketch.bins = {int(key): int(count) for key, count in data['bins']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
+
+
+def merge_sketches(sketches: Iterable[Any]) -> Optional[QuantileSketch]:
+    """스케치(또는 to_dict 결과) 목록을 하나로 병합 (없으면 None)"""
+    merged: Optional[QuantileSketch] = None
+    for sketch in sketches:
+        if isinstance(sketch, dict):
+            sketch = QuantileSketch.from_dict(sketch)
+        if merged is None:
+            merged = QuantileSketch(sketch.relative_accuracy, sketch.max_bins)
+        merged.merge(sketch)
+    return merged
@@ -0,0 +1,151 @@
+"""
+복제 실행기
+같은 설정을 서로 다른 시드로 여러 번 독립 실행하고 KPI의 평균과 신뢰구간을 계산합니다.
+각 복제는 별도 프로세스에서 자체 SimpleSimulationEngine과 시드가 지정된 난수 스트림으로 실행됩니다.
+리드 타임/대기 시간 분포는 복제별 분위수 스케치를 병합해 전체 복제 기준 분위수로 요약합니다.
+"""
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from statistics import NormalDist, mean, stdev
+from typing import Any, Dict, List, Optional
+
+from .quantile_sketch import merge_sketches
+from .simple_simulation_engine import SimpleSimulationEngine
+
+logger = logging.getLogger(__name__)
+
+# 요약 통계를 계산할 KPI (복제 결과의 키)
+SUMMARY_KPIS = ('total_entities_processed', 'throughput_per_hour', 'entities_in_system', 'final_time')
+
+
+def init_worker():
+    """워커 프로세스 초기화 - 블록별 상세 로그가 실행 속도를 좌우하지 않도록 INFO 이하 로그를 끔"""
+    logging.disable(logging.INFO)
+
+
+def run_replication(simple_config: Dict[str, Any], seed: int, until: Optional[float] = None,
+                    entities_disposed: Optional[int] = None, max_events: Optional[int] = None) -> Dict[str, Any]:
+    """복제 1회 실행 (워커 프로세스에서 호출되므로 모듈 최상위 함수)"""
+    engine = SimpleSimulationEngine()
+    engine.setup_simulation({**simple_config, 'seed': seed})
+    result = engine.run_until(until, entities_disposed, max_events)
+    if 'error' in result:
+        raise ValueError(result['error'])
+    
+    return {
+        'seed': seed,
+        'stop_reason': result['stop_reason'],
+        'final_time': result['simulation_time'],
+        'events_processed': result['events_processed'],
+        'wall_time': result['wall_time'],
+        'total_entities_processed': result['total_entities_processed'],
+        'entities_in_system': result['total_entities_in_system'],
+        'throughput_per_hour': result['throughput_per_hour'],
+        'variables': engine.integer_manager.get_all_variables(),
+        'block_statistics': result['block_statistics'],
+        'sketches': engine.statistics.sketches(),
+        'deadlock': result['deadlock'],
+    }
+
+
+def t_critical(confidence: float, dof: int) -> float:
+    """Student t 분포의 양측 임계값 (자유도 1, 2는 정확한 값, 그 이상은 Cornish-Fisher 전개)"""
+    p = 0.5 + confidence / 2
+    if dof == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if dof == 2:
+        return (2 * p - 1) * math.sqrt(2 / (4 * p * (1 - p)))
+    
+    z = NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / dof + g2 / dof ** 2 + g3 / dof ** 3 + g4 / dof ** 4
+
+
+def summarize(values: List[float], confidence: float = 0.95) -> Dict[str, float]:
+    """표본의 평균, 표준편차, t 분포 기반 신뢰구간"""
+    n = len(values)
+    average = mean(values) if values else 0.0
+    deviation = stdev(values) if n > 1 else 0.0
+    half_width = t_critical(confidence, n - 1) * deviation / math.sqrt(n) if n > 1 else 0.0
+    return {
+        'mean': average,
+        'std': deviation,
+        'ci_low': average - half_width,
+        'ci_high': average + half_width,
+        'half_width': half_width,
+        'n': n,
+    }
+
+
+def summarize_replications(replications: List[Dict[str, Any]], confidence: float = 0.95) -> Dict[str, Dict[str, float]]:
+    """복제 결과 목록에서 KPI와 정수 변수별 요약 통계 계산"""
+    summary = {kpi: summarize([r[kpi] for r in replications], confidence) for kpi in SUMMARY_KPIS}
+    
+    variable_names = sorted({name for r in replications for name in r['variables']})
+    for name in variable_names:
+        summary[f"var.{name}"] = summarize([r['variables'].get(name, 0) for r in replications], confidence)
+    return summary
+
+
+def merge_distributions(sketch_sets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """복제별 스케치(StatisticsRegistry.sketches 형식)를 병합한 분위수 요약"""
+    sketch_sets = [sketches for sketches in sketch_sets if sketches]
+    if not sketch_sets:
+        return {}
+    
+    def merged_summary(sketches):
+        merged = merge_sketches(sketches)
+        return merged.summary() if merged is not None else {}
+    
+    block_ids = sorted({block_id for sketches in sketch_sets for block_id in sketches['blocks']})
+    return {
+        'lead_time': merged_summary(s['lead_time'] for s in sketch_sets),
+        'waiting_time': merged_summary(s['waiting_time'] for s in sketch_sets),
+        'blocks': {
+            block_id: {
+                kind: merged_summary(s['blocks'][block_id][kind] for s in sketch_sets if block_id in s['blocks'])
+                for kind in ('cycle_time', 'waiting_time')
+            }
+            for block_id in block_ids
+        },
+    }
+
+
+def run_replications(simple_config: Dict[str, Any], seeds: List[int], until: Optional[float] = None,
+                     entities_disposed: Optional[int] = None, max_events: Optional[int] = None,
+                     max_workers: Optional[int] = None, confidence: float = 0.95) -> Dict[str, Any]:
+    """시드마다 독립 복제를 프로세스 풀에서 실행하고 복제별 KPI와 요약 통계를 반환"""
+    if until is None and entities_disposed is None:
+        raise ValueError('Either until or entities_disposed must be given')
+    if not seeds:
+        raise ValueError('At least one seed is required')
+    
+    task = partial(run_replication, simple_config, until=until,
+                   entities_disposed=entities_disposed, max_events=max_events)
+    workers = min(max_workers or os.cpu_count() or 1, len(seeds))
+    
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        replications = list(pool.map(task, seeds))
+    wall_time = time.perf_counter() - start
+    
+    logger.info(f"{len(seeds)} replications finished in {wall_time:.2f}s on {workers} workers")
+    
+    # 스케치 원본은 병합에만 쓰고 복제별 결과에서는 뺌
+    distributions = merge_distributions([r.pop('sketches', None) for r in replications])
+    
+    return {
+        'replications': replications,
+        'summary': summarize_replications(replications, confidence),
+        'confidence': confidence,
+        'workers': workers,
+        'wall_time': wall_time,
+        'distributions': distributions,
+    }
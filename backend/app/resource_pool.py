@@ -0,0 +1,124 @@
+"""
+공유 자원 풀 (작업자, 로봇, AGV 등)
+seize/release 스크립트 명령이 사용하는 용량 있는 자원입니다.
+
+- 대기열은 (-우선순위, 도착 순번) 힙이라 요청/해제 비용이 대기자 수에 대해 O(log n)
+- 높은 우선순위가 먼저, 같은 우선순위는 먼저 온 순서 (FIFO)
+- 가동률/대기열 길이는 상태가 바뀔 때마다 시간 가중 면적으로 누적 (폴링 없음)
+- 대기 시간 분포(p50/p90/p99)는 고정 크기 분위수 스케치로 누적
+
+SimPy 커널과 네이티브 커널에서 같은 방식으로 동작하도록 대기자는 깨우기 이벤트
+(simpy.Event 또는 native_kernel.Wakeup)로 보관합니다.
+"""
+import heapq
+import logging
+from typing import Any, Dict, List, Optional
+
+from .quantile_sketch import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+
+class ResourcePool:
+    """용량이 있는 공유 자원 (seize로 한 단위 점유, release로 반환)"""
+    
+    def __init__(self, name: str, capacity: int = 1, start_time: float = 0.0):
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self.in_use = 0
+        # 대기열: (-우선순위, 도착 순번, 깨우기 이벤트, 대기 시작 시간)
+        self.queue: List[tuple] = []
+        self.sequence = 0
+        
+        # 누적 통계 (상태가 바뀔 때마다 갱신)
+        self.start_time = start_time
+        self.last_time = start_time
+        self.busy_area = 0.0  # 점유 단위 수 x 시간
+        self.queue_area = 0.0  # 대기자 수 x 시간
+        self.max_queue = 0
+        self.seize_count = 0
+        self.release_count = 0
+        self.total_wait = 0.0
+        self.wait_times = QuantileSketch()  # 대기 후 점유한 요청의 대기 시간
+    
+    def _advance(self, now: float):
+        """마지막 변경 이후 경과 시간만큼 면적 누적"""
+        elapsed = now - self.last_time
+        if elapsed > 0:
+            self.busy_area += self.in_use * elapsed
+            self.queue_area += len(self.queue) * elapsed
+            self.last_time = now
+    
+    def seize(self, env: Any, priority: int = 0, wakeup: Any = None) -> Any:
+        """자원 한 단위 요청
+        
+        바로 점유했으면 None을 반환합니다. 남은 자원이 없으면 대기열에 넣고
+        점유 시 발생할 이벤트(wakeup, 없으면 env.event())를 반환합니다.
+        """
+        self._advance(env.now)
+        if self.in_use < self.capacity and not self.queue:
+            self.in_use += 1
+            self.seize_count += 1
+            return None
+        if wakeup is None:
+            wakeup = env.event()
+        self.sequence += 1
+        heapq.heappush(self.queue, (-priority, self.sequence, wakeup, env.now))
+        if len(self.queue) > self.max_queue:
+            self.max_queue = len(self.queue)
+        return wakeup
+    
+    def release(self, env: Any) -> bool:
+        """자원 한 단위 반환 (대기자가 있으면 우선순위/도착 순으로 바로 넘김)"""
+        self._advance(env.now)
+        if self.in_use <= 0:
+            logger.warning(f"[{env.now:.1f}s] Resource '{self.name}' released while not seized")
+            return False
+        self.in_use -= 1
+        self.release_count += 1
+        queue = self.queue
+        while queue and self.in_use < self.capacity:
+            _, _, wakeup, since = heapq.heappop(queue)
+            self.in_use += 1
+            self.seize_count += 1
+            self.total_wait += env.now - since
+            self.wait_times.add(env.now - since)
+            wakeup.succeed(True)
+        return True
+    
+    def restart_statistics(self, now: float):
+        """현재 점유/대기 상태는 유지하고 누적 통계만 now부터 다시 모음 (워밍업 제거)"""
+        self._advance(now)
+        self.start_time = self.last_time = now
+        self.busy_area = 0.0
+        self.queue_area = 0.0
+        self.max_queue = len(self.queue)
+        self.seize_count = 0
+        self.release_count = 0
+        self.total_wait = 0.0
+        self.wait_times = QuantileSketch()
+    
+    def get_statistics(self, now: float) -> Dict[str, Any]:
+        """가동률, 평균 대기열 길이 등 누적 통계 반환"""
+        self._advance(now)
+        elapsed = now - self.start_time
+        return {
+            'capacity': self.capacity,
+            'in_use': self.in_use,
+            'queue_length': len(self.queue),
+            'max_queue_length': self.max_queue,
+            'utilization': self.busy_area / (self.capacity * elapsed) if elapsed > 0 else 0.0,
+            'average_queue_length': self.queue_area / elapsed if elapsed > 0 else 0.0,
+            'seize_count': self.seize_count,
+            'average_wait': self.total_wait / self.seize_count if self.seize_count else 0.0,
+            'wait_time_quantiles': self.wait_times.summary(),
+        }
+
+
+def create_resource_pools(configs: Optional[List[Dict[str, Any]]], start_time: float = 0.0) -> Dict[str, ResourcePool]:
+    """설정의 resources 목록([{'name': ..., 'capacity': ...}])으로 자원 풀 생성"""
+    pools: Dict[str, ResourcePool] = {}
+    for config in configs or []:
+        name = str(config['name']).strip()
+        pools[name] = ResourcePool(name, config.get('capacity', 1), start_time)
+    return pools
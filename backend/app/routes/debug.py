@@ -2,12 +2,13 @@
 디버그 관련 API 엔드포인트
 브레이크포인트 관리 및 디버그 제어
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
 
-from ..simple_engine_adapter import engine_adapter
+from ..session_registry import SimulationSession
+from .simulation import get_session
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/simulation/debug", tags=["debug"])
@@ -37,83 +38,80 @@ class BreakpointData(BaseModel):
     line_number: int
     enabled: bool
 
+def session_debug_manager(session: SimulationSession):
+    """시뮬레이션이 초기화되었으면 엔진의 디버그 매니저, 아니면 글로벌 디버그 매니저 (세션 액터에서 호출)"""
+    if session.adapter.has_engine():
+        return session.adapter.engine.debug_manager
+    return session.adapter.global_debug_manager
+
+def breakpoint_lists(debug_manager) -> Dict[str, List[int]]:
+    """응답용 브레이크포인트 복사본 (액터가 이후에 바꿔도 응답 직렬화에 영향 없음)"""
+    return {block_id: sorted(lines) for block_id, lines in debug_manager.get_breakpoints().items()}
+
 @router.post("/breakpoints/manage")
-async def manage_breakpoints(request: BreakpointRequest):
+async def manage_breakpoints(request: BreakpointRequest, session: SimulationSession = Depends(get_session)):
     """브레이크포인트 설정/해제 (관리 API)"""
-    try:
-        # 시뮬레이션이 초기화되었으면 엔진의 디버그 매니저 사용, 아니면 글로벌 디버그 매니저 사용
-        if engine_adapter.has_engine():
-            debug_manager = engine_adapter.engine.debug_manager
-        else:
-            debug_manager = engine_adapter.global_debug_manager
-        
+    if request.action not in ("set", "clear", "clear_all"):
+        raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
+    if request.action != "clear_all" and (not request.block_id or request.line_number is None):
+        raise HTTPException(status_code=400, detail=f"block_id and line_number required for {request.action} action")
+    
+    def manage():
+        # 스텝 중인 엔진이 check_breakpoint로 읽는 목록이므로 세션 액터에서 변경
+        debug_manager = session_debug_manager(session)
         if request.action == "set":
-            if not request.block_id or request.line_number is None:
-                raise HTTPException(status_code=400, detail="block_id and line_number required for set action")
-            
             debug_manager.set_breakpoint(request.block_id, request.line_number)
-            # Breakpoint set
-            
         elif request.action == "clear":
-            if not request.block_id or request.line_number is None:
-                raise HTTPException(status_code=400, detail="block_id and line_number required for clear action")
-            
             debug_manager.clear_breakpoint(request.block_id, request.line_number)
-            # Breakpoint cleared
-            
-        elif request.action == "clear_all":
-            debug_manager.clear_all_breakpoints(request.block_id)
-            # All breakpoints cleared
-            
         else:
-            raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
-        
+            debug_manager.clear_all_breakpoints(request.block_id)
+        return breakpoint_lists(debug_manager)
+    
+    try:
         return {
             "success": True,
-            "breakpoints": debug_manager.get_breakpoints()
+            "breakpoints": await session.run(manage)
         }
-        
+    
     except Exception as e:
         logger.error(f"Error managing breakpoints: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/control")
-async def debug_control(request: DebugControlRequest):
+async def debug_control(request: DebugControlRequest, session: SimulationSession = Depends(get_session)):
     """디버그 제어 (계속/스텝/중지)"""
-    try:
-        if not engine_adapter.has_engine():
-            raise HTTPException(status_code=400, detail="Simulation not initialized")
-        
-        debug_manager = engine_adapter.engine.debug_manager
-        
+    if request.action not in ("start_debug", "stop_debug", "continue", "step"):
+        raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
+    
+    def control():
+        # 브레이크포인트 일시정지는 env.timeout(0)으로 양보할 뿐 액터 스레드를 막지 않으므로 계속/스텝도 액터에서 실행
+        if not session.adapter.has_engine():
+            return None, None
+        debug_manager = session.adapter.engine.debug_manager
         if request.action == "start_debug":
             debug_manager.start_debugging()
-            # Debug mode started
-            
+            success = True
         elif request.action == "stop_debug":
             debug_manager.stop_debugging()
-            # Debug mode stopped
-            
+            success = True
         elif request.action == "continue":
             success = debug_manager.continue_execution()
-            if not success:
-                raise HTTPException(status_code=400, detail="Not in paused state")
-            # Execution continued
-            
-        elif request.action == "step":
-            success = debug_manager.step_execution()
-            if not success:
-                raise HTTPException(status_code=400, detail="Not in paused state")
-            # Step execution
-            
         else:
-            raise HTTPException(status_code=400, detail=f"Unknown action: {request.action}")
+            success = debug_manager.step_execution()
+        return success, debug_manager.get_debug_info()
+    
+    try:
+        success, debug_info = await session.run(control)
+        if success is None:
+            raise HTTPException(status_code=400, detail="Simulation not initialized")
+        if not success:
+            raise HTTPException(status_code=400, detail="Not in paused state")
         
         return {
             "success": True,
-            "debug_info": debug_manager.get_debug_info()
+            "debug_info": debug_info
         }
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -121,73 +119,70 @@ async def debug_control(request: DebugControlRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status", response_model=DebugStatusResponse)
-async def get_debug_status():
+async def get_debug_status(session: SimulationSession = Depends(get_session)):
     """현재 디버그 상태 조회"""
     try:
         # 글로벌 디버그 매니저 사용
-        debug_info = engine_adapter.global_debug_manager.get_debug_info()
+        debug_info = await session.run(session.adapter.global_debug_manager.get_debug_info)
         
         return DebugStatusResponse(**debug_info)
-        
+    
     except Exception as e:
         logger.error(f"Error getting debug status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/set_breakpoints_batch")
-async def set_breakpoints_batch(breakpoints: Dict[str, List[int]]):
+async def set_breakpoints_batch(breakpoints: Dict[str, List[int]], session: SimulationSession = Depends(get_session)):
     """여러 브레이크포인트 한번에 설정"""
-    try:
-        if not engine_adapter.has_engine():
-            raise HTTPException(status_code=400, detail="Simulation not initialized")
-        
-        debug_manager = engine_adapter.engine.debug_manager
+    def replace_all():
+        if not session.adapter.has_engine():
+            return None
+        debug_manager = session.adapter.engine.debug_manager
         
-        # 모든 브레이크포인트 초기화
+        # 모든 브레이크포인트 초기화 후 새로 설정 (한 명령이므로 스텝 중에 빈 목록이 보이지 않음)
         debug_manager.clear_all_breakpoints()
-        
-        # 새 브레이크포인트 설정
         for block_id, line_numbers in breakpoints.items():
             for line_number in line_numbers:
                 debug_manager.set_breakpoint(block_id, line_number)
-        
-        # Batch breakpoints set
+        return breakpoint_lists(debug_manager)
+    
+    try:
+        all_breakpoints = await session.run(replace_all)
+        if all_breakpoints is None:
+            raise HTTPException(status_code=400, detail="Simulation not initialized")
         
         return {
             "success": True,
-            "breakpoints": debug_manager.get_breakpoints()
+            "breakpoints": all_breakpoints
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error setting batch breakpoints: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # 프론트엔드 호환 엔드포인트 (이미 manage_breakpoints가 있지만 다른 형식)
 @router.post("/breakpoints", name="set_breakpoint_frontend")
-async def set_breakpoint_frontend(data: BreakpointData):
+async def set_breakpoint_frontend(data: BreakpointData, session: SimulationSession = Depends(get_session)):
     """브레이크포인트 설정/해제 (프론트엔드 호환)"""
     
-    try:
-        # 시뮬레이션이 초기화되었으면 엔진의 디버그 매니저 사용, 아니면 글로벌 디버그 매니저 사용
-        if engine_adapter.has_engine():
-            debug_manager = engine_adapter.engine.debug_manager
-        else:
-            debug_manager = engine_adapter.global_debug_manager
-        
+    def toggle():
+        debug_manager = session_debug_manager(session)
         if data.enabled:
             debug_manager.set_breakpoint(data.block_id, data.line_number)
-            # Breakpoint set
         else:
             debug_manager.clear_breakpoint(data.block_id, data.line_number)
-            # Breakpoint cleared
-        
-        # 현재 브레이크포인트 상태 로그
-        all_breakpoints = debug_manager.get_breakpoints()
+        return breakpoint_lists(debug_manager)
+    
+    try:
+        all_breakpoints = await session.run(toggle)
         
         return {
             "status": "success",
             "breakpoints": all_breakpoints
         }
-        
+    
     except Exception as e:
         logger.error(f"Error managing breakpoint: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,7 +1,8 @@
 import os
 import json
-from fastapi import APIRouter, HTTPException
-from typing import Optional, Dict, List, Any
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, List, Any, Iterator
 import traceback
 import asyncio
 import simpy
@@ -9,26 +10,44 @@ import logging
 
 from ..models import (
     SimulationSetup, SimulationRunResult, SimulationStepResult, 
-    BatchStepRequest, BatchStepResult, EntityState, ExecutionModeRequest
+    BatchStepRequest, BatchStepResult, EntityState, ExecutionModeRequest,
+    RunUntilRequest, RunUntilResult, ReplicationRequest, ReplicationResult, SweepRequest
 )
-# 새로운 단순 엔진 어댑터 사용
-from ..simple_engine_adapter import engine_adapter
+# 새로운 단순 엔진 어댑터 사용 (세션별 인스턴스)
+from ..simple_engine_adapter import SimpleEngineAdapter
+from ..session_registry import session_registry, SimulationSession, SessionLimitError, DEFAULT_SESSION_ID
+from ..simulation_stream import SimulationStream
+from ..model_cache import CompiledModel, config_fingerprint, model_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/simulation", tags=["simulation"])
 
+def get_session(x_session_id: Optional[str] = Header(None), session_id: Optional[str] = None) -> Iterator[SimulationSession]:
+    """요청의 시뮬레이션 세션 (X-Session-ID 헤더 또는 session_id 쿼리, 없으면 기본 세션)
+    
+    요청이 끝날 때까지 세션을 임대하므로 그 사이 다른 요청이 세션을 제거하지 못함
+    """
+    try:
+        session = session_registry.acquire(x_session_id or session_id or DEFAULT_SESSION_ID)
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        yield session
+    finally:
+        session_registry.release(session)
+
 def convert_global_signals_to_initial_signals(config_data: dict) -> dict:
     """글로벌 신호를 initial_signals 형태로 변환"""
     # 이미 initial_signals가 있다면 그대로 사용
     if "initial_signals" in config_data and isinstance(config_data["initial_signals"], dict):
         return config_data["initial_signals"]
     
-    # globalSignals 배열에서 변환
+    # globalSignals 배열에서 변환 (정수 변수는 globalSignals로 따로 초기화되므로 제외)
     initial_signals = {}
     for signal in config_data.get("globalSignals", []):
         signal_name = signal.get("name")
         signal_value = signal.get("value", False)
-        if signal_name:
+        if signal_name and signal.get("type", "boolean") != "integer":
             initial_signals[signal_name] = signal_value
     return initial_signals
 
@@ -51,32 +70,73 @@ def convert_config_ids_to_strings(config_data: dict) -> dict:
     
     return config
 
+def compile_model(config_data: dict) -> tuple:
+    """설정을 검증/변환한 CompiledModel과 캐시 적중 여부
+    
+    같은 내용의 설정은 ID 변환(딥 카피), Pydantic 검증, 엔진 형식 변환을 다시 하지 않음
+    """
+    key = config_fingerprint(config_data)
+    model = model_cache.get(key)
+    if model is not None:
+        return model, True
+    
+    config_data = convert_config_ids_to_strings(config_data)
+    initial_signals = convert_global_signals_to_initial_signals(config_data)
+    config_data["initial_signals"] = initial_signals
+    setup = SimulationSetup(**config_data)
+    model = CompiledModel(key, setup, SimpleEngineAdapter.convert_setup_to_simple_format(setup), initial_signals)
+    model_cache.put(key, model)
+    return model, False
+
+def prepare_simple_config(config_data: dict) -> dict:
+    """/simulation/setup과 동일한 변환을 거쳐 엔진 설정을 만든다 (복제/스윕용)"""
+    config_data = convert_config_ids_to_strings(config_data)
+    config_data["initial_signals"] = convert_global_signals_to_initial_signals(config_data)
+    return SimpleEngineAdapter.convert_setup_to_simple_format(SimulationSetup(**config_data))
+
+@router.post("/sessions")
+def create_session_endpoint():
+    """새 시뮬레이션 세션 생성 (이후 요청에 X-Session-ID 헤더로 전달)"""
+    try:
+        session = session_registry.create()
+    except SessionLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"session_id": session.session_id, "max_sessions": session_registry.max_sessions}
+
+@router.get("/sessions")
+def list_sessions_endpoint():
+    """활성 세션 목록 (모델 캐시 상태 포함)"""
+    return {"sessions": session_registry.list_sessions(), "max_sessions": session_registry.max_sessions,
+            "model_cache": model_cache.info()}
+
+@router.delete("/sessions/{session_id}")
+def delete_session_endpoint(session_id: str):
+    """세션 종료 (엔진과 상태 해제)"""
+    if not session_registry.remove(session_id):
+        raise HTTPException(status_code=404, detail=f"세션을 찾을 수 없습니다: {session_id}")
+    return {"message": f"세션 {session_id}이(가) 종료되었습니다"}
+
 @router.post("/setup")
-async def setup_simulation_endpoint(config_data: dict):
+async def setup_simulation_endpoint(config_data: dict, session: SimulationSession = Depends(get_session)):
     """시뮬레이션 설정 엔드포인트"""
     try:
         logger.info("🚀 새로운 단순 엔진으로 시뮬레이션 설정 시작")
         
-        # ID를 문자열로 변환
-        config_data = convert_config_ids_to_strings(config_data)
-        
-        # 글로벌 신호 변환
-        initial_signals = convert_global_signals_to_initial_signals(config_data)
-        config_data["initial_signals"] = initial_signals
-        
-        # Pydantic 모델로 검증
-        setup = SimulationSetup(**config_data)
+        # ID 변환, 글로벌 신호 변환, Pydantic 검증 (같은 설정이면 캐시된 결과)
+        model, cached = compile_model(config_data)
         
-        # 새 엔진으로 설정
-        await engine_adapter.setup_simulation(setup)
+        # 새 엔진으로 설정 (런타임 상태만 새로 생성)
+        await session.run(session.adapter.setup_simulation, model.setup, model.simple_config)
         
         logger.info("✅ 새로운 단순 엔진 설정 완료")
         return {
             "message": "새로운 단순 엔진으로 시뮬레이션이 설정되었습니다",
             "engine_type": "simple_engine_v3",
-            "blocks_count": len(setup.blocks),
-            "connections_count": len(setup.connections),
-            "initial_signals": initial_signals
+            "blocks_count": len(model.setup.blocks),
+            "connections_count": len(model.setup.connections),
+            "initial_signals": model.initial_signals,
+            "model_key": model.key,
+            "model_cached": cached
         }
         
     except Exception as e:
@@ -85,14 +145,23 @@ async def setup_simulation_endpoint(config_data: dict):
         raise HTTPException(status_code=400, detail=f"설정 오류: {str(e)}")
 
 @router.post("/step", response_model=SimulationStepResult)
-async def step_simulation_endpoint(config_data: Optional[dict] = None):
-    """단일 시뮬레이션 스텝 실행"""
+async def step_simulation_endpoint(config_data: Optional[dict] = None, since_version: Optional[int] = None,
+                                   session: SimulationSession = Depends(get_session)):
+    """단일 시뮬레이션 스텝 실행
+    
+    since_version(쿼리)에 직전 응답의 version을 주면 그 이후 바뀐 부분만 반환 (is_delta=True)
+    """
     try:
+        model = None
         # 설정 데이터가 있으면 먼저 시뮬레이션 설정
         if config_data:
             logger.info("🚀 스텝 실행 전 시뮬레이션 설정")
             
-            # 블록 정보 로깅
+            # ID 변환, 글로벌 신호 변환, Pydantic 검증 (같은 설정이면 캐시된 결과)
+            model, cached = compile_model(config_data)
+        
+        # 블록 정보 로깅 (새 설정일 때만)
+        if model is not None and not cached:
             for block in config_data.get('blocks', []):
                 block_name = block.get('name', 'Unknown')
                 if 'script' in block:
@@ -102,23 +171,16 @@ async def step_simulation_endpoint(config_data: Optional[dict] = None):
                 # maxCapacity 로깅 추가
                 max_capacity = block.get('maxCapacity', 'Not Set')
                 logger.info(f"📊 블록 '{block_name}' maxCapacity: {max_capacity}")
-            
-            # ID를 문자열로 변환
-            config_data = convert_config_ids_to_strings(config_data)
-            
-            # 글로벌 신호 변환
-            initial_signals = convert_global_signals_to_initial_signals(config_data)
-            config_data["initial_signals"] = initial_signals
-            
-            # Pydantic 모델로 검증
-            setup = SimulationSetup(**config_data)
-            
-            # 새 엔진으로 설정
-            await engine_adapter.setup_simulation(setup)
-            logger.info("✅ 시뮬레이션 설정 완료")
         
-        logger.info("⚡ 새로운 단순 엔진 스텝 실행")
-        result = engine_adapter.step_simulation()
+        def setup_and_step():
+            # 설정과 스텝을 세션 액터에서 한 명령으로 실행 (사이에 다른 명령이 끼지 않음)
+            if model is not None:
+                session.adapter.setup_simulation(model.setup, model.simple_config)
+                logger.info("✅ 시뮬레이션 설정 완료")
+            logger.info("⚡ 새로운 단순 엔진 스텝 실행")
+            return session.adapter.step_simulation(since_version)
+        
+        result = await session.run(setup_and_step)
         
         logger.info(f"✅ 스텝 완료 - 시간: {result.time:.2f}, 엔티티: {len(result.active_entities)}")
         return result
@@ -129,11 +191,11 @@ async def step_simulation_endpoint(config_data: Optional[dict] = None):
         raise HTTPException(status_code=500, detail=f"스텝 실행 오류: {str(e)}")
 
 @router.post("/batch-step", response_model=BatchStepResult)
-def batch_step_simulation_endpoint(request: BatchStepRequest):
+async def batch_step_simulation_endpoint(request: BatchStepRequest, session: SimulationSession = Depends(get_session)):
     """배치 시뮬레이션 스텝 실행"""
     try:
         logger.info(f"⚡ 새로운 단순 엔진 배치 스텝 실행 ({request.steps}스텝)")
-        result = engine_adapter.batch_step_simulation(request.steps)
+        result = await session.run(session.adapter.batch_step_simulation, request.steps, request.since_version)
         
         logger.info(f"✅ 배치 스텝 완료 - {result.steps_executed}스텝 실행")
         return result
@@ -143,12 +205,67 @@ def batch_step_simulation_endpoint(request: BatchStepRequest):
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"배치 스텝 실행 오류: {str(e)}")
 
+@router.get("/snapshot", response_model=SimulationStepResult)
+async def get_snapshot_endpoint(session: SimulationSession = Depends(get_session)):
+    """스텝 진행 없이 현재 상태의 전체 스냅샷 (증분 응답 재동기화용)"""
+    def snapshot():
+        # 설정 여부 확인도 액터에서 (설정/리셋 명령과 엇갈리지 않음)
+        return session.adapter.get_snapshot() if session.adapter.has_engine() else None
+    
+    try:
+        result = await session.run(snapshot)
+    except Exception as e:
+        logger.error(f"❌ 스냅샷 조회 오류: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"스냅샷 조회 오류: {str(e)}")
+    if result is None:
+        raise HTTPException(status_code=400, detail="시뮬레이션이 설정되지 않았습니다")
+    return result
+
+@router.websocket("/stream")
+async def simulation_stream_endpoint(websocket: WebSocket, max_fps: float = 30, speed: float = 0, window: int = 4,
+                                     session_id: str = DEFAULT_SESSION_ID):
+    """설정된 시뮬레이션을 백그라운드에서 실행하며 프레임을 푸시 (명령 형식은 simulation_stream 참고)
+    
+    max_fps: 초당 최대 프레임 수, speed: 실제 1초당 시뮬레이션 초 (0이면 최대 속도),
+    window: 확인(ack)되지 않은 프레임 최대 개수 (0이면 제한 없음), session_id: 실행할 세션
+    """
+    await websocket.accept()
+    try:
+        session = session_registry.acquire(session_id, create=False)
+    except KeyError:
+        session = None
+    # 스트림이 끝날 때까지 세션 임대 (설정 확인과 실행 사이에 제거되지 않음)
+    try:
+        if session is None or not await session.run(session.adapter.has_engine):
+            await websocket.send_json({'type': 'error', 'message': '시뮬레이션이 설정되지 않았습니다'})
+            await websocket.close()
+            return
+        
+        logger.info(f"📡 시뮬레이션 스트림 시작 (session={session_id}, max_fps={max_fps}, speed={speed}, window={window})")
+        stream = SimulationStream(session.adapter, websocket.send_json, max_fps=max_fps, speed=speed, window=window,
+                                  run=session.run)
+        session.streams += 1
+        try:
+            await stream.serve(websocket.receive_json)
+            await websocket.close()
+        except WebSocketDisconnect:
+            logger.info("📡 시뮬레이션 스트림 연결 종료")
+        except Exception as e:
+            logger.error(f"❌ 시뮬레이션 스트림 오류: {e}")
+            logger.error(traceback.format_exc())
+        finally:
+            session.streams -= 1
+    finally:
+        if session is not None:
+            session_registry.release(session)
+
 @router.post("/run", response_model=SimulationRunResult)
-def run_simulation_endpoint(max_steps: int = 100):
+async def run_simulation_endpoint(max_steps: int = 100, session: SimulationSession = Depends(get_session)):
     """시뮬레이션 연속 실행"""
     try:
         logger.info(f"🏃 새로운 단순 엔진 연속 실행 시작 (최대 {max_steps}스텝)")
-        result = engine_adapter.run_simulation(max_steps)
+        result = await session.run(session.adapter.run_simulation, max_steps)
         
         logger.info(f"✅ 연속 실행 완료 - 총 {result.total_entities_processed}개 엔티티 처리")
         return result
@@ -158,8 +275,79 @@ def run_simulation_endpoint(max_steps: int = 100):
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"연속 실행 오류: {str(e)}")
 
+@router.post("/run-until", response_model=RunUntilResult)
+async def run_until_endpoint(request: RunUntilRequest, session: SimulationSession = Depends(get_session)):
+    """목표 시간 또는 목표 배출 수까지 빠른 연속 실행 (중간 스냅샷 없음)"""
+    if request.until is None and request.entities_disposed is None and request.steady_state is None:
+        raise HTTPException(status_code=400, detail="until, entities_disposed, steady_state 중 하나는 지정해야 합니다")
+    
+    try:
+        logger.info(f"⏩ 빠른 연속 실행 시작 (until={request.until}, entities_disposed={request.entities_disposed})")
+        result = await session.run(session.adapter.run_until, request)
+        
+        logger.info(f"✅ 빠른 연속 실행 완료 - {result.final_time}s, {result.events_processed}개 이벤트, {result.wall_time:.2f}s 소요")
+        return result
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ 빠른 연속 실행 오류: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"빠른 연속 실행 오류: {str(e)}")
+
+@router.post("/replications", response_model=ReplicationResult)
+def run_replications_endpoint(request: ReplicationRequest):
+    """같은 설정을 여러 시드로 병렬 복제 실행하고 KPI 평균과 신뢰구간 반환"""
+    if request.until is None and request.entities_disposed is None:
+        raise HTTPException(status_code=400, detail="until 또는 entities_disposed 중 하나는 지정해야 합니다")
+    
+    try:
+        from ..replication_runner import run_replications
+        
+        simple_config = prepare_simple_config(request.config)
+        
+        seeds = request.seeds or list(range(request.base_seed, request.base_seed + request.replications))
+        logger.info(f"🔁 복제 실행 시작 ({len(seeds)}회)")
+        result = run_replications(simple_config, seeds, request.until, request.entities_disposed,
+                                  request.max_events, request.max_workers, request.confidence)
+        
+        logger.info(f"✅ 복제 실행 완료 - {len(seeds)}회, {result['wall_time']:.2f}s 소요")
+        return ReplicationResult(**result)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ 복제 실행 오류: {e}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"복제 실행 오류: {str(e)}")
+
+@router.post("/sweep")
+def run_sweep_endpoint(request: SweepRequest):
+    """파라미터 스윕 - 변형별 결과 행을 완료되는 대로 NDJSON으로 스트리밍"""
+    if request.until is None and request.entities_disposed is None:
+        raise HTTPException(status_code=400, detail="until 또는 entities_disposed 중 하나는 지정해야 합니다")
+    
+    from ..parameter_sweep import prepare_sweep, iter_sweep
+    
+    try:
+        # 변형 생성, 설정 변환, 인자 검사는 스트리밍 전에 수행하여 잘못된 요청은 400으로 응답
+        factors = [factor.model_dump() for factor in request.factors]
+        variants = prepare_sweep(request.config, factors, prepare_simple_config,
+                                 request.design, request.samples, request.design_seed)
+        rows = iter_sweep(variants, request.seeds, request.until, request.entities_disposed,
+                          request.max_events, request.max_workers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ 스윕 준비 오류: {e}")
+        raise HTTPException(status_code=400, detail=f"스윕 설정 오류: {str(e)}")
+    
+    logger.info(f"🧪 파라미터 스윕 시작 ({len(variants)}개 변형, 시드 {len(request.seeds)}개)")
+    return StreamingResponse((json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+                             media_type="application/x-ndjson")
+
 @router.post("/reset")
-def reset_simulation_endpoint():
+async def reset_simulation_endpoint(session: SimulationSession = Depends(get_session)):
     """시뮬레이션 리셋"""
     try:
         logger.info("🔄 새로운 단순 엔진 리셋")
@@ -168,7 +356,7 @@ def reset_simulation_endpoint():
         from ..logger_config import reset_log_file
         reset_log_file()
         
-        engine_adapter.reset_simulation()
+        await session.run(session.adapter.reset_simulation)
         
         logger.info("✅ 새로운 단순 엔진 리셋 완료")
         return {
@@ -182,10 +370,10 @@ def reset_simulation_endpoint():
         raise HTTPException(status_code=500, detail=f"리셋 오류: {str(e)}")
 
 @router.get("/status")
-def get_simulation_status():
+async def get_simulation_status(session: SimulationSession = Depends(get_session)):
     """현재 시뮬레이션 상태 조회"""
     try:
-        status = engine_adapter.get_simulation_status()
+        status = await session.run(session.adapter.get_simulation_status)
         status["engine_type"] = "simple_engine_v3"
         return status
         
@@ -292,7 +480,7 @@ def load_config_file(request: Dict[str, Any]):
 
 # 실행 모드 관련 API
 @router.post("/execution-mode")
-async def set_execution_mode(request: ExecutionModeRequest):
+async def set_execution_mode(request: ExecutionModeRequest, session: SimulationSession = Depends(get_session)):
     """실행 모드 설정"""
     try:
         # 유효한 모드인지 확인
@@ -301,7 +489,7 @@ async def set_execution_mode(request: ExecutionModeRequest):
             raise HTTPException(status_code=400, detail=f"Invalid execution mode: {request.mode}")
         
         # 엔진 어댑터에 모드 설정
-        engine_adapter.set_execution_mode(request.mode, request.config)
+        await session.run(session.adapter.set_execution_mode, request.mode, request.config)
         
         logger.info(f"✅ 실행 모드 설정: {request.mode}")
         return {"success": True, "mode": request.mode}
@@ -313,11 +501,10 @@ async def set_execution_mode(request: ExecutionModeRequest):
         raise HTTPException(status_code=500, detail=f"실행 모드 설정 오류: {str(e)}")
 
 @router.get("/execution-mode")
-async def get_execution_mode():
+async def get_execution_mode(session: SimulationSession = Depends(get_session)):
     """현재 실행 모드 조회"""
     try:
-        mode = engine_adapter.get_execution_mode()
-        config = engine_adapter.get_mode_config()
+        mode, config = await session.run(lambda: (session.adapter.get_execution_mode(), session.adapter.get_mode_config()))
         
         return {
             "mode": mode,
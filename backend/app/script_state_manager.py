@@ -98,7 +98,7 @@ class ScriptStateManager:
             result[block_id] = {
                 'current_line': state.current_line,
                 'is_executing': state.is_executing,
-                'entity_id': state.entity_id,
+                'entity_id': str(state.entity_id) if state.entity_id is not None else None,
                 'waiting_for': state.waiting_for
             }
         return result
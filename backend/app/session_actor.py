@@ -0,0 +1,63 @@
+"""
+세션 실행 액터
+세션 엔진을 건드리는 모든 작업을 전용 스레드 하나의 명령 큐에서 순서대로 실행합니다.
+
+- 엔진 코드가 FastAPI 이벤트 루프에서 실행되지 않으므로 긴 스텝 중에도 /health 등 다른 요청이 지연되지 않음
+- 작성자가 스레드 하나뿐이므로 같은 세션에 대한 동기/비동기 라우트가 엔진을 동시에 건드리지 않음
+- 세션마다 스레드가 따로 있어 한 세션의 긴 실행이 다른 세션의 명령을 기다리게 하지 않음
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SessionActor:
+    """단일 작성자 실행기 (명령 큐 + 전용 워커 스레드)"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"session-{name}")
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self.closed = False
+    
+    @property
+    def pending(self) -> int:
+        """대기 중이거나 실행 중인 명령 수"""
+        return self._pending
+    
+    @property
+    def busy(self) -> bool:
+        return self._pending > 0
+    
+    def _done(self, _future: Future):
+        with self._pending_lock:
+            self._pending -= 1
+    
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """명령을 큐에 넣고 Future 반환"""
+        if self.closed:
+            raise RuntimeError(f"Session {self.name} is closed")
+        with self._pending_lock:
+            self._pending += 1
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._done)
+        return future
+    
+    async def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """비동기 라우트용 - 액터 스레드에서 실행하고 결과를 기다림 (이벤트 루프는 막지 않음)"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+    
+    def call_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """동기 코드용 - 액터 스레드에서 실행하고 결과를 기다림 (액터 스레드 안에서 호출하면 안 됨)"""
+        return self.submit(fn, *args, **kwargs).result()
+    
+    def shutdown(self):
+        """대기 중인 명령을 취소하고 워커 스레드 종료 (실행 중인 명령은 끝까지 실행)"""
+        self.closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Session actor {self.name} shut down")
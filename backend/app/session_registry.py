@@ -0,0 +1,183 @@
+"""
+시뮬레이션 세션 레지스트리
+세션 ID마다 독립된 엔진 어댑터(엔진, 디버그 매니저, 스크립트 실행 상태)를 보관합니다.
+
+- 세션 수는 max_sessions(settings.max_concurrent_simulations)로 제한
+- idle_ttl초 동안 사용되지 않은 세션은 다음 조회 때 제거
+- 새 세션이 필요한데 가득 차면 사용 중이 아닌 가장 오래 사용되지 않은 세션을 제거
+- 요청은 acquire로 세션을 임대(lease)하고 끝나면 release - 임대 중인 세션은 제거하지 않음
+- 기본 세션(DEFAULT_SESSION_ID)은 고정되어 idle/LRU로 제거되지 않음 (세션 ID 없는 프런트엔드용)
+- 세션 엔진은 세션 액터(session_actor)의 전용 스레드에서만 실행
+
+세션 ID를 주지 않는 기존 클라이언트는 DEFAULT_SESSION_ID 세션을 함께 사용합니다.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from .config import settings
+from .session_actor import SessionActor
+from .simple_engine_adapter import SimpleEngineAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+
+
+class SessionLimitError(Exception):
+    """모든 세션이 사용 중이어서 새 세션을 만들 수 없음"""
+
+
+@dataclass
+class SimulationSession:
+    """세션 하나의 엔진 어댑터와 실행 액터"""
+    session_id: str
+    adapter: SimpleEngineAdapter = field(default_factory=SimpleEngineAdapter)
+    actor: SessionActor = field(init=False)
+    created_at: float = field(default_factory=time.time)
+    last_access: float = 0.0
+    streams: int = 0  # 연결된 WebSocket 스트림 수
+    leases: int = 0  # 세션을 사용 중인 요청 수 (SessionRegistry.acquire/release)
+    
+    def __post_init__(self):
+        self.actor = SessionActor(self.session_id)
+    
+    def touch(self):
+        self.last_access = time.monotonic()
+    
+    @property
+    def busy(self) -> bool:
+        """실행 중/대기 중인 명령, 연결된 스트림, 처리 중인 요청이 있으면 제거하지 않음"""
+        return self.actor.busy or self.streams > 0 or self.leases > 0
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """엔진 작업을 세션 액터에서 실행 (비동기 라우트용)"""
+        self.touch()
+        return await self.actor.call(fn, *args, **kwargs)
+    
+    def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """엔진 작업을 세션 액터에서 실행하고 결과를 기다림 (동기 코드용)"""
+        self.touch()
+        return self.actor.call_sync(fn, *args, **kwargs)
+    
+    def close(self):
+        self.actor.shutdown()
+    
+    def info(self, now: float) -> Dict[str, Any]:
+        adapter = self.adapter
+        return {
+            'session_id': self.session_id,
+            'created_at': self.created_at,
+            'idle_seconds': round(now - self.last_access, 1),
+            'busy': self.busy,
+            'pending_commands': self.actor.pending,
+            'streams': self.streams,
+            'initialized': adapter.has_engine(),
+            'simulation_time': round(adapter.engine.env.now, 1) if adapter.has_engine() else None,
+        }
+
+
+class SessionRegistry:
+    """세션 ID → SimulationSession (LRU 순서로 보관)"""
+    
+    def __init__(self, max_sessions: int = 10, idle_ttl: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.sessions: "OrderedDict[str, SimulationSession]" = OrderedDict()
+        # idle/LRU로 제거하지 않는 세션 ID
+        self.pinned = {DEFAULT_SESSION_ID}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.sessions)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+    
+    def _evict_expired(self, now: float) -> List[str]:
+        """idle_ttl을 넘긴 세션 제거 (사용 중인 세션은 유지)"""
+        evicted = []
+        for session_id, session in list(self.sessions.items()):
+            if now - session.last_access < self.idle_ttl or session.busy or session_id in self.pinned:
+                continue
+            del self.sessions[session_id]
+            session.close()
+            evicted.append(session_id)
+        if evicted:
+            logger.info(f"Evicted idle sessions: {evicted}")
+        return evicted
+    
+    def _evict_lru(self) -> bool:
+        """사용 중이 아닌 가장 오래된 세션 하나를 제거 (고정 세션 제외)"""
+        for session_id, session in self.sessions.items():
+            if not session.busy and session_id not in self.pinned:
+                del self.sessions[session_id]
+                session.close()
+                logger.info(f"Evicted least recently used session {session_id}")
+                return True
+        return False
+    
+    def get(self, session_id: str = DEFAULT_SESSION_ID, create: bool = True) -> SimulationSession:
+        """세션 조회 (없으면 생성), 조회할 때마다 사용 시각 갱신
+        
+        create가 False이고 세션이 없으면 KeyError, 가득 찼는데 모두 사용 중이면 SessionLimitError
+        """
+        with self._lock:
+            return self._get(session_id, create)
+    
+    def acquire(self, session_id: str = DEFAULT_SESSION_ID, create: bool = True) -> SimulationSession:
+        """get과 같지만 같은 잠금 안에서 세션을 임대 - release 전까지 다른 요청의 제거 대상이 되지 않음"""
+        with self._lock:
+            session = self._get(session_id, create)
+            session.leases += 1
+            return session
+    
+    def release(self, session: SimulationSession):
+        """acquire로 잡은 임대 반환"""
+        with self._lock:
+            session.leases -= 1
+    
+    def _get(self, session_id: str, create: bool) -> SimulationSession:
+        """잠금을 잡은 상태에서 세션 조회/생성"""
+        now = time.monotonic()
+        self._evict_expired(now)
+        
+        session = self.sessions.get(session_id)
+        if session is None:
+            if not create:
+                raise KeyError(session_id)
+            if len(self.sessions) >= self.max_sessions and not self._evict_lru():
+                raise SessionLimitError(f"All {self.max_sessions} simulation sessions are busy")
+            session = SimulationSession(session_id)
+            self.sessions[session_id] = session
+            logger.info(f"Created simulation session {session_id} ({len(self.sessions)}/{self.max_sessions})")
+        
+        session.touch()
+        self.sessions.move_to_end(session_id)
+        return session
+    
+    def create(self) -> SimulationSession:
+        """새 세션 ID로 세션 생성"""
+        return self.get(uuid.uuid4().hex)
+    
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+    
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired(now)
+            return [session.info(now) for session in self.sessions.values()]
+
+
+# 전역 레지스트리 (세션별 상태는 각 세션 안에만 존재)
+session_registry = SessionRegistry(settings.max_concurrent_simulations, settings.session_idle_ttl)
@@ -2,20 +2,25 @@
 독립적인 블록 객체
 각 블록이 완전 독립적으로 동작합니다.
 """
+import heapq
 import simpy
 import logging
 from typing import List, Generator, Optional, Dict, Any
 from .simple_script_executor import SimpleScriptExecutor
 from .simple_entity import SimpleEntity
-from .step_mode_wrapper import StepModeWrapper
 
 logger = logging.getLogger(__name__)
 
+# force execution 블록이 지연 없이 끝난 뒤 다시 시작하기까지의 최소 간격
+FORCE_EXECUTION_INTERVAL = 0.01
+
 class IndependentBlock:
     """완전 독립적인 블록 객체"""
     
     def __init__(self, block_id: str, block_name: str, script_lines: List[str], 
-                 signal_manager=None, max_capacity: int = 100, integer_manager=None, variable_accessor=None, debug_manager=None):
+                 signal_manager=None, max_capacity: int = 100, integer_manager=None, variable_accessor=None, debug_manager=None,
+                 rng=None, script_state=None, journal=None, entity_pool=None, fuse_instructions=False,
+                 statistics=None, program=None, attributes=None):
         self.id = block_id
         self.name = block_name
         self.script_lines = script_lines
@@ -23,13 +28,45 @@ class IndependentBlock:
         self.max_capacity = max_capacity
         self.debug_manager = debug_manager
         
+        # 스크립트 실행 상태 관리자 (엔진별 인스턴스, 없으면 전역 인스턴스)
+        if script_state is None:
+            from .script_state_manager import script_state_manager as script_state
+        self.script_state = script_state
+        
+        # 엔진의 엔티티 이동 저널 (없으면 기록하지 않음)
+        self.journal = journal
+        # 엔진의 엔티티 발급기 (없으면 엔티티를 직접 생성)
+        self.entity_pool = entity_pool
+        # 엔진의 KPI 수집기 (없으면 통계를 모으지 않음)
+        self.stats = statistics.register(block_id, block_name) if statistics is not None and statistics.enabled else None
+        
         # 스크립트 실행기
-        self.script_executor = SimpleScriptExecutor(signal_manager, integer_manager, variable_accessor, debug_manager)
+        self.script_executor = SimpleScriptExecutor(signal_manager, integer_manager, variable_accessor, debug_manager, rng,
+                                                    attributes)
+        self.script_executor.fuse_instructions = fuse_instructions
+        self.script_executor.journal = journal
+        
+        # 스크립트는 블록 생성 시 한 번만 컴파일 (엔진이 같은 스크립트의 이전 컴파일 결과를 주면 재사용)
+        self.program = program if program is not None else self.script_executor.compile_program(script_lines)
         
         # 블록 상태
         self.entities_in_block: List[SimpleEntity] = []
         self.total_processed = 0
         
+        # go ... wait 대기열: (-우선순위, 도착 순번, 엔티티, 출발 블록, 깨우기 이벤트, 대기 시작 시간)
+        self.entry_queue: List[tuple] = []
+        self.entry_sequence = 0
+        # 다른 블록에서 옮겨오는 중인 엔티티 몫으로 잡아 둔 자리 (receive_entity)
+        self.reserved_slots = 0
+        # 이 블록의 엔티티가 가득 찬 대상 블록 앞에서 기다린 시간 (blocking-after-service)
+        self.blocked_time = 0.0
+        self.blocked_count = 0
+        # 이 블록을 후보로 가진 go any 디스패처 (엔티티 수가 바뀔 때마다 알림)
+        self.dispatch_groups: List[Any] = []
+        # 스크립트가 멈춘 명령 ('wait'|'go'|'seize', 피연산자) - 교착 감지용, 멈춘 횟수
+        self.waiting_on: Optional[tuple] = None
+        self.park_count = 0
+        
         # 블록 간 연결 정보
         self.output_connections: Dict[str, str] = {}  # connector_name -> target_block_id
         
@@ -41,11 +78,16 @@ class IndependentBlock:
         
         # 엔진 참조 (블록 상태 명령어 처리용)
         self.engine_ref = None
+        self.env: Optional[simpy.Environment] = None
+        
+        # 블록 프로세스 활성화 이벤트 (대기 중일 때만 존재)
+        self.activation: Optional[simpy.Event] = None
         
         # 실행 상태 관리
         self.execution_state = "idle"  # "idle" or "running"
         self.is_executing_script = False
-        self.execute_requested = False  # execute 명령으로 실행 요청됨
+        self.execute_requested = False  # 실행 중에 다시 실행 요청됨 (go any로 엔티티를 받음, 끝나면 다시 실행)
+        self.force_execution_interval = FORCE_EXECUTION_INTERVAL  # force execution 재시작 최소 간격
         
         # 반복 로그 제한
         self.last_capacity_warning_time = {}  # entity_id -> last_warning_time
@@ -76,10 +118,11 @@ class IndependentBlock:
     
     def has_force_execution(self) -> bool:
         """첫 번째 줄이 force execution인지 확인"""
-        if self.script_lines:
-            first_line = self.script_lines[0].strip()
-            return first_line.lower() == 'force execution'
-        return False
+        return self.program.force_execution
+    
+    def has_dispose(self) -> bool:
+        """스크립트에 dispose 명령이 있는지 확인"""
+        return self.program.has_dispose
     
     def get_script_lines_without_force_execution(self) -> List[str]:
         """force execution을 제외한 스크립트 라인 반환"""
@@ -97,6 +140,25 @@ class IndependentBlock:
         current_time = env.now
         self.warnings = [w for w in self.warnings if current_time - w['timestamp'] <= max_age]
     
+    def set_executing(self, executing: bool):
+        """스크립트 실행 중 여부 설정 (KPI 상태 갱신)"""
+        self.is_executing_script = executing
+        if self.stats is not None:
+            self.stats.set_executing(executing)
+    
+    def park(self, kind: str, operand: Any):
+        """스크립트가 wait / go ... wait / seize에서 멈춤 (교착 감지기가 참조)"""
+        self.waiting_on = (kind, operand)
+        self.park_count += 1
+    
+    def unpark(self):
+        self.waiting_on = None
+    
+    def activate(self):
+        """대기 중인 블록 프로세스를 깨움 (엔티티 도착/이탈, 스크립트 실행 종료 시)"""
+        if self.activation is not None and not self.activation.triggered:
+            self.activation.succeed()
+    
     def set_status(self, status: str):
         """블록 상태 설정"""
         self.status = status
@@ -108,7 +170,7 @@ class IndependentBlock:
     
     def can_accept_entity(self) -> bool:
         """엔티티를 받을 수 있는지 확인"""
-        return len(self.entities_in_block) < self.max_capacity
+        return len(self.entities_in_block) + self.reserved_slots < self.max_capacity
     
     def add_entity(self, entity: SimpleEntity) -> bool:
         """엔티티를 블록에 추가"""
@@ -119,49 +181,125 @@ class IndependentBlock:
             if hasattr(entity, 'state'):
                 entity.state = "normal"
             self.entities_in_block.append(entity)
+            if self.journal is not None:
+                self.journal.record(self.id, entity.id, 1)
+            if self.stats is not None:
+                self.stats.entity_entered(entity)
+            self.activate()
+            if self.dispatch_groups:
+                self._notify_dispatch_groups()
             return True
         return False
     
+    def receive_entity(self, entity: SimpleEntity, source_block: 'IndependentBlock') -> bool:
+        """source_block의 엔티티를 이 블록으로 옮김
+        
+        출발 블록에서 빼는 동안 대기열/디스패처가 재진입해 다른 엔티티를 이 블록에 넣을 수 있으므로
+        자리를 먼저 잡아 두고 뺀 뒤에 넣습니다 (넣기를 먼저 하면 출발 블록의 체류 시간 통계가 틀어짐).
+        """
+        self.reserved_slots += 1
+        try:
+            source_block.remove_entity(entity)
+        finally:
+            self.reserved_slots -= 1
+        return self.add_entity(entity)
+    
     def remove_entity(self, entity: SimpleEntity):
-        """엔티티를 블록에서 제거"""
+        """엔티티를 블록에서 제거 (빈 자리가 나면 대기 중인 엔티티를 받음)"""
         if entity in self.entities_in_block:
             self.entities_in_block.remove(entity)
+            if self.journal is not None:
+                self.journal.record(self.id, entity.id, -1)
+            if self.stats is not None:
+                self.stats.entity_left(entity)
+            if self.last_capacity_warning_time:
+                self.last_capacity_warning_time.pop(entity.id, None)
+            self.activate()
+            if self.entry_queue:
+                self._admit_waiting()
+            if self.dispatch_groups:
+                self._notify_dispatch_groups()
+    
+    def _notify_dispatch_groups(self):
+        """후보로 등록된 디스패처의 가용성 인덱스 갱신 (자리가 나면 대기 엔티티를 받음)"""
+        now = self.env.now if self.env is not None else 0.0
+        for group in self.dispatch_groups:
+            group.block_changed(self, now)
+    
+    def wait_for_entry(self, env, entity: SimpleEntity, source_block: 'IndependentBlock', wakeup, priority: int = 0):
+        """가득 찬 블록에 들어가려는 엔티티를 대기열에 넣음 (빈 자리가 나면 옮긴 뒤 wakeup 발생)"""
+        self.entry_sequence += 1
+        heapq.heappush(self.entry_queue, (-priority, self.entry_sequence, entity, source_block, wakeup, env.now))
+        if source_block.stats is not None:
+            source_block.stats.change_blocked(1)
+        logger.info(f"[{env.now:.1f}s] Entity {entity.id} waiting to enter {self.name} (queue: {len(self.entry_queue)})")
+    
+    def _admit_waiting(self):
+        """빈 자리만큼 대기열의 엔티티를 우선순위/도착 순으로 출발 블록에서 옮겨옴"""
+        queue = self.entry_queue
+        while queue and self.can_accept_entity():
+            _, _, entity, source_block, wakeup, since = heapq.heappop(queue)
+            waited = (self.env.now if self.env is not None else since) - since
+            source_block.blocked_time += waited
+            source_block.blocked_count += 1
+            if source_block.stats is not None:
+                source_block.stats.change_blocked(-1, waited)
+            if entity not in source_block.entities_in_block:
+                # 기다리는 동안 출발 블록에서 사라진 엔티티 (이동하지 않고 스크립트만 재개)
+                wakeup.succeed(False)
+                continue
+            moved = self.receive_entity(entity, source_block)
+            if moved:
+                entity.movement_completed = True
+                entity.movement_requested = False
+            wakeup.succeed(moved)
+    
+    def new_entity(self) -> SimpleEntity:
+        """엔티티 발급 (엔진 풀이 있으면 풀에서)"""
+        if self.entity_pool is not None:
+            return self.entity_pool.acquire()
+        return SimpleEntity(attributes=self.script_executor.attributes)
     
     def create_entity(self, env: simpy.Environment) -> Generator:
         """엔티티 생성 (create entity 명령용)"""
+        entity = self.spawn_entity(env)
+        yield env.timeout(0)
+        return entity
+    
+    def spawn_entity(self, env: simpy.Environment) -> Optional[SimpleEntity]:
+        """엔티티를 즉시 생성해 블록에 추가 (대기 없음, 용량이 없으면 None)"""
         if self.can_accept_entity():
-            entity = SimpleEntity()
+            entity = self.new_entity()
             entity.created_at = round(env.now, 1)
             if self.add_entity(entity):
                 # logger.info(f"[{env.now:.1f}s] Block {self.name} created entity {entity.id}")
-                yield env.timeout(0)
                 return entity
-        yield env.timeout(0)
         return None
     
     def dispose_entity(self, env: simpy.Environment, entity: SimpleEntity) -> Generator:
         """엔티티 제거 (dispose entity 명령용)"""
+        self.discard_entity(entity)
+        yield env.timeout(0)
+    
+    def discard_entity(self, entity: SimpleEntity):
+        """엔티티를 즉시 배출 (대기 없음)"""
         if entity in self.entities_in_block:
             self.remove_entity(entity)
+            if self.stats is not None:
+                self.stats.entity_disposed(entity)
+            entity.disposed = True
             self.total_processed += 1
             logger.info(f"[{self.name}] Disposed entity {entity.id}, total_processed now: {self.total_processed}")
-        yield env.timeout(0)
     
     def process_entity(self, env: simpy.Environment, entity: SimpleEntity) -> Generator:
         """엔티티 도착 시 스크립트를 실행 (디버그 지원 포함)"""
-        # 스크립트 실행 상태 관리
-        from .script_state_manager import script_state_manager
-        
         # 스크립트 실행 시작
         entity_id = entity.id if entity else None
-        script_state_manager.start_execution(self.id, entity_id, entity)
+        self.script_state.start_execution(self.id, entity_id, entity)
         
         try:
-            # 전체 스크립트를 문자열로 변환
-            script_text = '\n'.join(self.script_lines)
-            
-            # 스크립트 실행 (디버그 매니저가 브레이크포인트 처리)
-            result = yield from self.script_executor.execute_script(script_text, entity, env, self)
+            # 컴파일된 스크립트 실행 (디버그 매니저가 브레이크포인트 처리)
+            result = yield from self.script_executor.execute_program(self.program, entity, env, self)
             
             # 결과 처리
             if isinstance(result, tuple) and result[0] == 'created_entity':
@@ -175,7 +313,12 @@ class IndependentBlock:
         
         finally:
             # 스크립트 실행 완료 - 상태 초기화
-            script_state_manager.end_execution(self.id)
+            self.script_state.end_execution(self.id)
+            self.activate()
+        
+        # 이 스크립트에서 배출한 엔티티는 스크립트가 끝난 뒤 풀로 반환
+        if entity is not None and entity.disposed and self.entity_pool is not None:
+            self.entity_pool.release(entity)
         
         # 스크립트 실행 완료
         return None
@@ -188,7 +331,7 @@ class IndependentBlock:
         
         # 실행 상태 변경
         self.execution_state = "running"
-        self.is_executing_script = True
+        self.set_executing(True)
         logger.info(f"Block {self.name} started execution by command")
         
         try:
@@ -198,124 +341,42 @@ class IndependentBlock:
         finally:
             # 실행 완료 후 상태 복원
             self.execution_state = "idle"
-            self.is_executing_script = False
+            self.set_executing(False)
+            self.activate()
             logger.info(f"Block {self.name} finished execution")
+            if self.execute_requested:
+                self.execute_requested = False
+                if self.entities_in_block:
+                    env.process(self.execute_script_by_command(env))
         
         return True
     
-    def _execute_remaining_script(self, env: simpy.Environment, start_line: int) -> Generator:
-        """엔티티 이동 후 남은 스크립트 실행"""
-        current_line = start_line
-        
-        while current_line < len(self.script_lines):
-            line = self.script_lines[current_line].strip()
-            
-            # 빈 줄이나 주석은 건너뛰기
-            if not line or line.startswith('//'):
-                current_line += 1
-                continue
-            
-            # 스크립트 라인 실행 (엔티티 없이)
-            
-            # if 조건문 처리
-            if line.startswith('if '):
-                condition = line[3:].strip()
-                condition_result = False
-                if ' = ' in condition:
-                    parts = condition.split(' = ', 1)
-                    signal_name = parts[0].strip()
-                    expected_value = parts[1].strip().lower() == 'true'
-                    if self.signal_manager:
-                        current_value = self.signal_manager.get_signal(signal_name, False)
-                        condition_result = current_value == expected_value
-                
-                if condition_result:
-                    # 조건이 참이면 다음 라인 실행
-                    current_line += 1
-                else:
-                    # 조건이 거짓이면 들여쓰기된 블록 스킵
-                    current_line = self._skip_indented_block(current_line)
-            
-            # 신호 설정 명령 실행
-            elif ' = ' in line and not line.startswith('wait '):
-                parts = line.split(' = ', 1)
-                signal_name = parts[0].strip()
-                value = parts[1].strip()
-                bool_value = value.lower() == 'true'
-                if self.signal_manager:
-                    self.signal_manager.set_signal(signal_name, bool_value)
-                current_line += 1
-            
-            # go to/go from 명령은 무시 (이미 엔티티가 이동했으므로)
-            elif line.startswith('go to ') or line.startswith('go from '):
-                current_line += 1
-            
-            # product type 명령도 무시 (엔티티가 없으므로)
-            elif 'product type' in line:
-                current_line += 1
-            
-            else:
-                current_line += 1
-        
-        yield env.timeout(0)
-    
-    def _skip_indented_block(self, if_line_index: int) -> int:
-        """if 조건이 거짓일 때 들여쓰기된 블록을 스킵"""
-        current_line = if_line_index + 1
-        
-        while current_line < len(self.script_lines):
-            line = self.script_lines[current_line]
-            stripped_line = line.lstrip()
-            
-            # 빈 줄은 건너뛰기
-            if not stripped_line:
-                current_line += 1
-                continue
-            
-            # 들여쓰기가 있으면 스킵, 없으면 종료
-            if line.startswith('\t') or line.startswith('    ') or line.startswith('  '):
-                current_line += 1
-            else:
-                break
-        
-        return current_line
-    
     def create_block_process(self, env: simpy.Environment, entity_queue: simpy.Store, 
                            engine_ref) -> Generator:
-        """통합 블록 프로세스 - 모든 블록이 동일하게 동작"""
+        """통합 블록 프로세스 - 모든 블록이 동일하게 동작
+        
+        할 일이 없으면 주기적으로 확인하지 않고 활성화 이벤트에서 대기합니다.
+        엔티티 도착/이탈, execute 명령 종료, 스크립트 실행 종료 시 activate()로 깨어납니다.
+        """
         # 엔진 참조 저장
         self.engine_ref = engine_ref
+        self.env = env
         
         # force execution 여부 확인
         is_force_execution = self.has_force_execution()
         
         while True:
             try:
-                # 오래된 경고 정리
-                self.clear_old_warnings(env)
-                
                 # 스크립트 상태 확인
-                from .script_state_manager import script_state_manager
-                state = script_state_manager.get_state(self.id)
+                state = self.script_state.get_state(self.id)
                 
-                # 디버그: 매 루프마다 상태 출력 (force execution 블록만)
+                # 디버그: 깨어날 때마다 상태 출력 (force execution 블록만)
                 if is_force_execution and env.now < 5:  # 처음 5초만 로그
                     logger.info(f"[LOOP] Block {self.name} at {env.now:.1f}s: entities={len(self.entities_in_block)}, is_executing={state.is_executing}, is_executing_script={self.is_executing_script}")
                 
-                # 이미 실행 중인 경우 (force execution으로 생성된 엔티티 처리)
-                if state.is_executing and state.entity_ref and state.entity_ref in self.entities_in_block:
-                    entity = state.entity_ref
-                    # logger.debug(f"Block {self.name} continuing with entity {entity.id} from state")
-                    
-                    # go 명령이 동기적으로 처리되므로 여기서는 이동 처리하지 않음
-                    # 상태 초기화
-                    script_state_manager.end_execution(self.id)
-                        
-                # 엔티티 도착 시 자동 스크립트 실행 제거 - execute 명령어를 통해서만 실행
-                
                 # force execution이고 엔티티가 없으면 스크립트 실행
                 # force execution은 is_executing 상태와 관계없이 실행 (wait에서 대기 중일 수 있음)
-                elif is_force_execution:
+                if is_force_execution:
                     # 로그 제한: 상태가 변경될 때만 출력
                     if not hasattr(self, '_last_force_exec_log_state'):
                         self._last_force_exec_log_state = None
@@ -331,119 +392,48 @@ class IndependentBlock:
                         
                         # force execution은 execution_state를 체크하지 않음 (무한 루프)
                         # 임시로 실행 중 표시
-                        self.is_executing_script = True
+                        self.set_executing(True)
                         
                         # 엔티티 없이 스크립트 실행
                         yield from self.process_entity(env, None)
                         
                         # 실행 완료 후 플래그만 해제 (execution_state는 변경하지 않음)
-                        self.is_executing_script = False
-                    
-                    # go 명령이 동기적으로 처리되므로 여기서는 이동 처리하지 않음
-                    
-                    # 짧은 대기
-                    yield env.timeout(0.01)
-                else:
-                    # 대기
-                    yield env.timeout(0.01)
+                        self.set_executing(False)
+                        
+                        # 지연 없는 스크립트가 같은 시각에 무한 반복되지 않도록 최소 간격 유지
+                        yield env.timeout(self.force_execution_interval)
+                        continue
+                
+                # 다음 활성화까지 대기 (할 일이 없는 블록은 이벤트 큐에 아무것도 남기지 않음)
+                self.activation = env.event()
+                yield self.activation
+                self.activation = None
                     
             except Exception as e:
                 logger.error(f"Block {self.name} process error: {e}")
+                self.activation = None
                 yield env.timeout(0.1)
     
-    def _source_process(self, env: simpy.Environment, entity_queue: simpy.Store, 
-                       engine_ref) -> Generator:
-        """소스 블록 프로세스"""
-        
-        # 스크립트에서 이동 지연 시간 추출 (새로운 go 형식)
-        transit_delay = 0
-        for line in self.script_lines:
-            stripped_line = line.strip()
-            
-            # 새로운 go 명령어 형식: go R to 공정1.L(0,3)
-            if stripped_line.startswith('go '):
-                import re
-                # go R to 공정1.L(0,3) 형태 파싱
-                go_pattern = r'^go\s+[^\s]+\s+to\s+[^(]+(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?$'
-                match = re.match(go_pattern, stripped_line, re.IGNORECASE)
-                if match:
-                    delay_str = match.group(2)  # 딜레이 부분
-                    if delay_str:
-                        try:
-                            transit_delay = float(delay_str)
-                            break
-                        except:
-                            pass
-        
-        # 정확한 생성 주기 계산: 이동 시간만 고려
-        generation_cycle = transit_delay if transit_delay > 0 else 3  # 기본값 3초
-        last_entity_sent = None  # 마지막으로 보낸 엔티티 추적
-        
-        while True:  # 계속 엔티티 생성
-            # 정확한 생성 시간까지 대기
-            if env.now < self.next_generation_time:
-                yield env.timeout(self.next_generation_time - env.now)
-            
-            # 소스 블록 자체가 가득 찼으면 엔티티 생성하지 않음
-            if not self.can_accept_entity():
-                # logger.debug(f"Source block {self.name} is full, skipping entity generation")
-                yield env.timeout(1.0)  # 1초 대기로 변경하여 로그 빈도 줄임
-                continue
-            
-            # 블록에 엔티티가 없을 때만 새로 생성 (기존 로직 유지)
-            if len(self.entities_in_block) == 0:
-                entity = SimpleEntity()
-                entity.created_at = round(env.now, 1)
-                
-                if self.add_entity(entity):
-                    # logger.debug(f"Source block {self.name} created entity {entity.id}")
-                    
-                    # 다음 생성 시간 설정 (현재 시간 + 생성 주기)
-                    self.next_generation_time = round(env.now + generation_cycle, 1)
-                    
-                    # 스크립트 실행 (끝까지 실행됨)
-                    yield from self.process_entity(env, entity)
-                    
-                    # go 명령이 동기적으로 처리되므로 여기서는 이동 처리하지 않음
-                else:
-                    # logger.warning(f"Failed to add entity to source block {self.name}")
-                    pass
-            
-            # 다음 생성까지 대기
-            yield env.timeout(0.01)  # 매우 짧은 간격으로 확인
-    
-    def _regular_process(self, env: simpy.Environment, entity_queue: simpy.Store, 
-                        engine_ref) -> Generator:
-        """일반 블록 프로세스"""
-        # 대기 중인 엔티티가 있는지 확인
-        if not self.entities_in_block:
-            yield env.timeout(0.1)
-            return
-        
-        # 첫 번째 엔티티 처리
-        entity = self.entities_in_block[0]
-        
-        # 스크립트 실행 (끝까지 실행됨)
-        yield from self.process_entity(env, entity)
-        
-        # go 명령이 동기적으로 처리되므로 여기서는 이동 처리하지 않음
-        
-        yield env.timeout(0)  # 즉시 처리
-    
     def get_status(self) -> Dict[str, Any]:
         """블록 상태 정보 반환"""
+        # 오래된 경고는 조회 시점에 정리
+        if self.env is not None:
+            self.clear_old_warnings(self.env)
+        
         return {
             'id': self.id,
             'name': self.name,
             'entities_count': len(self.entities_in_block),
             'total_processed': self.total_processed,
+            'blocked_time': self.blocked_time,
+            'waiting_to_enter': len(self.entry_queue),
             'capacity': f"{len(self.entities_in_block)}/{self.max_capacity}",
             'warnings': self.warnings,  # 경고 메시지 포함
             'status': self.status  # 블록 상태 속성 추가
         }
     
-    def get_script_logs(self) -> List[Dict[str, Any]]:
-        """블록의 스크립트 실행 로그 반환"""
+    def get_script_logs(self, start: int = 0) -> List[Dict[str, Any]]:
+        """블록의 스크립트 실행 로그 반환 (start번째 로그부터)"""
         if self.script_executor:
-            return self.script_executor.get_simulation_logs()
+            return self.script_executor.get_simulation_logs(start)
         return []
\ No newline at end of file
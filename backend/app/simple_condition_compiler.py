@@ -0,0 +1,356 @@
+"""
+조건식 컴파일러
+if/elif/wait 조건식을 한 번만 파싱하여 타입이 있는 AST로 만들고,
+신호/정수 이름을 변수 저장소(VariableStore)의 슬롯으로 한 번만 해석하여
+슬롯 값을 직접 읽는 클로저로 컴파일합니다.
+
+문법 (우선순위: or < and < not)
+    조건    := and식 ('or' and식)*
+    and식   := not식 ('and' not식)*
+    not식   := 'not' not식 | 항
+    항      := 신호 (= | !=) true|false
+             | 정수변수 (>= | <= | != | = | > | <) 정수|변수
+             | product type[(index)] (= | !=) 값
+             | 값     (직전 product type 비교의 축약형: product type = a or b)
+"""
+import operator
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .core.variable_store import BOOLEAN, INTEGER, VariableStore
+from .simple_entity import AttributeTable, default_attributes
+
+# 조건식 비교 연산자 (긴 것부터 확인)
+CONDITION_OPERATORS = (' >= ', ' <= ', ' != ', ' = ', ' > ', ' < ')
+
+INT_COMPARATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '!=': operator.ne,
+    '=': operator.eq,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+RE_OR = re.compile(r'\s+or\s+')
+RE_AND = re.compile(r'\s+and\s+')
+RE_PRODUCT_TYPE_INDEX = re.compile(r'^product\s+type\((\d+)\)\s*(!=|=)\s*(.+)$')
+RE_PRODUCT_TYPE = re.compile(r'^product\s+type\s*(!=|=)\s*(.+)$')
+
+# product type 비교 중 속성이 아니라 엔티티 상태를 보는 값
+ENTITY_STATES = ('transit', 'normal')
+
+# 컴파일된 조건: (entity, block) -> bool
+ConditionFunction = Callable[[Any, Any], bool]
+
+
+@dataclass(frozen=True, slots=True)
+class OrNode:
+    """a or b or ..."""
+    terms: Tuple[Any, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class AndNode:
+    """a and b and ..."""
+    terms: Tuple[Any, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class NotNode:
+    """not a"""
+    term: Any
+
+
+@dataclass(frozen=True, slots=True)
+class SignalCompare:
+    """신호 = true/false, 신호 != true/false"""
+    name: str
+    expected: bool
+    negate: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class IntCompare:
+    """정수 변수 비교 (literal이 없으면 reference 변수 값과 비교)"""
+    name: str
+    op: str
+    literal: Optional[int] = None
+    reference: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductTypeCompare:
+    """product type 조건 (index가 None이면 현재 엔티티, 있으면 블록의 index번째 엔티티)"""
+    index: Optional[int]
+    value: str
+    negate: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Constant:
+    """해석할 수 없는 조건 (항상 같은 값)"""
+    value: bool
+
+
+@lru_cache(maxsize=1024)
+def parse_condition(condition: str):
+    """조건식 문자열을 AST로 파싱 (결과는 불변이므로 캐시해서 공유)"""
+    # product type = a or b 축약형을 위해 직전 product type 비교를 기억
+    context = {'product_type': None}
+    or_terms = []
+    for or_part in RE_OR.split(condition.strip()):
+        and_terms = tuple(_parse_not(part.strip(), context) for part in RE_AND.split(or_part))
+        or_terms.append(and_terms[0] if len(and_terms) == 1 else AndNode(and_terms))
+    return or_terms[0] if len(or_terms) == 1 else OrNode(tuple(or_terms))
+
+
+def _parse_not(term: str, context: Dict[str, Any]):
+    """not 접두어 처리"""
+    if term.startswith('not '):
+        return NotNode(_parse_not(term[4:].strip(), context))
+    return _parse_term(term, context)
+
+
+def _parse_term(term: str, context: Dict[str, Any]):
+    """비교식 하나를 노드로 변환"""
+    match = RE_PRODUCT_TYPE_INDEX.match(term)
+    if match:
+        node = ProductTypeCompare(int(match.group(1)), match.group(3).strip(), match.group(2) == '!=')
+        context['product_type'] = node
+        return node
+    
+    match = RE_PRODUCT_TYPE.match(term)
+    if match:
+        node = ProductTypeCompare(None, match.group(2).strip(), match.group(1) == '!=')
+        context['product_type'] = node
+        return node
+    
+    for op in CONDITION_OPERATORS:
+        if op in term:
+            left, right = term.split(op, 1)
+            name = left.strip()
+            right = right.strip()
+            op = op.strip()
+            
+            # 우변이 true/false면 신호 비교
+            if right.lower() in ('true', 'false'):
+                if op not in ('=', '!='):
+                    return Constant(False)
+                return SignalCompare(name, right.lower() == 'true', op == '!=')
+            
+            # 우변이 정수 리터럴이면 정수 비교, 아니면 다른 변수 참조
+            if right.lstrip('-').isdigit():
+                try:
+                    return IntCompare(name, op, literal=int(right))
+                except ValueError:
+                    return Constant(False)
+            return IntCompare(name, op, reference=right)
+    
+    # 비교 연산자가 없는 값은 직전 product type 비교의 축약형
+    previous = context['product_type']
+    if previous is not None:
+        return ProductTypeCompare(previous.index, term, previous.negate)
+    
+    # 인식할 수 없는 조건
+    return Constant(False)
+
+
+def condition_dependencies(node) -> Optional[Tuple[str, ...]]:
+    """조건식이 참조하는 신호/변수 이름 목록 반환
+    
+    product type 조건처럼 신호/변수가 아닌 상태에 의존하면 None을 반환합니다.
+    """
+    names = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, (OrNode, AndNode)):
+            stack.extend(reversed(current.terms))
+        elif isinstance(current, NotNode):
+            stack.append(current.term)
+        elif isinstance(current, ProductTypeCompare):
+            return None
+        elif isinstance(current, SignalCompare):
+            names.append(current.name)
+        elif isinstance(current, IntCompare):
+            names.append(current.name)
+            if current.reference is not None:
+                names.append(current.reference)
+    return tuple(dict.fromkeys(names))
+
+
+def compile_condition(node, signals: Optional[VariableStore], integers: Optional[VariableStore],
+                      attributes: Optional[AttributeTable] = None) -> ConditionFunction:
+    """AST를 신호/정수 저장소의 슬롯에 바인딩된 클로저로 컴파일
+    
+    저장소가 None이면 해당 종류의 비교는 항상 거짓입니다.
+    product type 속성 이름은 attributes 배정표(없으면 기본 배정표)의 비트로 바인딩됩니다.
+    저장소는 초기화/리셋 시 슬롯을 지우지 않고 값만 바꾸므로 바인딩은 계속 유효합니다.
+    """
+    if attributes is None:
+        attributes = default_attributes
+    if isinstance(node, (OrNode, AndNode)):
+        # 같은 엔티티의 속성 비교만으로 이루어진 or/and는 마스크 연산 하나로
+        fused = _attribute_terms(node.terms, attributes)
+        if fused is not None:
+            return _compile_attribute_mask(fused[0], fused[1], isinstance(node, AndNode))
+    if isinstance(node, OrNode):
+        return _compile_or(tuple(compile_condition(term, signals, integers, attributes) for term in node.terms))
+    if isinstance(node, AndNode):
+        return _compile_and(tuple(compile_condition(term, signals, integers, attributes) for term in node.terms))
+    if isinstance(node, NotNode):
+        inner = compile_condition(node.term, signals, integers, attributes)
+        return lambda entity, block: not inner(entity, block)
+    if isinstance(node, SignalCompare):
+        return _compile_signal_compare(node, signals, integers)
+    if isinstance(node, IntCompare):
+        return _compile_int_compare(node, signals, integers)
+    if isinstance(node, ProductTypeCompare):
+        return _compile_product_type_compare(node, attributes)
+    value = node.value
+    return lambda entity, block: value
+
+
+def _compile_or(functions: Tuple[ConditionFunction, ...]) -> ConditionFunction:
+    if len(functions) == 2:
+        first, second = functions
+        return lambda entity, block: first(entity, block) or second(entity, block)
+    
+    def evaluate(entity, block):
+        for function in functions:
+            if function(entity, block):
+                return True
+        return False
+    return evaluate
+
+
+def _compile_and(functions: Tuple[ConditionFunction, ...]) -> ConditionFunction:
+    if len(functions) == 2:
+        first, second = functions
+        return lambda entity, block: first(entity, block) and second(entity, block)
+    
+    def evaluate(entity, block):
+        for function in functions:
+            if not function(entity, block):
+                return False
+        return True
+    return evaluate
+
+
+def _compile_signal_compare(node: SignalCompare, signals: Optional[VariableStore],
+                            integers: Optional[VariableStore]) -> ConditionFunction:
+    if signals is None:
+        return lambda entity, block: False
+    
+    expected = node.expected
+    values = signals.values
+    slot = signals.slot(BOOLEAN, node.name)
+    # 정의되지 않은 신호(None)는 false로 취급
+    if node.negate:
+        return lambda entity, block: (values[slot] or False) != expected
+    if integers is None:
+        return lambda entity, block: (values[slot] or False) == expected
+    # 같은 이름의 정수 변수가 있으면 정수 비교가 우선하며 true/false와는 같지 않음
+    int_values = integers.values
+    int_slot = integers.slot(INTEGER, node.name)
+    return lambda entity, block: int_values[int_slot] is None and (values[slot] or False) == expected
+
+
+def _compile_int_compare(node: IntCompare, signals: Optional[VariableStore],
+                         integers: Optional[VariableStore]) -> ConditionFunction:
+    if integers is None:
+        return lambda entity, block: False
+    
+    compare = INT_COMPARATORS[node.op]
+    values = integers.values
+    slot = integers.slot(INTEGER, node.name)
+    signal_values = signals.values if signals is not None else None
+    
+    # 정의되지 않은 이름에 대한 비교: = 는 신호 비교로 처리 (신호가 없거나 false면 참),
+    # 나머지 연산자는 거짓
+    if node.op == '=' and signals is not None:
+        signal_slot = signals.slot(BOOLEAN, node.name)
+        undefined_result = lambda: not signal_values[signal_slot]
+    else:
+        undefined_result = lambda: False
+    
+    if node.literal is not None:
+        literal = node.literal
+        
+        def evaluate(entity, block):
+            value = values[slot]
+            if value is None:
+                return undefined_result()
+            return compare(value, literal)
+        return evaluate
+    
+    reference_slot = integers.slot(INTEGER, node.reference)
+    reference_signal_slot = signals.slot(BOOLEAN, node.reference) if signals is not None else None
+    
+    def evaluate_reference(entity, block):
+        value = values[slot]
+        if value is None:
+            return undefined_result()
+        # 참조 변수는 정수 변수를 먼저, 없으면 신호(bool)를 사용
+        other = values[reference_slot]
+        if other is None:
+            if reference_signal_slot is None:
+                return False
+            other = signal_values[reference_signal_slot]
+            if other is None:
+                return False
+        return compare(value, other)
+    return evaluate_reference
+
+
+def _attribute_terms(terms: Tuple[Any, ...], attributes: AttributeTable) -> Optional[Tuple[Optional[int], int]]:
+    """모든 항이 같은 엔티티에 대한 긍정 속성 비교면 (index, 속성 마스크), 아니면 None"""
+    first = terms[0]
+    if not isinstance(first, ProductTypeCompare):
+        return None
+    mask = 0
+    for term in terms:
+        if (not isinstance(term, ProductTypeCompare) or term.negate or term.index != first.index
+                or term.value in ENTITY_STATES):
+            return None
+        mask |= attributes.bit(term.value)
+    return first.index, mask
+
+
+def _compile_entity_test(index: Optional[int], test: Callable[[Any], bool]) -> ConditionFunction:
+    """현재 엔티티(index가 None) 또는 블록의 index번째 엔티티에 test 적용 (엔티티가 없으면 거짓)"""
+    if index is None:
+        def evaluate(entity, block):
+            if not entity or not hasattr(entity, 'attribute_mask') or not hasattr(entity, 'state'):
+                return False
+            return test(entity)
+        return evaluate
+    
+    def evaluate_index(entity, block):
+        # 블록에서 해당 인덱스의 엔티티 가져오기
+        entities = getattr(block, 'entities_in_block', None)
+        if not entities or index >= len(entities):
+            return False
+        return test(entities[index])
+    return evaluate_index
+
+
+def _compile_attribute_mask(index: Optional[int], mask: int, require_all: bool) -> ConditionFunction:
+    if require_all:
+        return _compile_entity_test(index, lambda target: target.attribute_mask & mask == mask)
+    return _compile_entity_test(index, lambda target: target.attribute_mask & mask != 0)
+
+
+def _compile_product_type_compare(node: ProductTypeCompare, attributes: AttributeTable) -> ConditionFunction:
+    value = node.value
+    negate = node.negate
+    
+    if value in ENTITY_STATES:
+        return _compile_entity_test(node.index, lambda target: (target.state == value) != negate)
+    
+    # 속성 이름은 컴파일 시 비트로 변환
+    bit = attributes.bit(value)
+    return _compile_entity_test(node.index, lambda target: (target.attribute_mask & bit != 0) != negate)
@@ -4,10 +4,12 @@
 from typing import Dict, List, Any, Optional
 from .models import (
     SimulationSetup, SimulationStepResult, SimulationRunResult, 
-    BatchStepResult, EntityState, ProcessBlockConfig, ConnectionConfig
+    BatchStepResult, EntityState, ProcessBlockConfig, ConnectionConfig,
+    RunUntilRequest, RunUntilResult
 )
 from .simple_simulation_engine import SimpleSimulationEngine
 from .simple_entity import SimpleEntity
+from .state_diff import StateDiffTracker, api_entity
 from .core.debug_manager import DebugManager
 import logging
 
@@ -19,6 +21,8 @@ class SimpleEngineAdapter:
     def __init__(self):
         self.engine = SimpleSimulationEngine()
         self.step_counter = 0
+        # 증분 응답의 기준 상태
+        self.diff_tracker = StateDiffTracker()
         # 글로벌 디버그 매니저 생성
         self.global_debug_manager = DebugManager()
         # 실행 모드 관련 속성
@@ -29,7 +33,8 @@ class SimpleEngineAdapter:
         """엔진이 초기화되었는지 확인"""
         return self.engine is not None and self.engine.env is not None
         
-    def convert_setup_to_simple_format(self, setup: SimulationSetup) -> Dict[str, Any]:
+    @staticmethod
+    def convert_setup_to_simple_format(setup: SimulationSetup) -> Dict[str, Any]:
         """기존 SimulationSetup을 새 엔진 형식으로 변환"""
         simple_config = {
             'initial_signals': setup.initial_signals or {},
@@ -41,6 +46,31 @@ class SimpleEngineAdapter:
         if hasattr(setup, 'globalSignals'):
             simple_config['globalSignals'] = setup.globalSignals
         
+        # 난수 시드가 있으면 전달
+        if setup.seed is not None:
+            simple_config['seed'] = setup.seed
+        
+        if setup.entity_pool:
+            simple_config['entity_pool'] = True
+        
+        if setup.instruction_fusion:
+            simple_config['instruction_fusion'] = True
+        
+        if setup.kernel != 'simpy':
+            simple_config['kernel'] = setup.kernel
+        
+        if not setup.block_statistics:
+            simple_config['block_statistics'] = False
+        
+        deadlock_timeout = setup.deadlock_timeout
+        if deadlock_timeout is None and setup.settings:
+            deadlock_timeout = setup.settings.get('deadlockTimeout')
+        if deadlock_timeout:
+            simple_config['deadlock_timeout'] = float(deadlock_timeout)
+        
+        if setup.resources:
+            simple_config['resources'] = [resource.model_dump() for resource in setup.resources]
+        
         # 블록 변환
         for block in setup.blocks:
             simple_block = {
@@ -87,15 +117,7 @@ class SimpleEngineAdapter:
         for block_id, block_state in result.get('block_states', {}).items():
             for entity_info in block_state.get('entities', []):
                 # EntityState는 dict로 전달 (frontend에서 직접 사용)
-                entity_dict = {
-                    'id': entity_info['id'],
-                    'current_block_id': block_id,
-                    'current_block_name': block_state['name'],
-                    'state': entity_info.get('state', 'normal'),
-                    'color': entity_info.get('color'),
-                    'custom_attributes': entity_info.get('custom_attributes', [])
-                }
-                active_entities.append(entity_dict)
+                active_entities.append(api_entity(entity_info, block_id, block_state['name']))
         
         # 시간을 반올림하여 부동소수점 오차 제거 (소수점 1자리)
         simulation_time = round(result.get('simulation_time', 0), 1)
@@ -111,15 +133,17 @@ class SimpleEngineAdapter:
             'block_states': result.get('block_states', {}),  # 블록 상태 정보 추가
             'script_logs': result.get('script_logs', []),  # 스크립트 로그 추가
             'debug_info': result.get('debug_info', {}),  # 디버그 정보 추가
+            'deadlock': result.get('deadlock'),  # 교착/무한 반복 진단
             'log': [{
                 'time': simulation_time,
                 'event': f"Step {result.get('step_count', 0)}: {result.get('total_entities_in_system', 0)} entities in system"
             }]
         }
     
-    async def setup_simulation(self, setup: SimulationSetup):
-        """시뮬레이션 설정"""
-        simple_config = self.convert_setup_to_simple_format(setup)
+    def setup_simulation(self, setup: SimulationSetup, simple_config: Optional[Dict[str, Any]] = None):
+        """시뮬레이션 설정 (simple_config가 있으면 이미 변환된 엔진 설정 사용 - model_cache 참고)"""
+        if simple_config is None:
+            simple_config = self.convert_setup_to_simple_format(setup)
         self.engine.setup_simulation(simple_config)
         
         # 디버그 매니저를 엔진에 연결
@@ -131,11 +155,29 @@ class SimpleEngineAdapter:
         logger.info(f"Applied execution mode {self.execution_mode} to new simulation")
         
         self.step_counter = 0
+        self.diff_tracker.reset()
+    
+    def _build_step_response(self, result: Dict[str, Any], delta: bool) -> Dict[str, Any]:
+        """엔진 스텝 결과를 API 형식으로 변환하고 증분 기준 상태를 갱신
+        
+        delta가 False이면 전체 스냅샷(처음부터의 스크립트 로그 포함)을 반환하고,
+        True이면 result에 블록/엔티티/신호 상태가 없어도 됨 (include_state=False, 바뀐 부분은 추적기가 엔진에서 읽음)
+        """
+        if not delta:
+            self.diff_tracker.log_cursors = {}
+        result['script_logs'] = self.engine.collect_script_logs_since(self.diff_tracker.log_cursors)
+        converted = self.convert_simple_result_to_api_format(result)
+        return self.diff_tracker.advance(converted, self.engine, delta)
     
-    def step_simulation(self) -> SimulationStepResult:
-        """단일 스텝 실행"""
+    def step_simulation(self, since_version: Optional[int] = None) -> SimulationStepResult:
+        """단일 스텝 실행
+        
+        since_version이 현재 상태 버전과 같으면 그 이후 바뀐 부분만 반환하고,
+        없거나 다르면 전체 스냅샷을 반환 (응답의 version을 다음 요청에 사용)
+        """
         logger.info(f"Executing step simulation with mode: {self.execution_mode}")
-        result = self.engine.step_simulation()
+        delta = self.diff_tracker.is_current(since_version)
+        result = self.engine.step_simulation(include_script_logs=False, include_state=not delta)
         self.step_counter += 1
         
         if 'error' in result:
@@ -147,24 +189,29 @@ class SimpleEngineAdapter:
                 current_signals={}
             )
         
-        converted = self.convert_simple_result_to_api_format(result)
-        return SimulationStepResult(**converted)
+        return SimulationStepResult(**self._build_step_response(result, delta))
     
-    def batch_step_simulation(self, steps: int) -> BatchStepResult:
-        """배치 스텝 실행 - 중간 상태 포함"""
+    def batch_step_simulation(self, steps: int, since_version: Optional[int] = None) -> BatchStepResult:
+        """배치 스텝 실행 - 중간 상태 포함
+        
+        since_version을 지정하면 각 스텝 결과는 직전 스텝 대비 증분
+        (첫 스텝은 since_version 대비, 버전이 맞지 않으면 첫 스텝만 전체 스냅샷)
+        """
         logs = []
         final_result = None
-        step_results = []  # 각 스텝의 전체 결과 저장
+        step_results = []  # 각 스텝의 결과 저장
+        incremental = since_version is not None
+        delta = self.diff_tracker.is_current(since_version)
         
         for i in range(steps):
-            result = self.engine.step_simulation()
+            result = self.engine.step_simulation(include_script_logs=False, include_state=not delta)
             if 'error' in result:
                 break
                 
             final_result = result
-            # 각 스텝의 전체 상태를 저장
-            converted = self.convert_simple_result_to_api_format(result)
-            step_results.append(converted)
+            # 각 스텝의 상태를 저장 (증분 모드에서는 두 번째 스텝부터 직전 스텝 대비 증분)
+            step_results.append(self._build_step_response(result, delta))
+            delta = incremental
             
             logs.append({
                 'time': round(result.get('simulation_time', 0), 1),
@@ -183,7 +230,7 @@ class SimpleEngineAdapter:
                 step_results=[]  # 빈 결과
             )
         
-        converted = self.convert_simple_result_to_api_format(final_result)
+        converted = step_results[-1]
         
         return BatchStepResult(
             message=f"Executed {len(logs)} steps successfully",
@@ -191,11 +238,24 @@ class SimpleEngineAdapter:
             final_event_description=converted['event_description'],
             log=logs,
             current_time=converted['time'],
-            active_entities=converted['active_entities'],
+            # 증분 모드에서는 전체 엔티티 목록을 다시 보내지 않음 (step_results의 증분으로 갱신)
+            active_entities=[] if incremental else converted['active_entities'],
             total_entities_processed=converted['entities_processed_total'],
-            step_results=step_results  # 모든 중간 상태 포함
+            step_results=step_results,  # 모든 중간 상태 포함
+            version=self.diff_tracker.version
         )
     
+    def get_snapshot(self, since_version: Optional[int] = None) -> SimulationStepResult:
+        """스텝을 진행하지 않고 현재 상태를 반환
+        
+        since_version이 없으면 전체 스냅샷(증분 응답의 재동기화용), 현재 버전이면 그 이후 바뀐 부분
+        """
+        delta = self.diff_tracker.is_current(since_version)
+        result = self.engine._collect_simulation_results(include_script_logs=False, include_state=not delta)
+        result['step_count'] = self.engine.step_count
+        result['simulation_time'] = self.engine.env.now
+        return SimulationStepResult(**self._build_step_response(result, delta))
+    
     def run_simulation(self, max_steps: int = 100) -> SimulationRunResult:
         """시뮬레이션 연속 실행"""
         logs = []
@@ -236,17 +296,46 @@ class SimpleEngineAdapter:
             active_entities=converted['active_entities']
         )
     
-    def reset_simulation(self):
-        """시뮬레이션 리셋"""
-        # 스크립트 상태 초기화
-        from .script_state_manager import script_state_manager
-        script_state_manager.reset_all()
+    def run_until(self, request: RunUntilRequest) -> RunUntilResult:
+        """목표 시간/배출 수까지 중간 스냅샷 없이 실행하고 마지막에만 전체 상태를 만듦"""
+        steady_state = request.steady_state.model_dump() if request.steady_state else None
+        result = self.engine.run_until(request.until, request.entities_disposed, request.max_events, steady_state)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        
+        final_state = None
+        if request.include_snapshot:
+            snapshot = self.engine._collect_simulation_results()
+            snapshot['simulation_time'] = result['simulation_time']
+            snapshot['step_count'] = self.engine.step_count
+            final_state = SimulationStepResult(**self.convert_simple_result_to_api_format(snapshot))
         
+        return RunUntilResult(
+            message=f"Simulation ran to {round(result['simulation_time'], 1)}s ({result['stop_reason']})",
+            stop_reason=result['stop_reason'],
+            start_time=round(result['start_time'], 1),
+            final_time=round(result['simulation_time'], 1),
+            events_processed=result['events_processed'],
+            wall_time=result['wall_time'],
+            total_entities_processed=result['total_entities_processed'],
+            entities_in_system=result['total_entities_in_system'],
+            throughput_per_hour=result['throughput_per_hour'],
+            resources=result['resources'],
+            block_statistics=result['block_statistics'],
+            time_distributions=result['time_distributions'],
+            deadlock=result['deadlock'],
+            steady_state=result['steady_state'],
+            final_state=final_state
+        )
+    
+    def reset_simulation(self):
+        """시뮬레이션 리셋 (스크립트 실행 상태는 엔진 리셋 시 함께 초기화)"""
         # 디버그 매니저 초기화 (브레이크포인트는 유지)
         self.global_debug_manager.reset()
         
         self.engine.reset()
         self.step_counter = 0
+        self.diff_tracker.reset()
     
     def get_simulation_status(self) -> Dict[str, Any]:
         """시뮬레이션 상태 조회"""
@@ -272,7 +361,4 @@ class SimpleEngineAdapter:
         # 엔진이 있다면 엔진에서 설정 가져오기
         if self.has_engine():
             return self.engine.get_mode_config()
-        return self.mode_config
-
-# 전역 어댑터 인스턴스
-engine_adapter = SimpleEngineAdapter()
\ No newline at end of file
+        return self.mode_config
\ No newline at end of file
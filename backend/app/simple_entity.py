@@ -1,14 +1,147 @@
 """
 단순화된 엔티티 클래스
+
+- __slots__로 인스턴스 딕셔너리 없이 보관 (엔티티당 메모리/할당 감소)
+- ID는 순차 정수 (문자열 변환은 API 결과를 만들 때만)
+- 속성 컨테이너(properties, processed_by_blocks)는 처음 사용할 때 생성
+- 커스텀 속성(product type)은 이름마다 비트를 배정한 정수 마스크로 보관 (문자열 목록은 API 출력 때만)
+  비트 배정표(AttributeTable)는 엔진마다 하나 - 세션 간에 이름이 섞이거나 배정표가 계속 커지지 않음
+- EntityPool: 엔진별 ID 발급기이자 선택적 재사용 풀 (create product / dispose product)
 """
-import uuid
-from typing import Optional, Any, Set
+import itertools
+import threading
+from collections.abc import MutableSet
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Set
+
+# 엔진 없이 만든 엔티티용 ID 발급기
+_default_ids = itertools.count(1)
+
+
+class AttributeTable:
+    """속성 이름 → 비트 배정표 (스크립트 컴파일 시 배정)
+    
+    엔진마다 하나씩 두며 VariableStore의 슬롯처럼 배정한 비트는 지우지 않으므로
+    컴파일된 스크립트는 재설정 후에도 그대로 유효합니다 (비우려면 clear 후 스크립트를 다시 컴파일).
+    """
+    
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def bit(self, name: str) -> int:
+        """속성 이름의 비트 (처음 보는 이름이면 새 비트 배정)"""
+        bit = self.bits.get(name)
+        if bit is None:
+            with self._lock:
+                bit = self.bits.get(name)
+                if bit is None:
+                    bit = 1 << len(self.names)
+                    self.names.append(name)
+                    self.bits[name] = bit
+        return bit
+    
+    def find(self, name: str) -> Optional[int]:
+        """이미 배정된 비트 (없으면 배정하지 않고 None)"""
+        return self.bits.get(name)
+    
+    def mask(self, names: Iterable[str]) -> int:
+        """속성 이름들의 비트 합"""
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+    
+    def names_of(self, mask: int) -> List[str]:
+        """마스크에 포함된 속성 이름 목록 (배정 순서)"""
+        names = []
+        position = 0
+        while mask:
+            if mask & 1:
+                names.append(self.names[position])
+            mask >>= 1
+            position += 1
+        return names
+    
+    def clear(self):
+        with self._lock:
+            self.bits.clear()
+            self.names.clear()
+
+
+# 엔진 없이 만든 엔티티와 배정표를 주지 않은 컴파일용 기본 배정표
+default_attributes = AttributeTable()
+
+
+def attribute_bit(name: str) -> int:
+    """기본 배정표에서 속성 이름의 비트"""
+    return default_attributes.bit(name)
+
+
+def attribute_mask(names: Iterable[str]) -> int:
+    """기본 배정표에서 속성 이름들의 비트 합"""
+    return default_attributes.mask(names)
+
+
+def attribute_names(mask: int) -> List[str]:
+    """기본 배정표에서 마스크에 포함된 속성 이름 목록"""
+    return default_attributes.names_of(mask)
+
+
+class AttributeSet(MutableSet):
+    """엔티티 속성 마스크를 set처럼 다루는 뷰 (기존 custom_attributes 사용 코드 호환)"""
+    
+    __slots__ = ('entity',)
+    
+    def __init__(self, entity: 'SimpleEntity'):
+        self.entity = entity
+    
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.entity.has_attribute(name)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entity.attributes.names_of(self.entity.attribute_mask))
+    
+    def __len__(self) -> int:
+        return bin(self.entity.attribute_mask).count('1')
+    
+    def add(self, name: str):
+        self.entity.attribute_mask |= self.entity.attributes.bit(name)
+    
+    def discard(self, name: str):
+        bit = self.entity.attributes.find(name)
+        if bit is not None:
+            self.entity.attribute_mask &= ~bit
+    
+    def update(self, names: Iterable[str]):
+        self.entity.attribute_mask |= self.entity.attributes.mask(names)
+    
+    def clear(self):
+        self.entity.attribute_mask = 0
+    
+    def __repr__(self):
+        return f"{{{', '.join(repr(name) for name in self)}}}"
+
 
 class SimpleEntity:
     """단순화된 엔티티 클래스"""
     
-    def __init__(self, entity_id: Optional[str] = None):
-        self.id = entity_id or str(uuid.uuid4())[:8]
+    __slots__ = ('id', 'current_block', 'current_connector', 'target_block', 'target_connector',
+                 'movement_requested', 'movement_completed', 'movement_failed', 'created_at', 'processed_at',
+                 'state', 'color', 'disposed', 'attribute_mask', 'attributes', '_properties', '_processed_by_blocks',
+                 'entered_at')
+    
+    def __init__(self, entity_id: Optional[Any] = None, attributes: Optional[AttributeTable] = None):
+        # attribute_mask의 비트를 해석할 배정표 (엔진의 배정표, 없으면 기본 배정표)
+        self.attributes = attributes if attributes is not None else default_attributes
+        self._init(entity_id if entity_id is not None else next(_default_ids))
+    
+    def _init(self, entity_id: Any):
+        """모든 상태 초기화 (생성 시, 풀에서 재사용할 때)"""
+        self.id = entity_id
         self.current_block = None
         self.current_connector = None
         self.target_block = None
@@ -18,15 +151,51 @@ class SimpleEntity:
         self.movement_failed = False  # 이동 실패 플래그 (용량 초과 등)
         self.created_at = None
         self.processed_at = None
-        self.properties = {}  # 추가 속성 저장용
+        self.disposed = False  # dispose product로 배출됨 (풀 반환 대상)
+        self.entered_at = None  # 현재 블록에 들어온 시간 (블록 체류 시간 통계용)
         
-        # 엔티티 속성 추가
+        # 엔티티 속성
         self.state: str = "normal"  # "normal" | "transit"
-        self.custom_attributes: Set[str] = set()  # 커스텀 속성들 (예: {"flip", "1c"})
         self.color: Optional[str] = None  # "gray", "blue", "green", "red", "black", "white"
+        self.attribute_mask = 0  # 커스텀 속성들의 비트 합 (예: {"flip", "1c"})
         
-        # 스크립트 처리 추적
-        self.processed_by_blocks: Set[str] = set()  # 이미 스크립트를 실행한 블록들의 ID
+        # 처음 사용할 때 생성하는 컨테이너
+        self._properties: Optional[Dict[str, Any]] = None  # 추가 속성 저장용
+        self._processed_by_blocks: Optional[Set[str]] = None  # 이미 스크립트를 실행한 블록들의 ID
+    
+    @property
+    def properties(self) -> Dict[str, Any]:
+        if self._properties is None:
+            self._properties = {}
+        return self._properties
+    
+    @properties.setter
+    def properties(self, value: Dict[str, Any]):
+        self._properties = value
+    
+    @property
+    def custom_attributes(self) -> AttributeSet:
+        """커스텀 속성 (마스크에 대한 set 형태의 뷰)"""
+        return AttributeSet(self)
+    
+    @custom_attributes.setter
+    def custom_attributes(self, value: Iterable[str]):
+        self.attribute_mask = self.attributes.mask(value)
+    
+    @property
+    def processed_by_blocks(self) -> Set[str]:
+        if self._processed_by_blocks is None:
+            self._processed_by_blocks = set()
+        return self._processed_by_blocks
+    
+    def has_attribute(self, attr: str) -> bool:
+        """커스텀 속성 보유 여부 (처음 보는 이름에 비트를 배정하지 않음)"""
+        bit = self.attributes.find(attr)
+        return bit is not None and self.attribute_mask & bit != 0
+    
+    def attribute_list(self) -> List[str]:
+        """커스텀 속성 이름 목록 (API 출력용)"""
+        return self.attributes.names_of(self.attribute_mask) if self.attribute_mask else []
     
     def reset_movement(self):
         """이동 관련 상태 초기화"""
@@ -43,7 +212,9 @@ class SimpleEntity:
     
     def get_property(self, key: str, default: Any = None) -> Any:
         """속성 값 가져오기"""
-        return self.properties.get(key, default)
+        if self._properties is None:
+            return default
+        return self._properties.get(key, default)
     
     def set_property(self, key: str, value: Any):
         """속성 값 설정"""
@@ -52,13 +223,13 @@ class SimpleEntity:
     def to_dict(self) -> dict:
         """엔티티를 딕셔너리로 변환 (직렬화)"""
         return {
-            'id': self.id,
+            'id': str(self.id),
             'current_block': self.current_block,
             'current_connector': self.current_connector,
             'state': self.state,
-            'custom_attributes': list(self.custom_attributes),  # set을 list로 변환
+            'custom_attributes': self.attribute_list(),  # set을 list로 변환
             'color': self.color,
-            'properties': self.properties
+            'properties': dict(self._properties or {})
         }
     
     @classmethod
@@ -77,4 +248,44 @@ class SimpleEntity:
         return f"Entity({self.id}@{self.current_block})"
     
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+class EntityPool:
+    """엔진별 엔티티 발급기 (순차 ID + 선택적 재사용)
+    
+    재사용(enabled)은 설정의 entity_pool 값으로 켭니다. 배출된 엔티티는 배출한 블록의 스크립트가 끝난 뒤에
+    반환되며, 재사용할 때는 새 ID를 받으므로 API에서 보이는 엔티티 ID는 겹치지 않습니다.
+    """
+    
+    def __init__(self, enabled: bool = False, max_free: int = 4096, attributes: Optional[AttributeTable] = None):
+        self.enabled = enabled
+        self.max_free = max_free
+        self.attributes = attributes
+        self._ids = itertools.count(1)
+        self.free: List[SimpleEntity] = []
+        self.created = 0
+        self.reused = 0
+    
+    def reset(self, enabled: Optional[bool] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        self._ids = itertools.count(1)
+        self.free.clear()
+        self.created = 0
+        self.reused = 0
+    
+    def acquire(self) -> SimpleEntity:
+        """새 엔티티 (풀에 반환된 엔티티가 있으면 초기화해서 재사용)"""
+        if self.free:
+            entity = self.free.pop()
+            entity._init(next(self._ids))
+            self.reused += 1
+            return entity
+        self.created += 1
+        return SimpleEntity(next(self._ids), self.attributes)
+    
+    def release(self, entity: SimpleEntity):
+        """배출된 엔티티 반환 (재사용이 꺼져 있으면 무시)"""
+        if self.enabled and len(self.free) < self.max_free:
+            self.free.append(entity)
@@ -0,0 +1,531 @@
+"""
+스크립트 사전 컴파일러
+블록 스크립트를 블록 생성 시 한 번만 파싱하여 불변 명령어 목록으로 변환합니다.
+실행기는 이 목록을 순서대로 따라가므로 실행 중에는 문자열 파싱이 일어나지 않습니다.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+from .core.variable_store import VariableStore
+from .simple_condition_compiler import parse_condition, compile_condition, condition_dependencies
+from .simple_entity import AttributeTable, default_attributes
+from .dispatch import DISPATCH_RULES
+
+# 명령어 코드
+OP_NOP = 0  # 빈 줄, 주석
+OP_DELAY = 1
+OP_SIGNAL_SET = 2
+OP_WAIT = 3
+OP_GO = 4
+OP_IF = 5
+OP_ELIF = 6
+OP_ELSE = 7
+OP_JUMP = 8
+OP_PRODUCT_TYPE_ASSIGN = 9
+OP_PRODUCT_TYPE_ADD = 10
+OP_PRODUCT_TYPE_REMOVE = 11
+OP_LOG = 12
+OP_CREATE = 13
+OP_DISPOSE = 14
+OP_FORCE_EXECUTION = 15
+OP_INT_OPERATION = 16
+OP_BLOCK_STATUS = 17
+OP_EXECUTE = 18
+OP_UNKNOWN = 19  # 파싱할 수 없는 명령 (실행 시 경고만 출력)
+OP_YIELD = 20  # 명시적 양보 지점 (같은 시각의 다른 프로세스에 실행 기회를 줌)
+OP_SEIZE = 21  # 공유 자원 한 단위 점유 (없으면 대기열에서 기다림)
+OP_RELEASE = 22  # 공유 자원 한 단위 반환
+
+# parse_script_line 명령 이름 -> 명령어 코드
+COMMAND_OPCODES = {
+    'delay': OP_DELAY,
+    'signal_set': OP_SIGNAL_SET,
+    'wait': OP_WAIT,
+    'go_move': OP_GO,
+    'if': OP_IF,
+    'elif': OP_ELIF,
+    'else': OP_ELSE,
+    'jump': OP_JUMP,
+    'product_type_assign': OP_PRODUCT_TYPE_ASSIGN,
+    'product_type_add': OP_PRODUCT_TYPE_ADD,
+    'product_type_remove': OP_PRODUCT_TYPE_REMOVE,
+    'log': OP_LOG,
+    'create': OP_CREATE,
+    'dispose': OP_DISPOSE,
+    'force_execution': OP_FORCE_EXECUTION,
+    'int_operation': OP_INT_OPERATION,
+    'block_status': OP_BLOCK_STATUS,
+    'execute': OP_EXECUTE,
+    'yield': OP_YIELD,
+    'seize': OP_SEIZE,
+    'release': OP_RELEASE,
+}
+
+# product type(index) = value 에서 지정 가능한 색상
+ENTITY_COLORS = ('gray', 'blue', 'green', 'red', 'black', 'white', 'default')
+
+# 정규식 사전 컴파일
+RE_INT_OPERATION = re.compile(r'^int\s+([\w가-힣]+)\s*([\+\-\*\/]?=)\s*(.+)$')
+RE_PRODUCT_TYPE_ASSIGN = re.compile(r'^product\s+type\((\d+)\)\s*=\s*(.+)$')
+RE_GO_COMMAND = re.compile(r'^go\s+([^\s]+)\s+to\s+([^(]+?)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+(wait)(?:\s+priority\s+(-?\d+))?)?$', re.IGNORECASE)
+RE_GO_ANY_COMMAND = re.compile(r'^go\s+([^\s]+)\s+to\s+any\(([^)]*)\)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+by\s+(\w+))?(?:\s+(wait)(?:\s+priority\s+(-?\d+))?)?$', re.IGNORECASE)
+RE_COLOR = re.compile(r'\(([^)]+)\)')
+RE_SEIZE = re.compile(r'^seize\s+(.+?)(?:\s+priority\s+(-?\d+))?$')
+
+
+@dataclass(frozen=True, slots=True)
+class DelaySpec:
+    """미리 파싱된 딜레이 값 (high가 있으면 low~high 균등분포)"""
+    low: Optional[float]
+    high: Optional[float]
+    text: str  # 파싱에 실패한 경우 실행 시 parse_delay_value로 다시 처리
+
+
+@dataclass(frozen=True, slots=True)
+class GoOperand:
+    """go R to 공정1.L(0,3) 명령의 미리 파싱된 인자"""
+    from_connector: Optional[str]
+    to_target: str
+    target_block: str
+    target_connector: Optional[str]
+    entity_index: int
+    delay: Optional[DelaySpec]
+    blocking: bool = False  # go ... wait: 대상 블록이 가득 차면 실패 대신 빈 자리를 기다림
+    priority: int = 0  # 대기열 우선순위 (높을수록 먼저, 같으면 먼저 온 순서)
+    candidates: Tuple[str, ...] = ()  # go ... to any(...): 후보 블록 이름 (비어 있으면 단일 대상)
+    dispatch: str = 'first_free'  # 후보 선택 규칙 (dispatch.DISPATCH_RULES)
+
+
+@dataclass(frozen=True, slots=True)
+class Instruction:
+    """컴파일된 스크립트 명령어 하나 (스크립트 한 줄에 대응)"""
+    opcode: int
+    operand: Any
+    indent: int
+    skip_target: int = -1  # if/elif/else 조건이 거짓일 때 이어서 실행할 위치
+    ends_if_block: bool = False  # skip_target이 if/elif/else 체인을 벗어나는지 여부
+    text: str = ''
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledScript:
+    """블록 스크립트 전체의 컴파일 결과"""
+    instructions: Tuple[Instruction, ...]
+    force_execution: bool
+    has_dispose: bool
+
+
+def parse_script_line(line: str) -> tuple:
+    """스크립트 라인을 파싱하여 명령어와 파라미터를 반환"""
+    line = line.strip()
+    
+    # 빈 줄이나 주석
+    if not line or line.startswith('//'):
+        return None, None
+    
+    # delay 명령
+    if line.startswith('delay '):
+        return 'delay', line[6:].strip()
+    
+    # int 변수 산술 연산 (int 변수명 += 5) - 한글 변수명 지원
+    if line.startswith('int '):
+        # int 변수명 연산자 값 형태 파싱
+        int_match = RE_INT_OPERATION.match(line)
+        if int_match:
+            var_name = int_match.group(1)
+            operator = int_match.group(2)
+            value_expr = int_match.group(3).strip()
+            return 'int_operation', {
+                'var_name': var_name,
+                'operator': operator,
+                'value': value_expr
+            }
+    
+    # 블록 상태 설정 (블록이름.status = "값")
+    if '.status = ' in line:
+        parts = line.split('.status = ', 1)
+        block_name = parts[0].strip()
+        status_value = parts[1].strip()
+        # 따옴표 제거
+        if (status_value.startswith('"') and status_value.endswith('"')) or \
+           (status_value.startswith("'") and status_value.endswith("'")):
+            status_value = status_value[1:-1]
+        return 'block_status', {'block_name': block_name, 'status': status_value}
+    
+    # product type(index) = value 형식을 먼저 체크 (신호 설정보다 우선)
+    product_assign_match = RE_PRODUCT_TYPE_ASSIGN.match(line)
+    if product_assign_match:
+        index = int(product_assign_match.group(1))
+        value = product_assign_match.group(2).strip()
+        return 'product_type_assign', {'index': index, 'value': value}
+    
+    # 신호 설정 (신호명 = 값)
+    if ' = ' in line and not line.startswith('if ') and not line.startswith('elif ') and not line.startswith('wait ') and not line.startswith('int '):
+        parts = line.split(' = ', 1)
+        signal_name = parts[0].strip()
+        value = parts[1].strip()
+        return 'signal_set', {'signal_name': signal_name, 'value': value}
+    
+    # wait 명령
+    if line.startswith('wait '):
+        condition = line[5:].strip()
+        return 'wait', condition
+    
+    # go 명령 (새로운 형식: go R to 공정1.L(0,3))
+    if line.startswith('go '):
+        # go R to any(공정1.L, 공정2.L) by round_robin wait - 후보 중 규칙에 따라 선택
+        any_match = RE_GO_ANY_COMMAND.match(line)
+        if any_match:
+            candidates = [c.strip() for c in any_match.group(2).split(',') if c.strip()]
+            rule = (any_match.group(5) or 'first_free').lower()
+            if not candidates or rule not in DISPATCH_RULES:
+                return None, None
+            params = {
+                'from_connector': any_match.group(1).strip(),
+                'to_target': f"any({', '.join(candidates)})",
+                'candidates': candidates,
+                'dispatch': rule,
+                'entity_index': int(any_match.group(3)) if any_match.group(3) is not None else 0
+            }
+            if any_match.group(4):
+                params['delay'] = any_match.group(4)
+            if any_match.group(6):
+                params['blocking'] = True
+                params['priority'] = int(any_match.group(7)) if any_match.group(7) is not None else 0
+            return 'go_move', params
+        
+        match = RE_GO_COMMAND.match(line)
+        if match:
+            from_connector = match.group(1).strip()
+            to_target = match.group(2).strip()
+            entity_index = match.group(3)  # 엔티티 인덱스 (옵션)
+            delay = match.group(4)  # 딜레이 (옵션)
+            blocking = match.group(5)  # wait (옵션)
+            priority = match.group(6)  # 대기 우선순위 (옵션)
+            
+            # 파라미터 조합
+            params = {
+                'from_connector': from_connector,
+                'to_target': to_target
+            }
+            
+            if entity_index is not None:
+                params['entity_index'] = int(entity_index)
+            else:
+                params['entity_index'] = 0  # 기본값은 0번 엔티티
+            
+            if delay:
+                params['delay'] = delay
+            
+            if blocking:
+                params['blocking'] = True
+                params['priority'] = int(priority) if priority is not None else 0
+            
+            return 'go_move', params
+        else:
+            # 파싱 실패 시 에러
+            return None, None
+    
+    # if 명령
+    if line.startswith('if '):
+        condition = line[3:].strip()
+        return 'if', condition
+    
+    # elif 명령
+    if line.startswith('elif '):
+        condition = line[5:].strip()
+        return 'elif', condition
+    
+    # else 명령
+    if line == 'else':
+        return 'else', None
+    
+    # jump 명령
+    if line.startswith('jump to '):
+        target = line[8:].strip()
+        return 'jump', target
+    
+    # product type += 명령 (기존 문법 - 첫 번째 엔티티에 적용)
+    if 'product type +=' in line:
+        params = line.split('product type +=', 1)[1].strip()
+        return 'product_type_add', params
+    
+    # product type -= 명령 (기존 문법 - 첫 번째 엔티티에 적용)
+    if 'product type -=' in line:
+        params = line.split('product type -=', 1)[1].strip()
+        return 'product_type_remove', params
+    
+    # log 명령
+    if line.startswith('log '):
+        message = line[4:].strip()
+        # 따옴표 제거
+        if message.startswith('"') and message.endswith('"'):
+            message = message[1:-1]
+        return 'log', message
+    
+    # create product 명령
+    if line == 'create product':
+        return 'create', ''
+    
+    # dispose product 명령
+    if line == 'dispose product':
+        return 'dispose', ''
+    
+    # force execution 명령
+    if line == 'force execution':
+        return 'force_execution', ''
+    
+    # yield 명령 (명령어 융합 모드에서도 항상 스케줄러에 양보)
+    if line == 'yield':
+        return 'yield', ''
+    
+    # seize 명령 (seize 작업자 / seize 작업자 priority 2)
+    if line.startswith('seize '):
+        seize_match = RE_SEIZE.match(line)
+        if seize_match:
+            priority = seize_match.group(2)
+            return 'seize', {
+                'resource': seize_match.group(1).strip(),
+                'priority': int(priority) if priority is not None else 0
+            }
+    
+    # release 명령
+    if line.startswith('release '):
+        return 'release', line[8:].strip()
+    
+    # execute 명령
+    if line.startswith('execute '):
+        target_block = line[8:].strip()
+        return 'execute', target_block
+    
+    return None, None
+
+
+def compile_delay(duration_str: str) -> DelaySpec:
+    """딜레이 문자열(5, 1.5, 3-5)을 미리 파싱"""
+    text = duration_str.strip()
+    try:
+        if '-' in text:
+            parts = text.split('-')
+            if len(parts) == 2:
+                return DelaySpec(float(parts[0].strip()), float(parts[1].strip()), text)
+        return DelaySpec(float(text), None, text)
+    except ValueError:
+        # 잘못된 값은 실행 시점에 기존과 동일하게 오류를 발생시킴
+        return DelaySpec(None, None, text)
+
+
+def compile_go_params(params: dict) -> GoOperand:
+    """parse_script_line의 go_move 파라미터를 GoOperand로 변환"""
+    to_target = params.get('to_target')
+    candidates = tuple(candidate.split('.', 1)[0].strip() for candidate in params.get('candidates', ()))
+    if candidates:
+        # 대상은 실행 시 디스패처가 고름
+        target_block = to_target
+        target_connector = None
+    elif '.' in to_target:
+        block_name, connector_name = to_target.split('.', 1)
+        target_block = block_name.strip()
+        target_connector = connector_name.strip()
+    else:
+        target_block = to_target.strip()
+        target_connector = None
+    
+    delay = params.get('delay', None)
+    return GoOperand(
+        from_connector=params.get('from_connector'),
+        to_target=to_target,
+        target_block=target_block,
+        target_connector=target_connector,
+        entity_index=params.get('entity_index', 0),
+        delay=compile_delay(delay) if delay else None,
+        blocking=params.get('blocking', False),
+        priority=params.get('priority', 0),
+        candidates=candidates,
+        dispatch=params.get('dispatch', 'first_free')
+    )
+
+
+def parse_jump_target(target_line: str) -> int:
+    """jump to 대상 라인 번호를 0-based 인덱스로 변환 (잘못된 값은 -1)"""
+    try:
+        return int(target_line.strip()) - 1
+    except ValueError:
+        return -1
+
+
+def parse_int_operand(value_expr: str) -> Optional[int]:
+    """int 연산의 피연산자가 정수 리터럴이면 값을, 변수 참조면 None을 반환"""
+    if value_expr.isdigit() or (value_expr.startswith('-') and value_expr[1:].isdigit()):
+        try:
+            return int(value_expr)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_product_type_assign(value: str) -> Tuple[bool, Optional[str], Tuple[str, ...]]:
+    """product type(index) = value 의 값을 (색상 변경 여부, 색상, 속성 목록)으로 분해"""
+    set_color = False
+    color = None
+    
+    color_match = RE_COLOR.search(value)
+    if color_match:
+        matched_color = color_match.group(1)
+        if matched_color in ENTITY_COLORS:
+            set_color = True
+            color = None if matched_color == 'default' else matched_color
+            # 색상 부분 제거
+            value = value[:value.index('(')].strip()
+    
+    attributes: Tuple[str, ...] = ()
+    if value and value not in ('transit', 'normal'):
+        if ',' in value:
+            attributes = tuple(attr.strip() for attr in value.split(','))
+        else:
+            attributes = (value,)
+    
+    return set_color, color, attributes
+
+
+def parse_product_type_add(params_str: str) -> Tuple[Tuple[str, ...], Optional[str]]:
+    """product type += attributes(color) 를 (속성 목록, 색상)으로 분해"""
+    color = None
+    if '(' in params_str and ')' in params_str:
+        color_match = RE_COLOR.search(params_str)
+        if color_match:
+            color = color_match.group(1).strip()
+            # 색상 부분 제거
+            params_str = params_str[:params_str.index('(')].strip()
+    
+    attributes: Tuple[str, ...] = ()
+    if params_str:
+        attributes = tuple(attr.strip() for attr in params_str.split(',') if attr.strip())
+    
+    return attributes, color
+
+
+def parse_product_type_remove(params_str: str) -> Tuple[Tuple[str, ...], bool]:
+    """product type -= attributes(default) 를 (속성 목록, 색상 초기화 여부)로 분해"""
+    reset_color = False
+    if '(' in params_str and ')' in params_str:
+        color_match = RE_COLOR.search(params_str)
+        if color_match and color_match.group(1).strip() == 'default':
+            reset_color = True
+            # 색상 부분 제거
+            params_str = params_str[:params_str.index('(')].strip()
+    
+    attributes: Tuple[str, ...] = ()
+    if params_str:
+        attributes = tuple(attr.strip() for attr in params_str.split(',') if attr.strip())
+    
+    return attributes, reset_color
+
+
+def _compile_operand(command: str, params: Any, signals: Optional[VariableStore], integers: Optional[VariableStore],
+                     attributes: AttributeTable) -> Any:
+    """명령별 파라미터를 실행 시 바로 쓸 수 있는 형태로 변환"""
+    if command == 'delay':
+        return compile_delay(params)
+    if command == 'signal_set':
+        return params['signal_name'], params['value'].lower() == 'true'
+    if command == 'if' or command == 'elif':
+        return compile_condition(parse_condition(params), signals, integers, attributes)
+    if command == 'wait':
+        node = parse_condition(params)
+        return compile_condition(node, signals, integers, attributes), condition_dependencies(node)
+    if command == 'go_move':
+        return compile_go_params(params)
+    if command == 'seize':
+        return params['resource'], params['priority']
+    if command == 'jump':
+        return parse_jump_target(params)
+    # product type 속성 이름은 컴파일 시 비트 마스크로 변환
+    if command == 'product_type_assign':
+        set_color, color, names = parse_product_type_assign(params['value'])
+        return params['index'], set_color, color, attributes.mask(names)
+    if command == 'product_type_add':
+        names, color = parse_product_type_add(params)
+        return attributes.mask(names), color
+    if command == 'product_type_remove':
+        names, reset_color = parse_product_type_remove(params)
+        return attributes.mask(names), reset_color
+    if command == 'int_operation':
+        return params['var_name'], params['operator'], parse_int_operand(params['value']), params['value']
+    return params
+
+
+def _find_skip_target(lines: List[Tuple[str, int]], index: int) -> Tuple[int, bool]:
+    """조건이 거짓인 if/elif/else에서 이어서 실행할 위치 계산
+    
+    같은 들여쓰기의 elif/else를 만나면 그 위치에서 멈추고,
+    들여쓰기가 같거나 작은 다른 줄을 만나면 if 블록이 끝난 것으로 봅니다.
+    """
+    current_indent = lines[index][1]
+    next_index = index + 1
+    while next_index < len(lines):
+        stripped, next_indent = lines[next_index]
+        
+        # 빈 줄은 계속 진행
+        if not stripped:
+            next_index += 1
+            continue
+        
+        # 같은 들여쓰기의 elif/else면 거기서 멈춤
+        if (stripped.startswith('elif ') or stripped == 'else') and next_indent == current_indent:
+            return next_index, False
+        
+        # 들여쓰기가 현재 if보다 크면 스킵
+        if next_indent > current_indent:
+            next_index += 1
+        else:
+            # 들여쓰기가 같거나 작으면 if 블록 종료
+            return next_index, True
+    
+    return next_index, False
+
+
+def compile_script(script_lines: List[str], signals: Optional[VariableStore] = None,
+                   integers: Optional[VariableStore] = None, attributes: Optional[AttributeTable] = None) -> CompiledScript:
+    """블록 스크립트 라인 목록을 CompiledScript로 컴파일
+    
+    라인 번호(브레이크포인트, jump 대상)는 기존 실행기와 동일하게
+    앞뒤 공백을 제거한 스크립트 기준으로 매겨집니다.
+    if/elif/wait 조건은 signals/integers 변수 저장소의 슬롯에 바인딩된 함수로 컴파일됩니다.
+    product type 속성 이름은 attributes 배정표(없으면 기본 배정표)의 비트 마스크로 변환됩니다.
+    """
+    if attributes is None:
+        attributes = default_attributes
+    force_execution = bool(script_lines) and script_lines[0].strip().lower() == 'force execution'
+    has_dispose = any(
+        'dispose entity' in line.strip() or 'dispose product' in line.strip()
+        for line in script_lines
+    )
+    
+    lines = []
+    for line in '\n'.join(script_lines).strip().split('\n'):
+        indent = len(line) - len(line.lstrip()) if line else 0
+        lines.append((line.strip(), indent))
+    
+    instructions = []
+    for index, (stripped, indent) in enumerate(lines):
+        if not stripped or stripped.startswith('//'):
+            instructions.append(Instruction(OP_NOP, None, indent, text=stripped))
+            continue
+        
+        command, params = parse_script_line(stripped)
+        if command is None:
+            instructions.append(Instruction(OP_UNKNOWN, None, indent, text=stripped))
+            continue
+        
+        opcode = COMMAND_OPCODES[command]
+        skip_target, ends_if_block = -1, False
+        if opcode in (OP_IF, OP_ELIF, OP_ELSE):
+            skip_target, ends_if_block = _find_skip_target(lines, index)
+        
+        instructions.append(Instruction(
+            opcode, _compile_operand(command, params, signals, integers, attributes), indent,
+            skip_target, ends_if_block, stripped
+        ))
+    
+    return CompiledScript(tuple(instructions), force_execution, has_dispose)
@@ -1,38 +1,58 @@
 """
 단순화된 신호 관리자
+신호 값은 슬롯 기반 변수 저장소(VariableStore)에 있고, 이 클래스는 이름 기반 API를 제공하는 얇은 래퍼입니다.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .core.variable_store import BOOLEAN, VariableStore, VariableView
 
 class SimpleSignalManager:
     """단순화된 신호 관리자"""
     
-    def __init__(self):
-        self.signals: Dict[str, bool] = {}
-        self.initial_signals: Dict[str, bool] = {}
+    def __init__(self, store: Optional[VariableStore] = None):
+        # 정수 변수 관리자와 같은 저장소를 공유할 수 있음 (엔진은 하나의 저장소 사용)
+        self.store = store if store is not None else VariableStore()
+        # 이름 → 값 읽기 전용 뷰 (기존 dict API 호환)
+        self.signals = VariableView(self.store, BOOLEAN)
+        self._slots = self.store.slots[BOOLEAN]
+    
+    @property
+    def initial_signals(self) -> Dict[str, bool]:
+        return dict(self.store.initial_items(BOOLEAN))
+    
+    def slot(self, signal_name: str) -> int:
+        """신호 슬롯 (스크립트 컴파일 시 이름을 한 번만 해석)"""
+        return self.store.slot(BOOLEAN, signal_name)
     
     def initialize_signals(self, signals: Dict[str, bool]):
         """신호 초기화"""
-        self.initial_signals = signals.copy()
-        self.signals = signals.copy()
+        # 컴파일된 조건식이 슬롯을 직접 참조하므로 저장소를 교체하지 않고 내용만 갱신
+        self.store.initialize(BOOLEAN, signals)
     
     def set_signal(self, signal_name: str, value: bool):
-        """신호 값 설정"""
-        self.signals[signal_name] = value
+        """신호 값 설정 (값이 실제로 바뀌면 구독 중인 대기를 깨움)"""
+        slot = self._slots.get(signal_name)
+        if slot is None:
+            slot = self.store.slot(BOOLEAN, signal_name)
+        self.store.set(slot, value)
     
     def get_signal(self, signal_name: str, default: bool = False) -> bool:
         """신호 값 가져오기"""
-        return self.signals.get(signal_name, default)
+        return self.store.get(BOOLEAN, signal_name, default)
     
     def get_all_signals(self) -> Dict[str, bool]:
         """모든 신호 상태 반환"""
-        return self.signals.copy()
+        return dict(self.store.items(BOOLEAN))
     
     def reset(self):
         """신호 상태를 초기값으로 리셋"""
-        self.signals = self.initial_signals.copy()
+        self.store.reset(BOOLEAN)
     
     def add_signal(self, signal_name: str, initial_value: bool = False):
         """새로운 신호 추가"""
-        if signal_name not in self.signals:
-            self.signals[signal_name] = initial_value
-            self.initial_signals[signal_name] = initial_value
\ No newline at end of file
+        if not self.store.is_defined(BOOLEAN, signal_name):
+            self.store.define(self.store.slot(BOOLEAN, signal_name), initial_value)
+    
+    def subscribe(self, signal_name: str, event):
+        """신호 값이 실제로 바뀌면 event를 발생시키도록 등록 (1회성)"""
+        self.store.subscribe(self.store.slot(BOOLEAN, signal_name), event)
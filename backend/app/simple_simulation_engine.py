@@ -4,17 +4,31 @@
 """
 import simpy
 import logging
+import random
+import time
 from typing import Dict, List, Optional, Any, Generator
-from .simple_block import IndependentBlock
-from .simple_entity import SimpleEntity
+from .simple_block import IndependentBlock, FORCE_EXECUTION_INTERVAL
+from .simple_entity import SimpleEntity, EntityPool, AttributeTable
 from .simple_signal_manager import SimpleSignalManager
+from .script_state_manager import ScriptStateManager
+from .movement_journal import MovementJournal
 from .core.integer_variable_manager import IntegerVariableManager
+from .core.variable_store import VariableStore
+from .native_kernel import NativeKernel
+from .resource_pool import ResourcePool, create_resource_pools
+from .dispatch import DispatchGroup
+from .block_statistics import StatisticsRegistry
+from .deadlock_detector import DeadlockDetector, ZERO_TIME_EVENT_LIMIT
+from .model_cache import LRUCache, PROGRAM_CACHE_SIZE
 from .core.unified_variable_accessor import UnifiedVariableAccessor
 from .core.debug_manager import DebugManager
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 엔진 하나의 속성 배정표가 재설정 사이에 유지할 최대 이름 수
+MAX_ATTRIBUTE_NAMES = 1024
+
 class SimpleSimulationEngine:
     """단순화된 시뮬레이션 엔진"""
     
@@ -33,11 +47,36 @@ class SimpleSimulationEngine:
     def __init__(self):
         self.env: Optional[simpy.Environment] = None
         self.blocks: Dict[str, IndependentBlock] = {}
-        self.signal_manager = SimpleSignalManager()
-        self.integer_manager = IntegerVariableManager()
+        self.variables = VariableStore()  # 신호/정수 변수 공용 슬롯 저장소
+        self.signal_manager = SimpleSignalManager(self.variables)
+        self.integer_manager = IntegerVariableManager(self.variables)
         self.variable_accessor = UnifiedVariableAccessor(self.signal_manager, self.integer_manager)
         self.debug_manager = None  # 외부에서 설정
         self.entity_queue: Optional[simpy.Store] = None
+        # 블록별 스크립트 실행 상태 (엔진마다 독립, 세션 간 공유하지 않음)
+        self.script_state = ScriptStateManager()
+        # 엔티티 이동 저널 (스텝 경계 판단용)
+        self.journal = MovementJournal()
+        # product type 속성 이름 -> 비트 배정표 (엔진마다 독립, 세션 간에 이름이 섞이지 않음)
+        self.attributes = AttributeTable()
+        # 엔티티 ID 발급기 / 재사용 풀
+        self.entity_pool = EntityPool(attributes=self.attributes)
+        # 시간이 걸리지 않는 스크립트 명령을 양보 없이 연달아 실행 (설정의 instruction_fusion)
+        self.instruction_fusion = False
+        self.kernel = 'simpy'
+        # seize/release 명령이 쓰는 공유 자원 풀 (설정의 resources)
+        self.resources: Dict[str, ResourcePool] = {}
+        # go ... to any(...) 디스패처 ((후보 블록 이름, 규칙) -> DispatchGroup, 처음 사용할 때 생성)
+        self.dispatch_groups: Dict[tuple, Optional[DispatchGroup]] = {}
+        # 블록별 시간 가중 KPI (상태가 바뀔 때만 누적, 언제든 조회 가능)
+        self.statistics = StatisticsRegistry()
+        # 교착/무한 반복 감지기 (설정 시 블록과 연결)
+        self.deadlock_detector = DeadlockDetector()
+        # 스크립트 줄 목록 -> 컴파일 결과 (조건식이 이 엔진의 변수 저장소에 바인딩되므로 재설정 간에만 공유)
+        self.programs = LRUCache(PROGRAM_CACHE_SIZE)
+        
+        # 난수 생성기 (설정에 seed가 있으면 독립된 시드 스트림 사용)
+        self.rng = random
         
         # 시뮬레이션 상태
         self.step_count = 0
@@ -59,6 +98,13 @@ class SimpleSimulationEngine:
         self.blocks.clear()
         self.signal_manager.reset()
         self.integer_manager.reset()
+        self.script_state.reset_all()
+        self.journal.reset()
+        self.entity_pool.reset()
+        self.resources = {}
+        self.dispatch_groups = {}
+        self.statistics.reset()
+        self.deadlock_detector = DeadlockDetector()
         if self.debug_manager:
             self.debug_manager.reset()
         self.entity_queue = None
@@ -73,8 +119,31 @@ class SimpleSimulationEngine:
         preserved_mode = self.execution_mode
         preserved_time_step_duration = self.time_step_duration
         
-        self.env = simpy.Environment()
-        self.entity_queue = simpy.Store(self.env)
+        # 이벤트 커널: 'simpy'(기본) 또는 'native'(헤드리스 실행용, native_kernel 참고)
+        self.kernel = config.get('kernel') or 'simpy'
+        if self.kernel not in ('simpy', 'native'):
+            raise ValueError(f"Unknown kernel: {self.kernel}")
+        if self.kernel == 'native':
+            self.env = NativeKernel()
+            self.entity_queue = None
+        else:
+            self.env = simpy.Environment()
+            self.entity_queue = simpy.Store(self.env)
+        self.script_state.reset_all()
+        self.journal.reset()
+        self.entity_pool.reset(enabled=bool(config.get('entity_pool', False)))
+        self.instruction_fusion = bool(config.get('instruction_fusion', False))
+        self.resources = create_resource_pools(config.get('resources'), self.env.now)
+        self.dispatch_groups = {}
+        self.statistics.reset(self.env, enabled=bool(config.get('block_statistics', True)))
+        # 속성 배정표가 한도를 넘으면 비우고 (마스크가 계속 커지지 않도록) 옛 비트에 묶인 컴파일 결과도 버림
+        if len(self.attributes) > MAX_ATTRIBUTE_NAMES:
+            self.attributes.clear()
+            self.programs.clear()
+        
+        # 난수 스트림 설정 (seed가 없으면 기존처럼 전역 random 사용)
+        seed = config.get('seed')
+        self.rng = random.Random(seed) if seed is not None else random
         
         # 신호 초기화
         if 'initial_signals' in config:
@@ -92,11 +161,19 @@ class SimpleSimulationEngine:
         for connection in config.get('connections', []):
             self._setup_connection(connection)
         
+        # 교착 감지는 deadlock_timeout(settings.deadlockTimeout)이 있을 때만, 무한 반복 감지는 항상
+        self.deadlock_detector = DeadlockDetector(config.get('deadlock_timeout'),
+                                                  config.get('zero_time_event_limit') or ZERO_TIME_EVENT_LIMIT)
+        self.deadlock_detector.attach(self.blocks.values(), self.journal, self.env.now)
+        
         # 블록 프로세스 시작
-        for block_id, block in self.blocks.items():
-            # logger.info(f"Starting process for block '{block.name}' (ID: {block_id}), has_force_execution: {block.has_force_execution()}")
-            process = block.create_block_process(self.env, self.entity_queue, self)
-            self.env.process(process)
+        if self.kernel == 'native':
+            self.env.start(self)
+        else:
+            for block_id, block in self.blocks.items():
+                # logger.info(f"Starting process for block '{block.name}' (ID: {block_id}), has_force_execution: {block.has_force_execution()}")
+                process = block.create_block_process(self.env, self.entity_queue, self)
+                self.env.process(process)
         
         # 실행 모드 복원
         self.execution_mode = preserved_mode
@@ -187,6 +264,8 @@ class SimpleSimulationEngine:
         # 블록 생성
         # ProcessBlockConfig 모델은 'capacity' 필드를 사용하므로 둘 다 확인
         max_capacity = block_config.get('capacity', block_config.get('maxCapacity', 100))
+        program_key = tuple(script_lines)
+        program = self.programs.get(program_key)
         block = IndependentBlock(
             block_id=block_id,
             block_name=block_name,
@@ -195,8 +274,18 @@ class SimpleSimulationEngine:
             max_capacity=max_capacity,
             integer_manager=self.integer_manager,
             variable_accessor=self.variable_accessor,
-            debug_manager=self.debug_manager
+            debug_manager=self.debug_manager,
+            rng=self.rng,
+            script_state=self.script_state,
+            journal=self.journal,
+            entity_pool=self.entity_pool,
+            fuse_instructions=self.instruction_fusion,
+            statistics=self.statistics,
+            program=program,
+            attributes=self.attributes
         )
+        if program is None:
+            self.programs.put(program_key, block.program)
         
         # 블록 상태 초기화 - 시뮬레이션 초기화 시 상태를 명시적으로 None으로 설정
         block.status = None
@@ -240,7 +329,12 @@ class SimpleSimulationEngine:
                 target_block = params.get('target_block_id', '')
                 target_connector = params.get('target_connector_id', 'L')
                 delay = params.get('delay', 0)
-                if delay > 0:
+                # 프론트엔드는 delay를 문자열("0", "3")로 저장하기도 함
+                try:
+                    delay_value = float(delay)
+                except (TypeError, ValueError):
+                    delay_value = 0
+                if delay_value > 0:
                     script_lines.append(f"go to {target_block}.{target_connector},{delay}")
                 else:
                     script_lines.append(f"go to {target_block}.{target_connector}")
@@ -282,6 +376,63 @@ class SimpleSimulationEngine:
     def move_entity_to_block(self, env: simpy.Environment, entity: SimpleEntity, 
                            target_block_id: str) -> Generator:
         """엔티티를 다른 블록으로 이동"""
+        self.place_entity(entity, target_block_id)
+        yield env.timeout(0)
+    
+    def get_resource(self, name: str) -> ResourcePool:
+        """이름으로 자원 풀 조회 (설정에 없으면 용량 1 자원으로 생성)"""
+        pool = self.resources.get(name)
+        if pool is None:
+            logger.warning(f"Resource '{name}' is not configured, using capacity 1")
+            pool = ResourcePool(name, 1, self.env.now if self.env else 0.0)
+            self.resources[name] = pool
+        return pool
+    
+    def get_dispatch_group(self, candidates: tuple, rule: str) -> Optional[DispatchGroup]:
+        """후보 블록 이름 목록과 규칙에 해당하는 디스패처 (후보 블록을 찾을 수 없으면 None)"""
+        key = (candidates, rule)
+        if key in self.dispatch_groups:
+            return self.dispatch_groups[key]
+        blocks = []
+        for name in candidates:
+            block_id = name if name in self.blocks else self.get_block_id_by_name(name)
+            if block_id not in self.blocks:
+                logger.warning(f"Dispatch candidate block '{name}' not found")
+                blocks = None
+                break
+            blocks.append(self.blocks[block_id])
+        group = DispatchGroup(blocks, rule, self.env.now if self.env else 0.0, self.start_block_script) if blocks else None
+        self.dispatch_groups[key] = group
+        return group
+    
+    def start_block_script(self, block: IndependentBlock):
+        """execute 명령처럼 블록 스크립트 시작 (force execution 블록은 스스로 실행하므로 제외)"""
+        if block.has_force_execution():
+            return
+        if block.execution_state == "running":
+            # 실행 중이면 끝난 뒤 다시 실행
+            block.execute_requested = True
+            return
+        if self.kernel == 'native':
+            self.env.schedule(0, self.env.start_execute, block)
+        else:
+            self.env.process(block.execute_script_by_command(self.env))
+    
+    def restart_statistics(self):
+        """블록/자원 통계를 현재 시각부터 다시 누적 (워밍업 구간 제거)"""
+        now = self.env.now
+        self.statistics.restart()
+        for pool in self.resources.values():
+            pool.restart_statistics(now)
+        logger.info(f"[{now:.1f}s] Warm-up ended - statistics restarted")
+    
+    def get_resource_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """자원별 가동률/대기열 통계"""
+        now = self.env.now if self.env else 0.0
+        return {name: pool.get_statistics(now) for name, pool in self.resources.items()}
+    
+    def place_entity(self, entity: SimpleEntity, target_block_id: str) -> bool:
+        """엔티티를 다른 블록에 즉시 추가 (대기 없음)"""
         # 블록 이름인 경우 ID로 변환
         if target_block_id not in self.blocks:
             resolved_id = self.get_block_id_by_name(target_block_id)
@@ -292,15 +443,14 @@ class SimpleSimulationEngine:
             target_block = self.blocks[target_block_id]
             if target_block.add_entity(entity):
                 # Entity moved
-                yield env.timeout(0)
-            else:
-                logger.warning(f"Block {target_block.name} is full, entity {entity.id} discarded")
-                yield env.timeout(0)
+                return True
+            logger.warning(f"Block {target_block.name} is full, entity {entity.id} discarded")
         else:
             logger.error(f"Target block {target_block_id} not found")
-            yield env.timeout(0)
+        return False
     
-    def step_simulation_time_based(self, step_duration: Optional[float] = None) -> Dict[str, Any]:
+    def step_simulation_time_based(self, step_duration: Optional[float] = None,
+                                   include_script_logs: bool = True, include_state: bool = True) -> Dict[str, Any]:
         """시간 기반 시뮬레이션 스텝 실행"""
         if not self.env:
             return {'error': 'Simulation not initialized'}
@@ -348,7 +498,7 @@ class SimpleSimulationEngine:
             self.step_count += 1
             
             # 결과 수집
-            result = self._collect_simulation_results()
+            result = self._collect_simulation_results(include_script_logs, include_state)
             result['step_count'] = self.step_count
             result['simulation_time'] = round(self.env.now, 1)
             result['time_advanced'] = round(self.env.now - start_time, 1)
@@ -367,20 +517,26 @@ class SimpleSimulationEngine:
                 'execution_mode': 'time_step'
             }
     
-    def step_simulation(self) -> Dict[str, Any]:
-        """시뮬레이션 1스텝 실행 - 실행 모드에 따라 적절한 방법 선택"""
+    def step_simulation(self, include_script_logs: bool = True, include_state: bool = True) -> Dict[str, Any]:
+        """시뮬레이션 1스텝 실행 - 실행 모드에 따라 적절한 방법 선택
+        
+        include_script_logs가 False이면 누적 스크립트 로그를 결과에 넣지 않음
+        (증분 응답은 collect_script_logs_since로 새 로그만 가져감)
+        include_state가 False이면 블록/엔티티/신호 상태를 만들지 않음
+        (증분 응답은 StateDiffTracker가 이동 저널과 변수 저장소 버전으로 바뀐 부분만 만듦)
+        """
         logger.info(f"SimpleSimulationEngine: step_simulation called with mode: {self.execution_mode}")
         
         # 실행 모드에 따라 다른 실행 방법 사용
         if self.execution_mode == "time_step":
             logger.info("SimpleSimulationEngine: Using time-based step execution")
-            return self.step_simulation_time_based()
+            return self.step_simulation_time_based(include_script_logs=include_script_logs, include_state=include_state)
         else:
             # 기본 모드 (엔티티 이동 기반)
             logger.info("SimpleSimulationEngine: Using default (entity event) step execution")
-            return self._step_simulation_default()
+            return self._step_simulation_default(include_script_logs, include_state)
     
-    def _step_simulation_default(self) -> Dict[str, Any]:
+    def _step_simulation_default(self, include_script_logs: bool = True, include_state: bool = True) -> Dict[str, Any]:
         """기본 모드 시뮬레이션 1스텝 실행 - 엔티티 이동 기반"""
         if not self.env:
             return {'error': 'Simulation not initialized'}
@@ -392,7 +548,9 @@ class SimpleSimulationEngine:
         
         # 초기 상태 저장
         initial_time = self.env.now
-        initial_block_states = self._capture_block_states()
+        journal = self.journal
+        journal.truncate()
+        initial_seq = checked_seq = journal.seq
         movement_detected = False
         
         try:
@@ -421,21 +579,29 @@ class SimpleSimulationEngine:
                 # 이벤트 하나 실행
                 self.env.step()
                 
-                # 블록 상태 변화 확인 (엔티티 이동 감지)
-                current_block_states = self._capture_block_states()
-                if self._check_entity_movement_between_states(initial_block_states, current_block_states):
+                # 블록 상태 변화 확인 (엔티티 이동 감지) - 저널에 새 기록이 생긴 경우에만 확인
+                # (블록 안의 상태/속성 변경 기록은 이동이 아님)
+                if journal.seq == checked_seq:
+                    continue
+                checked_seq = journal.seq
+                if journal.has_net_change_since(initial_seq):
                     movement_detected = True
-                    # 이동 감지 후 조금 더 실행하여 force execution 블록이 재시작할 기회를 줌
-                    for _ in range(10):
-                        if self.env.peek() < float('inf'):
-                            self.env.step()
-                        else:
-                            break
+                    # 이동 감지 후 force execution 재시작 간격 안의 이벤트만 마저 실행하여 블록이 재시작할 기회를 줌
+                    # (그 뒤의 이벤트까지 실행하면 다음 이동 시각으로 넘어가 그 이동이 이번 스텝에 섞임)
+                    settle_until = self.env.now + FORCE_EXECUTION_INTERVAL + 1e-9
+                    while self.env.peek() <= settle_until and iteration_count < max_iterations:
+                        iteration_count += 1
+                        self.env.step()
                     break
             
+            # 같은 시각에 반복 한도까지 돌았으면 지연 없는 루프 (다음 스텝도 같은 자리에서 돌게 됨)
+            deadlock = None
+            if iteration_count >= max_iterations and self.env.now == initial_time:
+                deadlock = self.deadlock_detector.diagnose(self.env.now, 'livelock')
+            
             # 이동이 없었다면 최소한 시간은 진행되었음을 보장
             # 단, 디버그 모드에서 일시정지 상태가 아닐 때만
-            if not movement_detected and self.env.now == initial_time:
+            if deadlock is None and not movement_detected and self.env.now == initial_time:
                 if not (self.debug_manager and self.debug_manager.debug_state.is_paused):
                     # 다음 이벤트까지 실행
                     if self.env.peek() < float('inf'):
@@ -444,12 +610,16 @@ class SimpleSimulationEngine:
             self.step_count += 1
             
             # 결과 수집
-            result = self._collect_simulation_results()
+            result = self._collect_simulation_results(include_script_logs, include_state)
             result['step_count'] = self.step_count
             result['simulation_time'] = round(self.env.now, 1)
             result['time_advanced'] = round(self.env.now - initial_time, 1)
             result['movement_detected'] = movement_detected
             result['execution_mode'] = 'default'
+            if deadlock is None and self.env.now >= self.deadlock_detector.next_check:
+                deadlock = self.deadlock_detector.check(self.env.now)
+            if deadlock is not None:
+                result['deadlock'] = deadlock
             
             return result
             
@@ -475,12 +645,8 @@ class SimpleSimulationEngine:
         
         for block_id, block in self.blocks.items():
             # dispose entity 또는 dispose product 명령으로 실제 배출된 엔티티만 카운트
-            if hasattr(block, 'script_lines'):
-                has_dispose = any(
-                    'dispose entity' in line.strip() or 'dispose product' in line.strip() 
-                    for line in block.script_lines
-                )
-                if has_dispose:
+            if hasattr(block, 'has_dispose'):
+                if block.has_dispose():
                     status = block.get_status()
                     processed = status.get('total_processed', 0)
                     total_processed += processed
@@ -490,22 +656,6 @@ class SimpleSimulationEngine:
         
         return total_processed
     
-    def _capture_block_states(self) -> Dict[str, List[str]]:
-        """각 블록의 엔티티 ID 목록을 캡처"""
-        states = {}
-        for block_id, block in self.blocks.items():
-            states[block_id] = [entity.id for entity in block.entities_in_block]
-        return states
-    
-    def _check_entity_movement_between_states(self, initial_states: Dict[str, List[str]], 
-                                            current_states: Dict[str, List[str]]) -> bool:
-        """두 상태 간 엔티티 이동이 있었는지 확인"""
-        # 각 블록의 엔티티 목록이 다른지 확인
-        for block_id in initial_states:
-            if set(initial_states.get(block_id, [])) != set(current_states.get(block_id, [])):
-                return True
-        return False
-    
     def _run_until_timeout(self, timeout_event) -> Generator:
         """타임아웃까지 실행"""
         try:
@@ -524,56 +674,76 @@ class SimpleSimulationEngine:
         all_logs.sort(key=lambda x: x['time'])
         return all_logs
     
-    def _collect_simulation_results(self) -> Dict[str, Any]:
-        """시뮬레이션 결과 수집"""
-        # 블록 상태 수집
-        block_states = {}
-        total_entities = 0
-        total_processed = 0
+    def collect_script_logs_since(self, cursors: Dict[str, int]) -> List[Dict[str, Any]]:
+        """블록별 커서 이후에 추가된 스크립트 로그만 수집하고 커서를 전진
         
+        cursors는 {블록 ID: 이미 보낸 로그 개수}이며 호출 후 현재 로그 개수로 갱신됨
+        """
+        new_logs = []
         for block_id, block in self.blocks.items():
-            status = block.get_status()
-            block_states[block_id] = {
-                'name': status['name'],
-                'entities': [{
-                    'id': e.id, 
-                    'location': e.current_block,
-                    'state': getattr(e, 'state', 'normal'),
-                    'color': getattr(e, 'color', None),
-                    'custom_attributes': list(getattr(e, 'custom_attributes', set()))
-                } for e in block.entities_in_block],
-                'entities_count': status['entities_count'],
-                'total_processed': status['total_processed'],
-                'warnings': status.get('warnings', []),  # 경고 메시지 포함
-                'status': status.get('status')  # 블록 상태 속성 추가
-            }
-            total_entities += status['entities_count']
-            total_processed += status['total_processed']
+            start = cursors.get(block_id, 0)
+            logs = block.get_script_logs(start)
+            cursors[block_id] = start + len(logs)
+            new_logs.extend(logs)
         
-        # 신호 상태
-        signal_states = self.signal_manager.get_all_signals()
-        
-        # 전역 신호/변수 (통합 형식)
-        global_signals = self.variable_accessor.to_config_format()
+        new_logs.sort(key=lambda x: x['time'])
+        return new_logs
+    
+    @staticmethod
+    def entity_state(entity: SimpleEntity) -> Dict[str, Any]:
+        """엔티티 하나의 상태 (block_states의 entities 항목)"""
+        return {
+            'id': str(entity.id),
+            'location': entity.current_block,
+            'state': entity.state,
+            'color': entity.color,
+            'custom_attributes': entity.attribute_list()
+        }
+    
+    @classmethod
+    def block_state(cls, block: IndependentBlock, include_entities: bool = True) -> Dict[str, Any]:
+        """블록 하나의 상태 (include_entities가 False이면 엔티티 상세 없이 요약만)"""
+        status = block.get_status()
+        state = {'name': status['name']}
+        if include_entities:
+            state['entities'] = [cls.entity_state(e) for e in block.entities_in_block]
+        state['entities_count'] = status['entities_count']
+        state['total_processed'] = status['total_processed']
+        state['warnings'] = status.get('warnings', [])  # 경고 메시지 포함
+        state['status'] = status.get('status')  # 블록 상태 속성 추가
+        return state
+    
+    def _collect_simulation_results(self, include_script_logs: bool = True, include_state: bool = True) -> Dict[str, Any]:
+        """시뮬레이션 결과 수집
+        
+        include_state가 False이면 블록/엔티티/신호 상태 없이 합계만 (증분 응답은 바뀐 부분만 따로 만듦)
+        """
+        result = {}
+        if include_state:
+            # 블록 상태 수집
+            block_states = {block_id: self.block_state(block) for block_id, block in self.blocks.items()}
+            result['block_states'] = block_states
+            # 신호 상태
+            result['current_signals'] = self.signal_manager.get_all_signals()
+            # 전역 신호/변수 (통합 형식)
+            result['globalSignals'] = self.variable_accessor.to_config_format()
+            result['blocks_info'] = [block.get_status() for block in self.blocks.values()]
         
         # 스크립트 로그 수집
-        script_logs = self.collect_script_logs()
+        script_logs = self.collect_script_logs() if include_script_logs else []
         
         # 실제 dispose된 엔티티 수 계산
         total_disposed = self._get_total_entities_processed()
         logger.info(f"[_collect_simulation_results] Total disposed entities: {total_disposed}")
         
-        return {
-            'block_states': block_states,
-            'current_signals': signal_states,
-            'globalSignals': global_signals,
-            'total_entities_in_system': total_entities,
+        result.update({
+            'total_entities_in_system': self._get_total_entity_count(),
             'total_entities_processed': total_disposed,
-            'blocks_info': [block.get_status() for block in self.blocks.values()],
             'event_queue_size': len(self.env._queue) if hasattr(self.env, '_queue') else 0,
             'script_logs': script_logs,
             'debug_info': self.debug_manager.get_debug_info() if self.debug_manager else {}
-        }
+        })
+        return result
     
     def run_simulation(self, max_steps: int = 100) -> Dict[str, Any]:
         """시뮬레이션 연속 실행"""
@@ -596,6 +766,141 @@ class SimpleSimulationEngine:
             'all_results': results
         }
     
+    def run_until(self, until: Optional[float] = None, entities_disposed: Optional[int] = None,
+                  max_events: Optional[int] = None, steady_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """스냅샷 없이 목표 시간 또는 목표 배출 수까지 빠르게 실행
+        
+        스텝마다 결과를 수집하지 않고 이벤트만 처리한 뒤 간단한 KPI만 반환합니다.
+        전체 상태가 필요하면 호출자가 종료 후 _collect_simulation_results()를 한 번 호출합니다.
+        steady_state(SteadyStateMonitor 인자)를 주면 워밍업이 끝난 시점에 통계를 다시 모으고
+        목표 KPI의 신뢰구간이 충분히 좁아지면 멈춥니다 (until은 최대 시간으로 사용).
+        """
+        if not self.env:
+            return {'error': 'Simulation not initialized'}
+        
+        if not self.blocks:
+            return {'error': 'Simulation not initialized - no blocks found'}
+        
+        if until is None and entities_disposed is None and steady_state is None:
+            return {'error': 'Either until, entities_disposed or steady_state must be given'}
+        
+        env = self.env
+        start_time = env.now
+        start_disposed = self._get_total_entities_processed()
+        
+        # 배출 수는 dispose 명령이 있는 블록만 합산 (매 이벤트마다 전체 블록을 보지 않음)
+        disposal_blocks = [block for block in self.blocks.values() if block.has_dispose()]
+        debug_state = self.debug_manager.debug_state if self.debug_manager else None
+        
+        events = 0
+        stop_reason = None
+        wall_start = time.perf_counter()
+        
+        # 교착 확인 시각과 같은 시각 연속 이벤트 수 (무한 반복 감지)
+        detector = self.deadlock_detector
+        next_check = detector.next_check
+        zero_time_limit = detector.zero_time_limit
+        last_time = env.now
+        same_time_events = 0
+        deadlock = None
+        
+        # 정상 상태 감지 (관측 시각에만 확인)
+        monitor = None
+        next_sample = float('inf')
+        sample_horizon = until if until is not None else float('inf')
+        if steady_state is not None:
+            from .steady_state import SteadyStateMonitor
+            monitor = SteadyStateMonitor(**steady_state, start_time=env.now, disposed=start_disposed)
+            next_sample = monitor.next_sample
+        
+        while stop_reason is None:
+            # 브레이크포인트에서 멈추면 더 진행하지 않음
+            if debug_state is not None and debug_state.is_paused:
+                stop_reason = 'paused'
+                break
+            
+            if max_events is not None and events >= max_events:
+                stop_reason = 'max_events'
+                break
+            
+            next_event_time = env.peek()
+            if (next_sample <= next_event_time and next_sample <= sample_horizon
+                    and (next_event_time < float('inf') or until is not None)):
+                # 다음 이벤트 전까지 상태가 그대로이므로 관측 구간 경계로 시간만 옮기고 기록
+                if next_sample > env.now:
+                    env.run(until=next_sample)
+                disposed = sum(block.total_processed for block in disposal_blocks)
+                if monitor.sample(next_sample, disposed, self._get_total_entity_count()):
+                    self.restart_statistics()
+                if monitor.converged:
+                    stop_reason = 'steady_state'
+                    break
+                next_sample = monitor.next_sample
+                continue
+            
+            if until is not None and next_event_time > until:
+                # 남은 이벤트가 목표 시간 이후면 목표 시간까지만 진행
+                if until > env.now:
+                    env.run(until=until)
+                stop_reason = 'time'
+                if next_event_time >= float('inf') and detector.parked_blocks():
+                    deadlock = detector.diagnose(env.now, 'deadlock')
+                break
+            
+            if next_event_time >= float('inf'):
+                stop_reason = 'no_events'
+                # 멈춘 스크립트만 남아 이벤트가 바닥남 - 원인 진단만 첨부
+                if detector.parked_blocks():
+                    deadlock = detector.diagnose(env.now, 'deadlock')
+                break
+            
+            env.step()
+            events += 1
+            
+            now = env.now
+            if now == last_time:
+                same_time_events += 1
+                if same_time_events >= zero_time_limit:
+                    stop_reason = 'livelock'
+                    deadlock = detector.diagnose(now, 'livelock')
+                    break
+            else:
+                last_time = now
+                same_time_events = 0
+                if now >= next_check:
+                    deadlock = detector.check(now)
+                    if deadlock is not None:
+                        stop_reason = 'deadlock'
+                        break
+                    next_check = detector.next_check
+            
+            if entities_disposed is not None:
+                disposed = sum(block.total_processed for block in disposal_blocks)
+                if disposed >= entities_disposed:
+                    stop_reason = 'entities_disposed'
+        
+        wall_time = time.perf_counter() - wall_start
+        total_disposed = self._get_total_entities_processed()
+        elapsed = env.now - start_time
+        
+        logger.info(f"run_until finished: reason={stop_reason}, time={env.now:.1f}, events={events}, wall={wall_time:.2f}s")
+        
+        return {
+            'stop_reason': stop_reason,
+            'start_time': start_time,
+            'simulation_time': env.now,
+            'events_processed': events,
+            'wall_time': wall_time,
+            'total_entities_processed': total_disposed,
+            'total_entities_in_system': self._get_total_entity_count(),
+            'throughput_per_hour': (total_disposed - start_disposed) / elapsed * 3600 if elapsed > 0 else 0.0,
+            'resources': self.get_resource_statistics(),
+            'block_statistics': self.statistics.snapshot(),
+            'time_distributions': self.statistics.distributions(),
+            'deadlock': deadlock,
+            'steady_state': monitor.result() if monitor is not None else None,
+        }
+    
     def get_simulation_status(self) -> Dict[str, Any]:
         """현재 시뮬레이션 상태 반환"""
         if not self.env:
@@ -611,5 +916,8 @@ class SimpleSimulationEngine:
             'blocks_count': len(self.blocks),
             'signals': self.signal_manager.get_all_signals(),
             'globalSignals': self.variable_accessor.to_config_format(),
-            'blocks': [block.get_status() for block in self.blocks.values()]
+            'blocks': [block.get_status() for block in self.blocks.values()],
+            'resources': self.get_resource_statistics(),
+            'block_statistics': self.statistics.snapshot(),
+            'time_distributions': self.statistics.distributions()
         }
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+WebSocket 시뮬레이션 스트림
+엔진을 백그라운드 작업으로 실행하면서 상태 프레임을 초당 최대 max_fps개까지 보냅니다.
+프레임은 증분 응답(state_diff)이며 직전에 보낸 프레임 대비 바뀐 부분만 담습니다.
+애니메이션 속도(프레임 수)와 엔진 속도가 분리되어, 프레임 사이에는 엔진이 여러 이벤트를 처리합니다.
+
+클라이언트 → 서버 명령 (JSON):
+    {"type": "pause"} / {"type": "resume"}
+    {"type": "speed", "value": 60}      # 실제 1초당 시뮬레이션 초 (0이면 최대 속도)
+    {"type": "breakpoint", "block_id": "1", "line_number": 3, "enabled": true}
+    {"type": "ack", "version": 12}      # 받은 프레임 확인 (backpressure)
+    {"type": "snapshot"}                # 다음 프레임을 전체 스냅샷으로
+    {"type": "stop"}
+
+서버 → 클라이언트 메시지:
+    {"type": "frame", ...SimulationStepResult}
+    {"type": "status", "state": "running" | "paused" | "breakpoint" | "finished", ...}
+    {"type": "error", "message": "..."}
+
+확인(ack)되지 않은 프레임이 window개 쌓이면 엔진은 계속 진행하되 프레임을 보내지 않습니다.
+다음 프레임은 마지막으로 보낸 프레임 대비 증분이므로 건너뛴 변화도 합쳐져 전달됩니다.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_inline(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    return fn(*args, **kwargs)
+
+
+class SimulationStream:
+    """WebSocket 연결 하나에 대한 스트림 세션"""
+    
+    def __init__(self, adapter, send: Callable[[Dict[str, Any]], Awaitable[None]], max_fps: float = 30.0,
+                 speed: float = 0.0, window: int = 4, chunk_events: int = 2000,
+                 run: Optional[Callable[..., Awaitable[Any]]] = None):
+        self.adapter = adapter
+        self.send = send
+        # 엔진 작업 실행기 (세션 액터의 run - 청크 단위로 제출하여 다른 요청 명령이 사이에 실행될 수 있음)
+        self.run = run or _run_inline
+        self.frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.speed = speed
+        self.window = window
+        # 명령(pause, 다른 요청)이 끼어들 수 있도록 한 번에 처리할 최대 이벤트 수
+        self.chunk_events = chunk_events
+        
+        self.paused = False
+        self.finished = False
+        self.closed = False
+        self.version: Optional[int] = None  # 클라이언트가 가진 상태 버전 (None이면 다음 프레임은 전체)
+        self.unacked = deque()
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.wake = asyncio.Event()
+        self._reset_clock()
+    
+    def _reset_clock(self):
+        """실시간 속도 기준점 초기화 (시작, 재개, 속도 변경 시)"""
+        self.sim_anchor = self.adapter.engine.env.now
+        self.wall_anchor = time.perf_counter()
+    
+    @property
+    def debug_manager(self):
+        return self.adapter.global_debug_manager
+    
+    async def send_frame(self, force: bool = False) -> bool:
+        """현재 상태 프레임 전송 (확인 대기 프레임이 window개 이상이면 건너뜀)"""
+        if not force and self.window and len(self.unacked) >= self.window:
+            self.frames_skipped += 1
+            return False
+        
+        version = self.version
+        frame = await self.run(lambda: self.adapter.get_snapshot(version).model_dump())
+        self.version = frame['version']
+        self.unacked.append(self.version)
+        self.frames_sent += 1
+        await self.send({'type': 'frame', **frame})
+        return True
+    
+    async def send_status(self, state: str, **extra):
+        await self.send({'type': 'status', 'state': state, 'time': round(self.adapter.engine.env.now, 1), **extra})
+    
+    async def handle_command(self, message: Dict[str, Any]):
+        """클라이언트 명령 처리"""
+        command = message.get('type')
+        
+        if command == 'ack':
+            version = message.get('version', 0)
+            while self.unacked and self.unacked[0] <= version:
+                self.unacked.popleft()
+        elif command == 'pause':
+            self.paused = True
+            await self.send_status('paused')
+        elif command == 'resume':
+            # 브레이크포인트에서 멈춘 경우 디버그 매니저도 재개
+            await self.run(self.debug_manager.continue_execution)
+            self.paused = False
+            self._reset_clock()
+            self.wake.set()
+            await self.send_status('running')
+        elif command == 'speed':
+            self.speed = max(float(message.get('value', 0)), 0.0)
+            self._reset_clock()
+            await self.send_status('paused' if self.paused else 'running', speed=self.speed)
+        elif command == 'breakpoint':
+            block_id, line_number = str(message['block_id']), int(message['line_number'])
+            if message.get('enabled', True):
+                await self.run(self.debug_manager.set_breakpoint, block_id, line_number)
+            else:
+                await self.run(self.debug_manager.clear_breakpoint, block_id, line_number)
+            debug_info = await self.run(self.debug_manager.get_debug_info)
+            await self.send({'type': 'breakpoints', 'breakpoints': debug_info['breakpoints']})
+        elif command == 'snapshot':
+            self.version = None
+            await self.send_frame(force=True)
+        elif command == 'stop':
+            self.closed = True
+            self.wake.set()
+        else:
+            await self.send({'type': 'error', 'message': f"Unknown command: {command}"})
+    
+    async def run_engine(self):
+        """엔진 실행 루프 - 프레임 간격마다 프레임을 보내고 그 사이에는 이벤트를 처리"""
+        engine = self.adapter.engine
+        await self.send_frame(force=True)
+        await self.send_status('running', speed=self.speed)
+        last_frame = time.perf_counter()
+        
+        while not self.closed:
+            if self.paused or self.finished:
+                self.wake.clear()
+                await self.wake.wait()
+                continue
+            
+            # 실시간 속도가 지정되면 경과 시간만큼의 시뮬레이션 시간까지만 진행
+            until = self.sim_anchor + (time.perf_counter() - self.wall_anchor) * self.speed if self.speed else float('inf')
+            try:
+                result = await self.run(engine.run_until, until, None, self.chunk_events)
+            except Exception as e:
+                logger.error(f"Simulation stream engine error: {e}")
+                result = {'error': str(e)}
+            if 'error' in result:
+                await self.send({'type': 'error', 'message': result['error']})
+                self.finished = True
+                continue
+            
+            stop_reason = result['stop_reason']
+            # 멈추는 시점의 프레임은 backpressure와 관계없이 보냄
+            stopping = stop_reason in ('paused', 'no_events')
+            now = time.perf_counter()
+            if stopping or now - last_frame >= self.frame_interval:
+                await self.send_frame(force=stopping)
+                last_frame = now
+            
+            if stop_reason == 'paused':
+                self.paused = True
+                await self.send_status('breakpoint', debug_info=await self.run(self.debug_manager.get_debug_info))
+            elif stop_reason == 'no_events':
+                self.finished = True
+                await self.send_status('finished', total_entities_processed=result['total_entities_processed'])
+            elif stop_reason == 'time':
+                # 실시간 속도에 도달 - 다음 프레임 시점까지 대기
+                await asyncio.sleep(max(self.frame_interval - (time.perf_counter() - last_frame), 0.001))
+            else:
+                # 명령 수신 작업이 실행될 기회를 줌
+                await asyncio.sleep(0)
+    
+    async def serve(self, receive: Callable[[], Awaitable[Dict[str, Any]]]):
+        """엔진 루프를 백그라운드 작업으로 실행하고 연결이 끊기거나 stop을 받을 때까지 명령을 처리"""
+        engine_task = asyncio.create_task(self.run_engine())
+        receive_task = None
+        try:
+            while not self.closed:
+                receive_task = asyncio.ensure_future(receive())
+                done, _ = await asyncio.wait({receive_task, engine_task}, return_when=asyncio.FIRST_COMPLETED)
+                if engine_task in done:
+                    engine_task.result()
+                    break
+                await self.handle_command(receive_task.result())
+        finally:
+            self.closed = True
+            self.wake.set()
+            for task in (engine_task, receive_task):
+                if task is not None and not task.done():
+                    task.cancel()
+            await asyncio.gather(engine_task, return_exceptions=True)
+            logger.info(f"Simulation stream closed: {self.frames_sent} frames sent, {self.frames_skipped} skipped")
@@ -0,0 +1,195 @@
+"""
+증분 상태 응답 (state diff)
+스텝마다 전체 스냅샷을 보내는 대신 클라이언트가 마지막으로 받은 버전 이후 바뀐 부분만 보냅니다.
+
+증분 응답(is_delta=True)의 필드 의미:
+    version            - 스텝마다 1씩 증가하는 상태 버전 (다음 요청의 since_version으로 사용)
+    active_entities    - 새로 생겼거나 블록/상태/색상/속성이 바뀐 엔티티만
+    removed_entity_ids - 사라진 엔티티 ID
+    current_signals    - 값이 바뀐 신호만
+    globalSignals      - 값이 바뀐 전역 신호/변수만
+    block_states       - 요약(개수, 처리량, 경고, 상태, 엔티티 순서)이 바뀐 블록만, 엔티티 상세 대신 entity_ids
+    script_logs        - 이전 버전 이후 추가된 로그만
+
+since_version이 없거나 현재 버전과 다르면(첫 요청, 재설정, 응답 누락) 전체 스냅샷을 보냅니다.
+
+증분 응답은 전체 결과를 만들어 비교하지 않고 엔진에서 바뀐 부분만 읽습니다.
+- 엔티티: 이동 저널에서 마지막 응답 이후 기록된 엔티티만 확인 (이동한 블록은 엔티티 순서도 다시 읽음)
+  기준 상태는 엔티티마다 (블록 ID, 상태, 색상, 속성 마스크) 튜플이고 달라진 엔티티만 응답 형식으로 만듦
+- 신호/전역 변수: 변수 저장소에서 마지막 응답의 저장소 버전 이후 바뀐 슬롯만
+- 저널 기록이 이미 버려졌으면(저널 크기 제한, 스텝 없는 실행) 모든 블록의 엔티티를 기준 상태와 비교
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from .core.unified_variable_accessor import UnifiedVariableAccessor
+from .core.variable_store import BOOLEAN, VariableStore
+
+# 기준 상태의 엔티티 (블록 ID, 상태, 색상, 속성 마스크)
+EntitySignature = Tuple[str, Any, Any, int]
+
+
+def api_entity(entity_state: Dict[str, Any], block_id: str, block_name: str) -> Dict[str, Any]:
+    """엔진의 엔티티 상태를 응답의 active_entities 항목으로 변환"""
+    return {
+        'id': entity_state['id'],
+        'current_block_id': block_id,
+        'current_block_name': block_name,
+        'state': entity_state.get('state', 'normal'),
+        'color': entity_state.get('color'),
+        'custom_attributes': entity_state.get('custom_attributes', [])
+    }
+
+
+def block_summary(block_state: Dict[str, Any], entity_ids: List[str]) -> Dict[str, Any]:
+    """블록 상태에서 엔티티 상세를 빼고 엔티티 순서(ID 목록)만 남긴 요약"""
+    summary = {key: value for key, value in block_state.items() if key != 'entities'}
+    # 블록의 경고 목록은 그 자리에서 늘어나므로 기준 상태에는 복사본을 둠
+    summary['warnings'] = list(summary.get('warnings') or [])
+    summary['entity_ids'] = entity_ids
+    return summary
+
+
+def changed_variables(store: VariableStore, version: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """저장소 버전 이후 값이 바뀐 신호 {이름: 값}과 전역 신호/변수 항목 목록 (정의가 사라진 슬롯은 제외)"""
+    signals = {}
+    entries = []
+    for slot in store.changed_since(version):
+        value = store.values[slot]
+        if value is None:
+            continue
+        kind = store.kinds[slot]
+        name = store.names[slot]
+        if kind == BOOLEAN:
+            signals[name] = value
+        entries.append(UnifiedVariableAccessor.config_entry(kind, name, value, store.initial[slot]))
+    return signals, entries
+
+
+class StateDiffTracker:
+    """마지막으로 보낸 상태(기준 상태)를 기억하고 다음 응답에서 그 이후 바뀐 부분만 만듦"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """기준 상태 초기화 (시뮬레이션 설정/리셋 시)"""
+        self.version = 0
+        self.entities: Dict[Any, EntitySignature] = {}
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self.journal_seq: Optional[int] = None  # 마지막으로 보낸 이동 저널 순번
+        self.variables_version: Optional[int] = None  # 마지막으로 보낸 변수 저장소 버전
+        # 블록별로 이미 보낸 스크립트 로그 개수 (엔진의 collect_script_logs_since 커서)
+        self.log_cursors: Dict[str, int] = {}
+    
+    def is_current(self, since_version: Optional[int]) -> bool:
+        """클라이언트가 현재 기준 상태를 가지고 있는지 (증분 응답 가능 여부)"""
+        return since_version is not None and since_version == self.version
+    
+    def advance(self, converted: Dict[str, Any], engine: Any, delta: bool) -> Dict[str, Any]:
+        """API 형식 스텝 결과로 응답을 만들고 기준 상태를 엔진의 현재 상태로 옮긴 뒤 버전을 올림
+        
+        delta가 True이면 converted에는 블록/엔티티/신호 상태가 없어도 되며(include_state=False)
+        기준 상태 이후 바뀐 부분만 엔진에서 읽어 채움, 아니면 converted(전체 결과)를 그대로 반환
+        """
+        if delta:
+            response = dict(converted)
+            self._fill_delta(response, engine)
+            response['is_delta'] = True
+        else:
+            response = converted
+            self._rebase(converted, engine)
+        
+        self.journal_seq = engine.journal.seq
+        self.variables_version = engine.variables.version
+        self.version += 1
+        response['version'] = self.version
+        return response
+
+    def _rebase(self, converted: Dict[str, Any], engine: Any):
+        """전체 결과를 보낸 뒤 기준 상태를 새로 만듦"""
+        self.entities = {
+            entity.id: (block_id, entity.state, entity.color, entity.attribute_mask)
+            for block_id, block in engine.blocks.items() for entity in block.entities_in_block
+        }
+        self.blocks = {
+            block_id: block_summary(state, [entity['id'] for entity in state.get('entities', [])])
+            for block_id, state in (converted.get('block_states') or {}).items()
+        }
+    
+    def _fill_delta(self, response: Dict[str, Any], engine: Any):
+        """기준 상태 이후 바뀐 엔티티/블록/신호를 응답에 채우고 기준 상태를 갱신"""
+        blocks = engine.blocks
+        journal = engine.journal
+        previous = self.entities
+        
+        if self.journal_seq is not None and journal.covers(self.journal_seq):
+            entries = journal.since(self.journal_seq)
+            moved_blocks = {block_id for block_id, _, change in entries if change}
+            touched = {entity_id for _, entity_id, _ in entries}
+        else:
+            moved_blocks = set(blocks)
+            touched = None
+        
+        # 바뀌었을 수 있는 엔티티의 현재 위치 (이동이 있었던 블록만 엔티티 목록을 훑음)
+        located: Dict[Any, Tuple[Any, str]] = {}
+        for block_id in moved_blocks:
+            block = blocks.get(block_id)
+            if block is None:
+                continue
+            for entity in block.entities_in_block:
+                if touched is None or entity.id in touched:
+                    located[entity.id] = (entity, block_id)
+        
+        removed = []
+        if touched is None:
+            removed = [entity_id for entity_id in previous if entity_id not in located]
+        else:
+            for entity_id in touched:
+                if entity_id in located:
+                    continue
+                signature = previous.get(entity_id)
+                if signature is None:
+                    continue  # 마지막 응답 이후 생겼다가 사라진 엔티티
+                block_id = signature[0]
+                if block_id in moved_blocks:
+                    removed.append(entity_id)
+                    continue
+                # 이동이 없었던 블록 안에서 상태/색상/속성만 바뀐 엔티티
+                for entity in blocks[block_id].entities_in_block:
+                    if entity.id == entity_id:
+                        located[entity_id] = (entity, block_id)
+                        break
+        
+        active_entities = []
+        for entity_id, (entity, block_id) in located.items():
+            signature = (block_id, entity.state, entity.color, entity.attribute_mask)
+            if previous.get(entity_id) != signature:
+                previous[entity_id] = signature
+                active_entities.append(api_entity(engine.entity_state(entity), block_id, blocks[block_id].name))
+        for entity_id in removed:
+            del previous[entity_id]
+        response['active_entities'] = active_entities
+        response['removed_entity_ids'] = [str(entity_id) for entity_id in removed]
+        
+        # 블록 요약 (엔티티 순서는 이동이 있었던 블록만 다시 읽음)
+        block_states = {}
+        for block_id, block in blocks.items():
+            summary = self.blocks.get(block_id)
+            if summary is None or block_id in moved_blocks:
+                entity_ids = [str(entity.id) for entity in block.entities_in_block]
+            else:
+                entity_ids = summary['entity_ids']
+            current = block_summary(engine.block_state(block, include_entities=False), entity_ids)
+            if current != summary:
+                block_states[block_id] = current
+                self.blocks[block_id] = current
+        response['block_states'] = block_states
+        
+        # 신호/전역 변수 (변수 저장소 버전이 그대로면 확인할 것 없음)
+        store = engine.variables
+        if self.variables_version is None or store.version != self.variables_version:
+            signals, global_signals = changed_variables(store, self.variables_version or 0)
+        else:
+            signals, global_signals = {}, []
+        response['current_signals'] = signals
+        response['globalSignals'] = global_signals
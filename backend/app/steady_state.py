@@ -0,0 +1,127 @@
+"""
+정상 상태 감지와 자동 종료 규칙 (run_until의 steady_state 옵션)
+처리량/재공(WIP)이 정상 상태에 이르렀는지 실행 중에 판단하고, 목표 KPI가 충분히 정확해지면 멈춥니다.
+
+- 관측: sample_interval마다 구간 처리량(시간당 배출 수)과 그 시점의 WIP(시스템 내 엔티티 수)
+- 워밍업: MSER-5 - 관측을 5개씩 묶은 평균 Y에서 d개를 버렸을 때
+  sum((Y_i - 평균)^2) / (n - d)^2 이 가장 작은 d (d가 n/2 미만일 때만 유효, 두 계열 중 큰 값)
+- 워밍업이 정해지면 엔진의 블록/자원 통계를 그 시점부터 다시 누적
+- 종료: 워밍업 이후 관측을 batches개 구간으로 나눈 batch means 신뢰구간 반폭이
+  tolerance 이하 (relative면 평균 대비 비율)
+"""
+import math
+from statistics import mean, stdev
+from typing import Any, Dict, List, Optional
+
+from .replication_runner import t_critical
+
+STEADY_STATE_KPIS = ('throughput', 'wip')
+MSER_BATCH_SIZE = 5
+
+
+def mser_truncation(values: List[float], batch_size: int = MSER_BATCH_SIZE) -> Optional[int]:
+    """MSER 잘라낼 관측 수 (유효한 절단점이 아직 없으면 None)"""
+    count = len(values) // batch_size
+    if count < 4:
+        return None
+    batches = [sum(values[i * batch_size:(i + 1) * batch_size]) / batch_size for i in range(count)]
+    
+    # 뒤에서부터 합/제곱합을 누적해 d마다 O(1)로 계산 (d는 절반까지만 - 꼬리가 짧을수록 값이 작아지므로)
+    limit = count // 2
+    total = squares = 0.0
+    best_d, best_value = None, math.inf
+    for d in range(count - 1, -1, -1):
+        total += batches[d]
+        squares += batches[d] * batches[d]
+        if d > limit:
+            continue
+        remaining = count - d
+        value = max(squares - total * total / remaining, 0.0) / (remaining * remaining)
+        if value <= best_value:
+            best_d, best_value = d, value
+    # 최소가 탐색 범위 끝이면 워밍업이 더 길 수 있으므로 더 관측
+    if best_d is None or best_d >= limit:
+        return None
+    return best_d * batch_size
+
+
+class SteadyStateMonitor:
+    """실행 중 관측을 모아 워밍업 절단점과 batch means 추정치를 갱신"""
+    
+    def __init__(self, kpi: str = 'throughput', tolerance: float = 0.05, relative: bool = True,
+                 sample_interval: float = 60.0, batches: int = 20, confidence: float = 0.95,
+                 min_warmup_batches: int = 10, start_time: float = 0.0, disposed: int = 0):
+        if kpi not in STEADY_STATE_KPIS:
+            raise ValueError(f"Unknown steady state KPI: {kpi}")
+        if sample_interval <= 0 or tolerance <= 0 or batches < 2:
+            raise ValueError('sample_interval and tolerance must be positive and batches at least 2')
+        self.kpi = kpi
+        self.tolerance = tolerance
+        self.relative = relative
+        self.sample_interval = sample_interval
+        self.batches = batches
+        self.confidence = confidence
+        self.min_warmup_batches = max(4, min_warmup_batches)
+        self.start_time = start_time
+        self.next_sample = start_time + sample_interval
+        self.last_disposed = disposed
+        
+        self.series: Dict[str, List[float]] = {name: [] for name in STEADY_STATE_KPIS}
+        self.truncation: Optional[int] = None  # 워밍업으로 버린 관측 수
+        self.warmup_time: Optional[float] = None
+        self.detected_at: Optional[float] = None
+        self.estimate: Optional[Dict[str, Any]] = None
+        self.converged = False
+    
+    def sample(self, time: float, disposed: int, wip: int) -> bool:
+        """구간 경계(time)의 관측 추가 - 이번에 워밍업 절단점이 정해졌으면 True"""
+        self.series['throughput'].append((disposed - self.last_disposed) / self.sample_interval * 3600)
+        self.series['wip'].append(float(wip))
+        self.last_disposed = disposed
+        self.next_sample = time + self.sample_interval
+        
+        warmup_ended = False
+        samples = len(self.series[self.kpi])
+        if self.truncation is None and samples % MSER_BATCH_SIZE == 0 and samples // MSER_BATCH_SIZE >= self.min_warmup_batches:
+            cuts = [mser_truncation(values) for values in self.series.values()]
+            if None not in cuts:
+                self.truncation = max(cuts)
+                self.warmup_time = self.start_time + self.truncation * self.sample_interval
+                self.detected_at = time
+                warmup_ended = True
+        if self.truncation is not None:
+            self._update_estimate()
+        return warmup_ended
+    
+    def _update_estimate(self):
+        """워밍업 이후 관측의 batch means 평균과 신뢰구간 반폭"""
+        values = self.series[self.kpi][self.truncation:]
+        size = len(values) // self.batches
+        if size < 1:
+            return
+        batch_means = [mean(values[i * size:(i + 1) * size]) for i in range(self.batches)]
+        average = mean(batch_means)
+        half_width = t_critical(self.confidence, self.batches - 1) * stdev(batch_means) / math.sqrt(self.batches)
+        limit = self.tolerance * abs(average) if self.relative else self.tolerance
+        self.converged = half_width <= limit
+        self.estimate = {
+            'mean': average,
+            'half_width': half_width,
+            'ci_low': average - half_width,
+            'ci_high': average + half_width,
+            'batch_size': size,
+        }
+    
+    def result(self) -> Dict[str, Any]:
+        """워밍업/추정 결과 요약"""
+        return {
+            'kpi': self.kpi,
+            'converged': self.converged,
+            'samples': len(self.series[self.kpi]),
+            'sample_interval': self.sample_interval,
+            'warmup_time': self.warmup_time,
+            'warmup_detected_at': self.detected_at,
+            'batches': self.batches,
+            'confidence': self.confidence,
+            **(self.estimate or {}),
+        }
@@ -0,0 +1,98 @@
+"""
+Shared layouts and engine factories for the backend tests
+"""
+
+import copy
+
+import pytest
+
+from app.core.integer_variable_manager import IntegerVariableManager
+from app.core.unified_variable_accessor import UnifiedVariableAccessor
+from app.simple_engine_adapter import SimpleEngineAdapter
+from app.simple_script_executor import SimpleScriptExecutor
+from app.simple_signal_manager import SimpleSignalManager
+from app.simple_simulation_engine import SimpleSimulationEngine
+
+# A product every 5 s, disposed on arrival
+LINE_BLOCKS = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ndelay 5\ncreate product\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+    {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': 'dispose product'},
+]
+
+# The source blocks (go ... wait) in front of a one-slot station
+BLOCKING_BLOCKS = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ncreate product\ngo OUT to 공정.IN(0) wait\nexecute 공정'},
+    {'id': '2', 'name': '공정', 'maxCapacity': 1, 'script': 'delay 4\ndispose product'},
+]
+
+# Random inter-arrival times; the sink counts disposals in `done`
+RANDOM_LINE = {
+    'blocks': [
+        {'id': '1', 'name': '투입', 'maxCapacity': 1,
+         'script': 'force execution\ndelay 3-7\ncreate product\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+        {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': 'dispose product\nint done += 1'},
+    ],
+    'connections': [],
+    'globalSignals': [{'name': 'done', 'type': 'integer', 'value': 0}],
+}
+
+
+def layout_config(layout):
+    """Engine config from a block list or a full config dict"""
+    if isinstance(layout, list):
+        return {'blocks': layout, 'connections': []}
+    return dict(layout)
+
+
+@pytest.fixture
+def line_blocks():
+    return copy.deepcopy(LINE_BLOCKS)
+
+
+@pytest.fixture
+def blocking_blocks():
+    return copy.deepcopy(BLOCKING_BLOCKS)
+
+
+@pytest.fixture
+def random_line():
+    return copy.deepcopy(RANDOM_LINE)
+
+
+@pytest.fixture
+def make_engine():
+    """make_engine(blocks or config, kernel='simpy', **config options) -> a set-up engine"""
+    def make(layout, kernel='simpy', **options):
+        engine = SimpleSimulationEngine()
+        engine.setup_simulation({**layout_config(layout), 'kernel': kernel, **options})
+        return engine
+    return make
+
+
+@pytest.fixture
+def make_adapter():
+    """make_adapter(blocks or config, **config options) -> an adapter whose engine is set up (LINE_BLOCKS by default)"""
+    def make(layout=None, **options):
+        adapter = SimpleEngineAdapter()
+        adapter.reset_simulation()
+        adapter.engine.setup_simulation({**layout_config(layout if layout is not None else copy.deepcopy(LINE_BLOCKS)),
+                                         **options})
+        adapter.engine.set_debug_manager(adapter.global_debug_manager)
+        return adapter
+    return make
+
+
+@pytest.fixture
+def make_executor():
+    """make_executor(signals=None, integers=None) -> (executor, signal manager, integer manager)"""
+    def make(signals=None, integers=None):
+        signal_manager = SimpleSignalManager()
+        signal_manager.initialize_signals(signals or {})
+        integer_manager = IntegerVariableManager()
+        integer_manager.initialize_variables(integers or {})
+        accessor = UnifiedVariableAccessor(signal_manager, integer_manager)
+        executor = SimpleScriptExecutor(signal_manager, integer_manager, accessor)
+        return executor, signal_manager, integer_manager
+    return make
@@ -0,0 +1,78 @@
+"""
+Tests for event-driven block process activation
+"""
+
+
+class TestBlockActivation:
+    """Test that block processes sleep until there is work"""
+    
+    def test_idle_blocks_schedule_no_events(self, make_engine):
+        """Blocks without work leave the event queue empty after start-up"""
+        blocks = [{'id': str(i), 'name': f'유휴{i}', 'maxCapacity': 1, 'script': '// 대기'} for i in range(1, 21)]
+        engine = make_engine(blocks)
+        engine.env.run()
+        assert engine.env.now == 0
+    
+    def test_force_execution_restarts_when_entity_leaves(self, make_engine, line_blocks):
+        """A force execution block restarts once its entity has moved on"""
+        engine = make_engine(line_blocks + [{'id': '3', 'name': '유휴', 'maxCapacity': 1, 'script': '// 대기'}])
+        events = 0
+        while engine.env.peek() <= 60:
+            engine.env.step()
+            events += 1
+        
+        assert engine.blocks['2'].total_processed >= 5
+        # 0.01초 폴링이었다면 블록 3개 x 60초 x 100회 이상의 이벤트가 발생
+        assert events < 1000
+    
+    def test_warnings_expire_on_status(self, make_engine):
+        """Old capacity warnings are pruned when the status is read"""
+        engine = make_engine([{'id': '1', 'name': '공정1', 'maxCapacity': 1, 'script': '// 대기'}])
+        block = engine.blocks['1']
+        engine.env.run(until=2)
+        block.add_capacity_warning(engine.env, '공정2', 'e1')
+        assert len(block.get_status()['warnings']) == 1
+        
+        engine.env.run(until=10)
+        assert block.get_status()['warnings'] == []
+
+
+STEP_LINE = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ncreate product\ngo R to 공정1.L(0,3)\nexecute 공정1\ndelay 17'},
+    {'id': '2', 'name': '공정1', 'maxCapacity': 1, 'script': 'delay 10\ngo R to 배출.L(0,3)\nexecute 배출'},
+    {'id': '3', 'name': '배출', 'maxCapacity': 5, 'script': 'dispose product'},
+]
+
+
+class TestDefaultModeSteps:
+    """Test /step boundaries in the default (movement-based) execution mode"""
+    
+    def step(self, adapter, count):
+        steps = []
+        for _ in range(count):
+            result = adapter.step_simulation()
+            steps.append((result.time, tuple(len(block.entities_in_block) for block in adapter.engine.blocks.values())))
+        return steps
+    
+    def test_step_times_follow_each_movement(self, make_adapter):
+        """Each step stops at the next movement; the entity created at t=0 is its own step"""
+        adapter = make_adapter(STEP_LINE)
+        assert self.step(adapter, 7) == [
+            (0.0, (1, 0, 0)),   # 생성
+            (3.0, (0, 1, 0)),   # 투입 -> 공정1
+            (16.0, (0, 0, 0)),  # 공정1 -> 배출 (즉시 배출)
+            (20.0, (1, 0, 0)),  # 다음 생성 (force execution 재시작 후 delay 17)
+            (23.0, (0, 1, 0)),
+            (36.0, (0, 0, 0)),
+            (40.0, (1, 0, 0)),
+        ]
+    
+    def test_step_does_not_run_past_the_movement_time(self, make_adapter):
+        """Events scheduled after the movement stay for the next step"""
+        adapter = make_adapter(STEP_LINE)
+        adapter.step_simulation()
+        assert adapter.engine.env.now < 1
+        assert adapter.engine.env.peek() == 3.0
+        times = [time for time, _ in self.step(adapter, 12)]
+        assert times == sorted(set(times))
@@ -0,0 +1,58 @@
+"""
+Tests for incremental per-block KPI collectors
+"""
+
+import pytest
+import simpy
+
+from app.block_statistics import StatisticsRegistry
+from app.replication_runner import run_replication
+from app.simple_block import IndependentBlock
+from app.simple_entity import SimpleEntity
+
+
+class TestBlockStatistics:
+    """Test time-weighted WIP, state times, throughput and cycle time"""
+    
+    def test_accumulators(self):
+        env = simpy.Environment()
+        registry = StatisticsRegistry()
+        registry.reset(env)
+        block = IndependentBlock('1', '공정', [], max_capacity=5, statistics=registry)
+        first, second = SimpleEntity(), SimpleEntity()
+        block.add_entity(first)
+        env.run(until=2)
+        block.add_entity(second)
+        block.set_executing(True)
+        env.run(until=6)
+        block.set_executing(False)
+        block.remove_entity(first)
+        env.run(until=10)
+        
+        stats = registry.snapshot()['1']
+        assert stats['name'] == '공정'
+        assert stats['average_wip'] == pytest.approx((1 * 2 + 2 * 4 + 1 * 4) / 10)
+        assert stats['state_time'] == {'busy': 4.0, 'idle': 6.0, 'blocked': 0.0, 'starved': 0.0}
+        assert stats['utilization'] == pytest.approx(0.4)
+        assert stats['departures'] == 1 and stats['average_cycle_time'] == pytest.approx(6.0)
+        assert stats['throughput_per_hour'] == pytest.approx(360.0)
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_engine_run(self, kernel, make_engine, blocking_blocks):
+        """Blocked and busy time come straight from run_until without snapshots"""
+        engine = make_engine(blocking_blocks, kernel, seed=3)
+        result = engine.run_until(until=100)
+        source, station = result['block_statistics']['1'], result['block_statistics']['2']
+        for stats in (source, station):
+            assert sum(stats['state_time'].values()) == pytest.approx(100.0)
+        assert source['state_time']['blocked'] == pytest.approx(engine.blocks['1'].blocked_time)
+        assert station['utilization'] == pytest.approx(1.0)
+        assert station['average_cycle_time'] == pytest.approx(4.0)
+        assert station['departures'] == engine.blocks['2'].total_processed
+        assert engine.get_simulation_status()['block_statistics']['2']['arrivals'] == station['arrivals']
+    
+    def test_replication_returns_statistics(self, blocking_blocks):
+        result = run_replication({'blocks': blocking_blocks, 'connections': []}, seed=1, until=40)
+        assert result['block_statistics']['2']['departures'] == 10
+        disabled = run_replication({'blocks': blocking_blocks, 'connections': [], 'block_statistics': False}, seed=1, until=40)
+        assert disabled['block_statistics'] == {} and disabled['total_entities_processed'] == 10
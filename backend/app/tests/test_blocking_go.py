@@ -0,0 +1,64 @@
+"""
+Tests for blocking go (go ... wait) and block entry queues
+"""
+
+import pytest
+import simpy
+
+from app.simple_block import IndependentBlock
+from app.simple_entity import SimpleEntity
+from app.simple_script_compiler import compile_script, OP_GO
+
+
+class TestBlockingGo:
+    """Test capacity-aware wait queues for go"""
+    
+    def test_parse_wait_suffix(self):
+        """wait and wait priority N compile into the go operand"""
+        program = compile_script([
+            'go OUT to 공정.IN(0,2) wait priority 3',
+            'go OUT to 공정.IN wait',
+            'go OUT to 공정.IN(1)',
+        ])
+        operands = [i.operand for i in program.instructions if i.opcode == OP_GO]
+        assert [(o.target_block, o.target_connector, o.blocking, o.priority) for o in operands] == [
+            ('공정', 'IN', True, 3), ('공정', 'IN', True, 0), ('공정', 'IN', False, 0)]
+        assert operands[0].delay is not None and operands[2].entity_index == 1
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_waits_instead_of_failing(self, kernel, make_engine, blocking_blocks):
+        """A full target parks the entity; it moves as soon as a slot frees up"""
+        engine = make_engine(blocking_blocks, kernel, seed=3)
+        engine.run_until(until=100)
+        source, target = engine.blocks['1'], engine.blocks['2']
+        assert target.total_processed == 25
+        assert source.warnings == [] and not source.last_capacity_warning_time
+        assert source.blocked_count >= 24
+        assert source.blocked_time == pytest.approx(4 * source.blocked_count, abs=4)
+        assert source.get_status()['blocked_time'] == source.blocked_time
+    
+    def test_priority_then_fifo(self):
+        """Higher priority enters first; equal priorities keep arrival order"""
+        env = simpy.Environment()
+        target = IndependentBlock('t', '대상', [], max_capacity=1)
+        source = IndependentBlock('s', '출발', [], max_capacity=10)
+        target.env = source.env = env
+        occupant = SimpleEntity()
+        target.add_entity(occupant)
+        waiting = [SimpleEntity() for _ in range(3)]
+        events = []
+        for entity, priority in zip(waiting, [0, 5, 0]):
+            source.add_entity(entity)
+            events.append(env.event())
+            target.wait_for_entry(env, entity, source, events[-1], priority)
+        assert target.get_status()['waiting_to_enter'] == 3
+        
+        order = []
+        current = occupant
+        for _ in range(3):
+            target.remove_entity(current)
+            current = target.entities_in_block[0]
+            order.append(waiting.index(current))
+        assert order == [1, 0, 2]
+        assert all(event.triggered and event.value is True for event in events)
+        assert source.entities_in_block == [] and source.blocked_count == 3
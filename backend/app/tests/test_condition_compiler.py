@@ -0,0 +1,121 @@
+"""
+Tests for the condition AST compiler
+"""
+
+from app.simple_entity import SimpleEntity, attribute_mask
+from app.simple_condition_compiler import (
+    parse_condition, compile_condition, condition_dependencies, AndNode, OrNode, NotNode, SignalCompare, IntCompare,
+    ProductTypeCompare
+)
+
+
+class FakeBlock:
+    def __init__(self, entities):
+        self.entities_in_block = entities
+
+
+def make_entity(*attributes, state="normal"):
+    entity = SimpleEntity()
+    entity.custom_attributes.update(attributes)
+    entity.state = state
+    return entity
+
+
+class TestParseCondition:
+    """Test parsing into a typed AST"""
+    
+    def test_precedence(self):
+        """and binds tighter than or, not tighter than and"""
+        node = parse_condition("a = true or not b = false and count >= 3")
+        assert isinstance(node, OrNode)
+        assert node.terms[0] == SignalCompare("a", True)
+        assert isinstance(node.terms[1], AndNode)
+        assert node.terms[1].terms[0] == NotNode(SignalCompare("b", False))
+        assert node.terms[1].terms[1] == IntCompare("count", ">=", literal=3)
+    
+    def test_typed_terms(self):
+        """Terms are classified by their right-hand side"""
+        assert parse_condition("x != true") == SignalCompare("x", True, negate=True)
+        assert parse_condition("counter >= limit") == IntCompare("counter", ">=", reference="limit")
+        assert parse_condition("product type(1) != blue") == ProductTypeCompare(1, "blue", negate=True)
+    
+    def test_product_type_shorthand(self):
+        """product type = a and b checks both attributes"""
+        node = parse_condition("product type = flip and 1c")
+        assert node == AndNode((ProductTypeCompare(None, "flip"), ProductTypeCompare(None, "1c")))
+    
+    def test_dependencies(self):
+        """Signal/variable names are collected; product type conditions have none"""
+        assert condition_dependencies(parse_condition("a = true or counter >= limit")) == ("a", "counter", "limit")
+        assert condition_dependencies(parse_condition("a = true and product type = red")) is None
+
+
+class TestCompiledConditions:
+    """Test evaluation of compiled conditions"""
+    
+    def test_mixed_and_or(self, make_executor):
+        """Mixed and/or conditions follow precedence"""
+        executor, _, _ = make_executor({"a": False, "b": True, "c": True})
+        assert executor._evaluate_if_condition("a = true and b = true or c = true")
+        assert not executor._evaluate_if_condition("a = true and b = true or c = false")
+    
+    def test_integer_comparisons(self, make_executor):
+        """Integer comparisons against literals and other variables"""
+        executor, _, integer_manager = make_executor({"flag": True}, {"count": 5, "limit": 5})
+        assert executor._evaluate_if_condition("count >= limit")
+        assert not executor._evaluate_if_condition("count > limit")
+        integer_manager.perform_operation("count", "+=", 1)
+        assert executor._evaluate_if_condition("count > limit")
+        assert executor._evaluate_if_condition("count != 5")
+    
+    def test_undefined_integer(self, make_executor):
+        """= against an undefined name behaves like an unset signal; other operators are false"""
+        executor, _, _ = make_executor()
+        assert executor._evaluate_if_condition("count = 2")
+        assert not executor._evaluate_if_condition("count > 2")
+    
+    def test_product_type_conditions(self, make_executor):
+        """Entity and indexed product type checks"""
+        executor, signal_manager, _ = make_executor({"enable": True})
+        entity = make_entity("red")
+        block = FakeBlock([make_entity("blue"), make_entity(state="transit")])
+        assert executor._evaluate_if_condition("product type = red or blue", entity)
+        assert not executor._evaluate_if_condition("product type = red and blue", entity)
+        assert executor._evaluate_if_condition("enable = true and product type(0) = blue", None, block)
+        assert executor._evaluate_if_condition("product type(1) = transit", None, block)
+        assert not executor._evaluate_if_condition("product type(5) != blue", None, block)
+        assert not executor._evaluate_if_condition("product type = red", None)
+        
+        signal_manager.set_signal("enable", False)
+        assert not executor._evaluate_if_condition("enable = true and product type(0) = blue", None, block)
+    
+    def test_attribute_masks(self):
+        """Attribute names are interned to bits; and/or over one entity fuse into one mask check"""
+        entity = make_entity("flip", "1c")
+        assert entity.attribute_mask == attribute_mask(("flip", "1c"))
+        assert sorted(entity.attribute_list()) == ["1c", "flip"]
+        
+        fused = compile_condition(parse_condition("product type = flip and 1c and 2c"), None, None)
+        assert "_compile_entity_test" in fused.__qualname__
+        assert not fused(entity, None)
+        entity.custom_attributes.add("2c")
+        assert fused(entity, None)
+        any_of = compile_condition(parse_condition("product type(0) = red or 2c"), None, None)
+        assert any_of(None, FakeBlock([entity])) and not any_of(None, FakeBlock([make_entity("blue")]))
+        
+        entity.custom_attributes.discard("flip")
+        assert "flip" not in entity.custom_attributes and len(entity.custom_attributes) == 2
+    
+    def test_bindings_survive_reset(self, make_executor):
+        """Managers update their stores in place, so compiled conditions stay bound"""
+        executor, signal_manager, integer_manager = make_executor({"ready": False}, {"count": 0})
+        assert not executor._evaluate_if_condition("ready = true")
+        
+        signal_manager.initialize_signals({"ready": True})
+        assert executor._evaluate_if_condition("ready = true")
+        
+        integer_manager.initialize_variables({"count": 3})
+        assert executor._evaluate_if_condition("count = 3")
+        integer_manager.set_variable("count", 1)
+        integer_manager.reset()
+        assert executor._evaluate_if_condition("count = 3")
@@ -0,0 +1,99 @@
+"""
+Tests for deadlock and livelock detection in headless runs
+"""
+
+import pytest
+
+from app.deadlock_detector import find_cycle
+from app.models import SimulationSetup
+from app.simple_engine_adapter import SimpleEngineAdapter
+
+SIGNAL_CYCLE = {
+    'blocks': [
+        {'id': '1', 'name': '가공', 'maxCapacity': 1, 'script': 'force execution\nwait b_ready = true\na_ready = true'},
+        {'id': '2', 'name': '검사', 'maxCapacity': 1, 'script': 'force execution\nwait a_ready = true\nb_ready = true'},
+    ],
+    'connections': [],
+    'initial_signals': {'a_ready': False, 'b_ready': False},
+}
+
+POLLED_WAIT = {
+    'blocks': [
+        {'id': '1', 'name': '투입', 'maxCapacity': 1, 'script': 'force execution\ncreate product\nwait product type = red'},
+    ],
+    'connections': [],
+}
+
+ZERO_TIME_LOOP = {
+    'blocks': [
+        {'id': '1', 'name': '루프', 'maxCapacity': 1, 'script': 'force execution\nint count += 1\njump to 2'},
+    ],
+    'connections': [],
+    'globalSignals': [{'name': 'count', 'type': 'integer', 'value': 0}],
+}
+
+
+class TestDeadlockDetector:
+    """Test early termination and wait-for graph diagnostics"""
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_signal_cycle_is_diagnosed(self, kernel, make_engine):
+        """Two blocks waiting on each other's signal drain the event queue; the cycle is named"""
+        result = make_engine(SIGNAL_CYCLE, kernel).run_until(entities_disposed=1)
+        assert result['stop_reason'] == 'no_events'
+        assert make_engine(SIGNAL_CYCLE, kernel).run_until(until=1000)['deadlock']['cycle']
+        deadlock = result['deadlock']
+        assert deadlock['reason'] == 'deadlock'
+        assert sorted(deadlock['cycle']) == ['가공', '검사']
+        entries = {entry['block']: entry for entry in deadlock['blocks']}
+        assert entries['가공']['line'] == 2 and entries['가공']['signals'] == ['b_ready']
+        assert entries['검사']['text'] == 'wait a_ready = true'
+        assert '가공 line 2' in deadlock['message']
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_polled_wait_stops_after_timeout(self, kernel, make_engine):
+        """A polled wait keeps the queue busy; the run stops once nothing progresses for the timeout"""
+        engine = make_engine(POLLED_WAIT, kernel, deadlock_timeout=20)
+        result = engine.run_until(until=100000)
+        assert result['stop_reason'] == 'deadlock'
+        assert 20 <= result['simulation_time'] <= 31
+        entry, = result['deadlock']['blocks']
+        assert (entry['block'], entry['line'], entry['waiting_for']) == ('투입', 3, 'wait')
+        assert entry['note']
+    
+    def test_polled_wait_without_timeout_runs_to_horizon(self, make_engine):
+        result = make_engine(POLLED_WAIT).run_until(until=50)
+        assert result['stop_reason'] == 'time' and result['deadlock'] is None
+    
+    def test_busy_model_is_not_a_deadlock(self, make_engine):
+        """Blocks in delay are making progress even when no entity moves"""
+        config = {'blocks': [{'id': '1', 'name': '타이머', 'maxCapacity': 1,
+                              'script': 'force execution\ndelay 30\ntick = true\ndelay 30\ntick = false'}],
+                  'connections': [], 'initial_signals': {'tick': False}}
+        result = make_engine(config, deadlock_timeout=5).run_until(until=500)
+        assert result['stop_reason'] == 'time' and result['deadlock'] is None
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_zero_time_loop_is_a_livelock(self, kernel, make_engine):
+        result = make_engine(ZERO_TIME_LOOP, kernel, zero_time_event_limit=5000).run_until(until=100)
+        assert result['stop_reason'] == 'livelock'
+        assert result['simulation_time'] == 0
+        running, = result['deadlock']['running']
+        assert running['block'] == '루프'
+        assert running['zero_time_loops'] == [{'line': 3, 'text': 'jump to 2', 'loop_start': 2}]
+    
+    def test_step_mode_reports_livelock(self, make_engine):
+        engine = make_engine(ZERO_TIME_LOOP)
+        result = engine._step_simulation_default(include_script_logs=False)
+        assert result['deadlock']['reason'] == 'livelock'
+    
+    def test_settings_deadlock_timeout(self):
+        """settings.deadlockTimeout from the saved layout reaches the engine"""
+        setup = SimulationSetup(blocks=[], connections=[], settings={'deadlockTimeout': 20})
+        assert SimpleEngineAdapter.convert_setup_to_simple_format(setup)['deadlock_timeout'] == 20.0
+        setup = SimulationSetup(blocks=[], connections=[], settings={'deadlockTimeout': 20}, deadlock_timeout=5)
+        assert SimpleEngineAdapter.convert_setup_to_simple_format(setup)['deadlock_timeout'] == 5.0
+    
+    def test_find_cycle(self):
+        assert find_cycle({'a': ['b'], 'b': ['c'], 'c': ['a']}) == ['a', 'b', 'c']
+        assert find_cycle({'a': ['b'], 'b': []}) == []
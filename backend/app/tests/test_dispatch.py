@@ -0,0 +1,102 @@
+"""
+Tests for go ... to any(...) dispatch rules
+"""
+
+import pytest
+import simpy
+
+from app.dispatch import DispatchGroup
+from app.simple_block import IndependentBlock
+from app.simple_entity import SimpleEntity
+from app.simple_script_compiler import compile_script, OP_GO
+
+
+def make_blocks(env, capacities):
+    blocks = []
+    for i, capacity in enumerate(capacities):
+        block = IndependentBlock(str(i), f'공정{i + 1}', [], max_capacity=capacity)
+        block.env = env
+        blocks.append(block)
+    return blocks
+
+
+def dispatch_blocks(rule):
+    return [
+        {'id': '1', 'name': '투입', 'maxCapacity': 1,
+         'script': f'force execution\ncreate product\ngo OUT to any(공정1.IN, 공정2.IN) by {rule} wait'},
+        {'id': '2', 'name': '공정1', 'maxCapacity': 1, 'script': 'delay 3\ngo OUT to 배출.IN(0)\nexecute 배출'},
+        {'id': '3', 'name': '공정2', 'maxCapacity': 1, 'script': 'delay 5\ngo OUT to 배출.IN(0)\nexecute 배출'},
+        {'id': '4', 'name': '배출', 'maxCapacity': 10, 'script': 'dispose product'},
+    ]
+
+
+class TestDispatch:
+    """Test dispatch rules and event-driven waits"""
+    
+    def test_parse_any(self):
+        program = compile_script(['go OUT to any(공정1.IN, 공정2.IN)(0,2) by shortest_queue wait priority 1'])
+        go = program.instructions[0].operand
+        assert program.instructions[0].opcode == OP_GO
+        assert go.candidates == ('공정1', '공정2') and go.dispatch == 'shortest_queue'
+        assert go.blocking and go.priority == 1 and go.delay is not None
+        # 알 수 없는 규칙은 파싱 실패
+        assert compile_script(['go OUT to any(공정1.IN) by fastest']).instructions[0].opcode != OP_GO
+    
+    def test_rules(self):
+        env = simpy.Environment()
+        blocks = make_blocks(env, [1, 3, 3])
+        first = DispatchGroup(blocks, 'first_free')
+        shortest = DispatchGroup(blocks, 'shortest_queue')
+        round_robin = DispatchGroup(blocks, 'round_robin')
+        assert first.select(env.now) is blocks[0]
+        blocks[0].add_entity(SimpleEntity())
+        blocks[1].add_entity(SimpleEntity())
+        assert first.select(env.now) is blocks[1]
+        assert shortest.select(env.now) is blocks[2]
+        assert [round_robin.select(env.now) for _ in range(3)] == [blocks[1], blocks[2], blocks[1]]
+        blocks[0].remove_entity(blocks[0].entities_in_block[0])
+        assert first.select(env.now) is blocks[0]
+        assert shortest.select(env.now) is blocks[0]
+    
+    def test_least_utilized(self):
+        env = simpy.Environment()
+        blocks = make_blocks(env, [1, 1])
+        group = DispatchGroup(blocks, 'least_utilized')
+        entity = SimpleEntity()
+        blocks[0].add_entity(entity)
+        env.run(until=10)
+        blocks[0].remove_entity(entity)
+        env.run(until=12)
+        assert group.select(env.now) is blocks[1]
+        assert group.get_statistics(env.now)['utilization'] == {'공정1': pytest.approx(10 / 12), '공정2': 0.0}
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_wait_for_any_candidate(self, kernel, make_engine):
+        """The source blocks until either station frees up, without retries or warnings"""
+        engine = make_engine(dispatch_blocks('first_free'), kernel)
+        engine.run_until(until=60)
+        source = engine.blocks['1']
+        assert source.warnings == [] and source.blocked_count > 0
+        assert engine.blocks['4'].total_processed >= 28
+        group = next(iter(engine.dispatch_groups.values()))
+        assert set(group.get_statistics(engine.env.now)['utilization']) == {'공정1', '공정2'}
+    
+    def test_admit_reserves_target_slot(self):
+        """Removing the entity from its source must not let a re-entrant dispatch take the target's free slot"""
+        env = simpy.Environment()
+        target, station, feeder = make_blocks(env, [1, 1, 1])
+        group = DispatchGroup([target, station], 'first_free')
+        target.add_entity(SimpleEntity())
+        moving, dispatched = SimpleEntity(), SimpleEntity()
+        station.add_entity(moving)
+        feeder.add_entity(dispatched)
+        # station -> target (go ... wait), feeder -> any(target, station) (go any ... wait)
+        moving_wakeup, dispatched_wakeup = env.event(), env.event()
+        target.wait_for_entry(env, moving, station, moving_wakeup)
+        group.wait_for_entry(env, dispatched, feeder, dispatched_wakeup)
+        
+        # Freeing the target admits the station's entity; its departure frees the station for the dispatcher
+        target.remove_entity(target.entities_in_block[0])
+        assert target.entities_in_block == [moving] and station.entities_in_block == [dispatched]
+        assert feeder.entities_in_block == [] and target.reserved_slots == 0
+        assert moving_wakeup.value is True and dispatched_wakeup.value is True
@@ -0,0 +1,73 @@
+"""
+Tests for instruction fusion (zero-time commands without scheduler yields)
+"""
+
+import simpy
+
+from app.simple_script_compiler import OP_YIELD, compile_script
+
+
+def count_events(engine, until=300):
+    env = engine.env
+    events = 0
+    while env.peek() <= until:
+        env.step()
+        events += 1
+    return events
+
+
+def run_script(executor, env, script):
+    return env.process(executor.execute_program(executor.compile_program(script.split('\n')), None, env))
+
+
+class TestInstructionFusion:
+    """Test fused execution against the default yielding executor"""
+    
+    def test_same_result_fewer_events(self, make_engine, line_blocks):
+        """Fused runs reach the same state with fewer scheduler events"""
+        engine = make_engine(line_blocks, instruction_fusion=False)
+        fused_engine = make_engine(line_blocks, instruction_fusion=True)
+        events, fused_events = count_events(engine), count_events(fused_engine)
+        assert fused_engine.blocks['2'].total_processed == engine.blocks['2'].total_processed > 0
+        assert fused_events < events
+    
+    def test_instant_commands_run_in_one_turn(self, make_executor):
+        """Zero-time commands finish without giving other processes a turn"""
+        executor, signal_manager, integer_manager = make_executor()
+        executor.fuse_instructions = True
+        integer_manager.initialize_variables({'n': 0})
+        env = simpy.Environment()
+        
+        seen = []
+        
+        def observer(env):
+            # Starts right after the script's first turn
+            seen.append(integer_manager.get_variable('n'))
+            yield env.timeout(0)
+        
+        run_script(executor, env, 'int n += 1\nint n += 1\nyield\nint n += 1')
+        env.process(observer(env))
+        env.run()
+        assert seen == [2]
+        assert integer_manager.get_variable('n') == 3
+    
+    def test_backward_jump_yields(self, make_executor):
+        """A zero-time loop yields on every iteration so other processes still run"""
+        executor, signal_manager, integer_manager = make_executor()
+        executor.fuse_instructions = True
+        signal_manager.initialize_signals({'stop': False})
+        env = simpy.Environment()
+        
+        def stopper(env):
+            yield env.timeout(0)
+            signal_manager.set_signal('stop', True)
+        
+        loop = run_script(executor, env, 'if stop = false\n  jump to 1')
+        env.process(stopper(env))
+        env.run(until=1)
+        assert not loop.is_alive
+    
+    def test_yield_command(self):
+        """'yield' compiles to an explicit yield point"""
+        program = compile_script(['yield'])
+        assert program.instructions[0].opcode == OP_YIELD
@@ -0,0 +1,104 @@
+"""
+Tests for the content-addressed compiled-model cache used by /simulation/setup and /step
+"""
+
+import asyncio
+import copy
+
+from app.model_cache import LRUCache, config_fingerprint, model_cache
+from app.routes.simulation import compile_model, setup_simulation_endpoint, step_simulation_endpoint
+from app.session_registry import SimulationSession
+from app.simple_simulation_engine import SimpleSimulationEngine
+
+LAYOUT = {
+    'blocks': [
+        {'id': 1, 'name': '투입', 'actions': [], 'capacity': 1,
+         'script': 'force execution\ndelay 3-7\ncreate product\nif ready = true\n    delay 1\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+        {'id': 2, 'name': '배출', 'actions': [], 'capacity': 5, 'script': 'delay 4\ndispose product'},
+    ],
+    'connections': [],
+    'globalSignals': [{'name': 'ready', 'type': 'boolean', 'value': True}],
+    'seed': 7,
+}
+
+
+class TestLRUCache:
+    """Test the bounded cache and the config fingerprint"""
+    
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert 'b' not in cache and len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.info() == {'entries': 2, 'max_entries': 2, 'hits': 1, 'misses': 1}
+    
+    def test_zero_size_disables(self):
+        cache = LRUCache(max_entries=0)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+    
+    def test_fingerprint_ignores_key_order(self):
+        reordered = {key: LAYOUT[key] for key in reversed(list(LAYOUT))}
+        assert config_fingerprint(reordered) == config_fingerprint(LAYOUT)
+        assert config_fingerprint({**LAYOUT, 'seed': 8}) != config_fingerprint(LAYOUT)
+
+
+class TestCompiledModel:
+    """Test reuse of validated layouts and compiled scripts"""
+    
+    def setup_method(self):
+        model_cache.clear()
+    
+    def test_same_layout_is_validated_once(self):
+        original = copy.deepcopy(LAYOUT)
+        model, cached = compile_model(LAYOUT)
+        assert not cached
+        assert model.simple_config['blocks'][0]['id'] == '1'
+        assert model.initial_signals == {'ready': True}
+        assert LAYOUT == original  # the request body is not modified
+        
+        again, cached = compile_model(copy.deepcopy(LAYOUT))
+        assert cached and again is model
+        _, cached = compile_model({**LAYOUT, 'seed': 8})
+        assert not cached
+    
+    def test_engine_reuses_compiled_scripts(self, random_line):
+        """Re-setup binds the cached programs to the same variable store and runs identically"""
+        seeded_line = {**random_line, 'seed': 3}
+        engine = SimpleSimulationEngine()
+        engine.setup_simulation(seeded_line)
+        programs = {block_id: block.program for block_id, block in engine.blocks.items()}
+        first = engine.run_until(until=500)
+        
+        engine.setup_simulation(seeded_line)
+        assert all(engine.blocks[block_id].program is program for block_id, program in programs.items())
+        second = engine.run_until(until=500)
+        assert second['total_entities_processed'] == first['total_entities_processed']
+        assert engine.programs.hits == len(programs)
+        
+        # Programs are bound to one engine's variable store and are not shared
+        other = SimpleSimulationEngine()
+        other.setup_simulation(seeded_line)
+        assert other.blocks['1'].program is not programs['1']
+    
+    def test_cached_setup_matches_fresh_setup(self):
+        session = SimulationSession('model-cache-test')
+        try:
+            first = asyncio.run(step_simulation_endpoint(copy.deepcopy(LAYOUT), session=session))
+            for _ in range(20):
+                asyncio.run(step_simulation_endpoint(session=session))
+            expected = session.adapter.engine.env.now, session.adapter.engine.blocks['2'].total_processed
+            
+            response = asyncio.run(setup_simulation_endpoint(copy.deepcopy(LAYOUT), session=session))
+            assert response['model_cached'] and response['initial_signals'] == {'ready': True}
+            again = asyncio.run(step_simulation_endpoint(copy.deepcopy(LAYOUT), session=session))
+            assert again.time == first.time
+            for _ in range(20):
+                asyncio.run(step_simulation_endpoint(session=session))
+            assert (session.adapter.engine.env.now, session.adapter.engine.blocks['2'].total_processed) == expected
+            assert model_cache.hits == 2
+        finally:
+            session.close()
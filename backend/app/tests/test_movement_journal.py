@@ -0,0 +1,41 @@
+"""
+Tests for the entity movement journal
+"""
+
+from app.movement_journal import MovementJournal
+
+
+class TestMovementJournal:
+    """Test journal bookkeeping and step boundary detection"""
+    
+    def test_net_change(self):
+        """Leaving and re-entering the same block is not a change; dropped history counts as one"""
+        journal = MovementJournal(max_entries=4)
+        start = journal.seq
+        journal.record('1', 'e1', -1)
+        journal.record('1', 'e1', 1)
+        assert journal.seq == start + 2
+        assert not journal.has_net_change_since(start)
+        journal.record('2', 'e1', 1)
+        assert journal.has_net_change_since(start)
+        
+        for _ in range(4):
+            journal.record('3', 'e2', 1)
+        assert len(journal.entries) <= 4
+        assert journal.has_net_change_since(start)
+        journal.truncate()
+        assert journal.since(journal.seq) == []
+    
+    def test_engine_records_moves(self, make_adapter):
+        """Every add/remove in the engine lands in the journal and ends a default step"""
+        adapter = make_adapter()
+        engine = adapter.engine
+        result = engine.step_simulation()
+        assert result['movement_detected']
+        assert engine.journal.seq > 0
+        assert engine.journal.entries[0][0] == '1' and engine.journal.entries[0][2] == 1
+        
+        engine.run_until(until=100)
+        disposed = engine.blocks['2'].total_processed
+        # create + move out + move in + dispose per entity
+        assert engine.journal.seq >= 3 * disposed
@@ -0,0 +1,55 @@
+"""
+Tests for the native event kernel
+"""
+
+import pytest
+
+from app.native_kernel import NativeKernel
+
+
+class TestNativeKernel:
+    """Test the heap kernel against the SimPy kernel"""
+    
+    def test_event_order(self):
+        """Events run in (time, insertion) order; run(until) leaves events at until"""
+        kernel = NativeKernel()
+        seen = []
+        kernel.schedule(2, seen.append, 'b')
+        kernel.schedule(1, seen.append, 'a')
+        kernel.schedule(2, seen.append, 'c')
+        kernel.run(until=2)
+        assert seen == ['a'] and kernel.now == 2 and kernel.peek() == 2
+        kernel.run()
+        assert seen == ['a', 'b', 'c']
+    
+    def test_matches_simpy_kernel(self, make_engine, line_blocks):
+        """Same throughput and end state as the SimPy kernel, with fewer events"""
+        simpy_engine = make_engine(line_blocks, 'simpy', seed=7)
+        native_engine = make_engine(line_blocks, 'native', seed=7)
+        simpy_result = simpy_engine.run_until(until=1000)
+        native_result = native_engine.run_until(until=1000)
+        assert native_result['total_entities_processed'] == simpy_result['total_entities_processed'] > 0
+        assert native_result['events_processed'] < simpy_result['events_processed']
+        assert native_engine.env.now == simpy_engine.env.now == 1000
+        assert ([len(b.entities_in_block) for b in native_engine.blocks.values()]
+                == [len(b.entities_in_block) for b in simpy_engine.blocks.values()])
+    
+    def test_step_modes_and_waits(self, make_engine):
+        """Default steps work on the native kernel and waits wake on signal changes"""
+        blocks = [
+            {'id': '1', 'name': '투입', 'maxCapacity': 1,
+             'script': 'force execution\ncreate product\nready = true\nwait ready = false\ngo OUT to 공정.IN(0,2)'},
+            {'id': '2', 'name': '공정', 'maxCapacity': 1,
+             'script': 'force execution\nwait ready = true\ndelay 3\nready = false\nint done += 1'},
+        ]
+        engine = make_engine(blocks, 'native', seed=7)
+        engine.integer_manager.initialize_variables({'done': 0})
+        result = engine.step_simulation()
+        assert result['movement_detected']
+        engine.run_until(until=10)
+        assert engine.blocks['2'].entities_in_block
+        assert engine.integer_manager.get_variable('done') >= 1
+    
+    def test_unknown_kernel(self, make_engine, line_blocks):
+        with pytest.raises(ValueError):
+            make_engine(line_blocks, 'threads')
@@ -0,0 +1,129 @@
+"""
+Tests for the parameter sweep
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import SweepRequest
+from app.parameter_sweep import build_design, apply_variant, prepare_sweep, iter_sweep
+from app.routes.simulation import run_sweep_endpoint
+
+BASE_CONFIG = {
+    'blocks': [
+        {'id': '1', 'name': '투입', 'maxCapacity': 1,
+         'script': 'force execution\ndelay 5\ncreate product\ngo OUT to 배출.IN(0,1)\nexecute 배출',
+         'actions': [{'type': 'script', 'name': '스크립트 실행',
+                      'parameters': {'script': 'force execution\ndelay 5\ncreate product\ngo OUT to 배출.IN(0,1)\nexecute 배출'}}]},
+        {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': 'dispose product'},
+    ],
+    'connections': [],
+    'globalSignals': [{'name': 'limit', 'type': 'integer', 'value': 0},
+                      {'name': 'ready', 'type': 'boolean', 'value': False}],
+}
+
+
+def prepare(config):
+    return {'blocks': config['blocks'], 'connections': [], 'globalSignals': config['globalSignals']}
+
+
+class TestDesign:
+    """Test variant generation"""
+    
+    def test_grid_is_full_factorial(self):
+        """A grid design enumerates every combination"""
+        rows = build_design([
+            {'kind': 'capacity', 'block': '배출', 'values': [1, 2]},
+            {'kind': 'delay', 'block': '투입', 'values': [4, 6, 8]},
+        ])
+        assert len(rows) == 6
+        assert rows[0] == {'capacity:배출': 1, 'delay:투입[0]': 4}
+    
+    def test_latin_hypercube_strata(self):
+        """Each factor uses every stratum exactly once"""
+        rows = build_design([{'kind': 'delay', 'block': '투입', 'low': 0, 'high': 10},
+                             {'kind': 'capacity', 'block': '배출', 'low': 1, 'high': 5}], 'lhs', samples=5, seed=3)
+        strata = sorted(int(row['delay:투입[0]'] // 2) for row in rows)
+        assert strata == [0, 1, 2, 3, 4]
+        assert all(isinstance(row['capacity:배출'], int) for row in rows)
+        assert rows == build_design([{'kind': 'delay', 'block': '투입', 'low': 0, 'high': 10},
+                                     {'kind': 'capacity', 'block': '배출', 'low': 1, 'high': 5}], 'lhs', samples=5, seed=3)
+    
+    def test_apply_variant(self):
+        """Variants rewrite capacities, script delays and global signals without touching the base"""
+        factors = [
+            {'kind': 'capacity', 'block': '배출', 'values': [3]},
+            {'kind': 'delay', 'block': '투입', 'values': ['2-4']},
+            {'kind': 'go_delay', 'block': '투입', 'values': [7]},
+            {'kind': 'signal', 'name': 'limit', 'values': [5]},
+        ]
+        config = apply_variant(BASE_CONFIG, factors, build_design(factors)[0])
+        source = config['blocks'][0]
+        assert config['blocks'][1]['maxCapacity'] == config['blocks'][1]['capacity'] == 3
+        assert source['script'] == 'force execution\ndelay 2-4\ncreate product\ngo OUT to 배출.IN(0,7)\nexecute 배출'
+        assert source['actions'][0]['parameters']['script'] == source['script']
+        assert config['globalSignals'][0]['value'] == 5
+        assert BASE_CONFIG['blocks'][0]['script'].startswith('force execution\ndelay 5')
+    
+    def test_invalid_factors(self):
+        """Unknown blocks, commands and kinds are rejected before running"""
+        with pytest.raises(ValueError):
+            prepare_sweep(BASE_CONFIG, [{'kind': 'capacity', 'block': '없음', 'values': [1]}], prepare)
+        with pytest.raises(ValueError):
+            prepare_sweep(BASE_CONFIG, [{'kind': 'delay', 'block': '배출', 'values': [1]}], prepare)
+        with pytest.raises(ValueError):
+            build_design([{'kind': 'speed', 'block': '투입', 'values': [1]}])
+    
+    def test_signal_levels_follow_signal_type(self):
+        """Boolean signals take 0/1 or true/false levels as bools, integer variables take integers"""
+        factors = [{'kind': 'signal', 'name': 'ready', 'values': [0, 'true']},
+                   {'kind': 'signal', 'name': 'limit', 'values': [2.0]}]
+        variants = prepare_sweep(BASE_CONFIG, factors, prepare)
+        assert [values for values, _ in variants] == [{'signal:ready': False, 'signal:limit': 2},
+                                                      {'signal:ready': True, 'signal:limit': 2}]
+        signals = variants[1][1]['globalSignals']
+        assert signals[0]['value'] == 2 and signals[1]['value'] is True
+        
+        sampled = prepare_sweep(BASE_CONFIG, [{'kind': 'signal', 'name': 'ready', 'low': 0, 'high': 1}], prepare,
+                                'lhs', samples=4)
+        assert {values['signal:ready'] for values, _ in sampled} == {False, True}
+    
+    @pytest.mark.parametrize('factor', [
+        {'kind': 'signal', 'name': 'ready', 'values': [0, 5]},
+        {'kind': 'signal', 'name': 'ready', 'values': ['yes']},
+        {'kind': 'signal', 'name': 'ready', 'low': 0, 'high': 10},
+        {'kind': 'signal', 'name': 'limit', 'values': [1.5]},
+        {'kind': 'signal', 'name': 'limit', 'values': [True]},
+        {'kind': 'signal', 'name': 'missing', 'values': [1]},
+    ])
+    def test_mismatched_signal_levels(self, factor):
+        """Levels that do not fit the signal type are rejected before any variant runs"""
+        with pytest.raises(ValueError):
+            prepare_sweep(BASE_CONFIG, [factor], prepare, 'lhs' if 'low' in factor else 'grid')
+
+
+class TestSweepRun:
+    """Test running variants in worker processes"""
+    
+    def test_rows_stream_per_variant(self):
+        """Rows carry the variant parameters and KPIs, framed by header and summary"""
+        variants = prepare_sweep(BASE_CONFIG, [{'kind': 'delay', 'block': '투입', 'values': [5, 10]}], prepare)
+        rows = list(iter_sweep(variants, [0], until=600, max_workers=2))
+        assert rows[0]['type'] == 'header' and rows[0]['variants'] == 2
+        assert rows[-1]['type'] == 'summary' and rows[-1]['variants'] == 2
+        
+        results = {row['parameters']['delay:투입[0]']: row['kpis'] for row in rows[1:-1]}
+        assert results[5]['total_entities_processed'] > results[10]['total_entities_processed']
+    
+    def test_seeds_are_required(self):
+        """An empty seed list is rejected before any row is streamed"""
+        variants = prepare_sweep(BASE_CONFIG, [{'kind': 'delay', 'block': '투입', 'values': [5]}], prepare)
+        with pytest.raises(ValueError):
+            iter_sweep(variants, [], until=600)
+        
+        config = {**BASE_CONFIG, 'blocks': [{**block, 'actions': []} for block in BASE_CONFIG['blocks']]}
+        request = SweepRequest(config=config, factors=[{'kind': 'delay', 'block': '투입', 'values': [5]}], until=600)
+        assert run_sweep_endpoint(request).media_type == 'application/x-ndjson'
+        with pytest.raises(HTTPException) as error:
+            run_sweep_endpoint(request.model_copy(update={'seeds': []}))
+        assert error.value.status_code == 400 and 'seed' in error.value.detail
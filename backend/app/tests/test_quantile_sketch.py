@@ -0,0 +1,88 @@
+"""
+Tests for streaming quantile sketches (lead time and waiting time distributions)
+"""
+
+import random
+
+import pytest
+
+from app.quantile_sketch import QuantileSketch, merge_sketches
+from app.replication_runner import merge_distributions, run_replication, run_replications
+
+
+def exact_quantile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+class TestQuantileSketch:
+    """Test accuracy, fixed memory and mergeability"""
+    
+    def test_relative_accuracy(self):
+        rng = random.Random(5)
+        values = [rng.lognormvariate(3, 1) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.9, 0.99):
+            assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.011)
+        summary = sketch.summary()
+        assert summary['count'] == 20000 and summary['min'] == min(values) and summary['max'] == max(values)
+        assert set(summary) >= {'p50', 'p90', 'p99', 'mean'}
+    
+    def test_zero_values_and_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None and sketch.summary()['p99'] is None
+        for value in [0.0] * 6 + [10.0] * 4:
+            sketch.add(value)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(0.9) == pytest.approx(10.0, rel=0.01)
+    
+    def test_memory_is_bounded(self):
+        """Collapsing the lowest bins keeps the size fixed and the upper quantiles accurate"""
+        sketch = QuantileSketch(relative_accuracy=0.01, max_bins=64)
+        values = [1.001 ** i for i in range(50000)]
+        for value in values:
+            sketch.add(value)
+        assert len(sketch.bins) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.011)
+    
+    def test_merge_matches_single_stream(self):
+        rng = random.Random(9)
+        values = [rng.expovariate(0.1) for _ in range(6000)]
+        whole, parts = QuantileSketch(), [QuantileSketch() for _ in range(3)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 3].add(value)
+        merged = merge_sketches([parts[0], parts[1].to_dict(), QuantileSketch.from_dict(parts[2].to_dict())])
+        assert merged.bins == whole.bins and merged.count == whole.count
+        assert merged.summary() == pytest.approx(whole.summary())
+        with pytest.raises(ValueError):
+            whole.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+class TestTimeDistributions:
+    """Test lead time and waiting time collection in the engine"""
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_engine_distributions(self, kernel, make_engine, blocking_blocks):
+        """Each entity waits 4s for the station and spends 4s in it"""
+        engine = make_engine(blocking_blocks, kernel, seed=3)
+        result = engine.run_until(until=100)
+        lead_time, waiting_time = result['time_distributions']['lead_time'], result['time_distributions']['waiting_time']
+        assert lead_time['count'] == engine.blocks['2'].total_processed
+        assert lead_time['p90'] == pytest.approx(8.0, rel=0.01)
+        assert waiting_time['count'] == engine.blocks['1'].blocked_count
+        assert waiting_time['p50'] == pytest.approx(4.0, rel=0.01)
+        station = result['block_statistics']['2']['cycle_time_quantiles']
+        assert station['p99'] == pytest.approx(4.0, rel=0.01)
+    
+    def test_replications_merge_sketches(self, random_line):
+        """Per-replication sketches are merged into pooled quantiles and dropped from the rows"""
+        result = run_replications(random_line, [1, 2, 3], until=600, max_workers=2)
+        assert all('sketches' not in r for r in result['replications'])
+        pooled = merge_distributions([run_replication(random_line, seed, until=600)['sketches'] for seed in (1, 2, 3)])
+        assert result['distributions'] == pooled
+        assert pooled['lead_time']['count'] == sum(r['total_entities_processed'] for r in result['replications'])
+        assert set(pooled['blocks']) == {'1', '2'}
+        assert merge_distributions([{}, {}]) == {}
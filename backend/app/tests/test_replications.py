@@ -0,0 +1,42 @@
+"""
+Tests for seeded replications
+"""
+
+from app.replication_runner import run_replication, run_replications, summarize, t_critical
+
+
+class TestReplications:
+    """Test independent seeded runs"""
+    
+    def test_same_seed_is_reproducible(self, random_line):
+        """A seed fully determines the run; different seeds differ"""
+        first = run_replication(random_line, 7, until=600)
+        second = run_replication(random_line, 7, until=600)
+        other = run_replication(random_line, 8, until=600)
+        assert first['events_processed'] == second['events_processed']
+        assert first['total_entities_processed'] == second['total_entities_processed']
+        assert first['variables']['done'] == first['total_entities_processed']
+        assert (first['events_processed'], first['total_entities_processed']) != (other['events_processed'], other['total_entities_processed'])
+    
+    def test_process_pool_summary(self, random_line):
+        """Replications run in worker processes and are summarized with a confidence interval"""
+        result = run_replications(random_line, [1, 2, 3, 4], until=600, max_workers=2)
+        assert [r['seed'] for r in result['replications']] == [1, 2, 3, 4]
+        in_process = run_replication(random_line, 1, until=600)
+        assert result['replications'][0]['events_processed'] == in_process['events_processed']
+        
+        summary = result['summary']['total_entities_processed']
+        assert summary['n'] == 4
+        assert summary['ci_low'] <= summary['mean'] <= summary['ci_high']
+        assert 'var.done' in result['summary']
+    
+    def test_summary_statistics(self):
+        """t critical values and interval half width"""
+        assert round(t_critical(0.95, 1), 3) == 12.706
+        assert round(t_critical(0.95, 2), 3) == 4.303
+        assert round(t_critical(0.95, 9), 3) == 2.262
+        
+        summary = summarize([1.0, 2.0, 3.0])
+        assert summary['mean'] == 2.0
+        assert round(summary['half_width'], 3) == round(4.303 / 3 ** 0.5, 3)
+        assert summarize([5.0])['half_width'] == 0.0
@@ -0,0 +1,54 @@
+"""
+Tests for the headless run-until mode
+"""
+
+from app.models import RunUntilRequest
+
+
+class TestRunUntil:
+    """Test fast-forward runs without per-step snapshots"""
+    
+    def test_run_to_time(self, make_adapter):
+        """Runs exactly to the requested time and reports compact KPIs"""
+        adapter = make_adapter()
+        result = adapter.engine.run_until(until=3600)
+        assert result['stop_reason'] == 'time'
+        assert adapter.engine.env.now == 3600
+        assert result['total_entities_processed'] > 500
+        assert 'block_states' not in result
+        assert abs(result['throughput_per_hour'] - result['total_entities_processed']) < 1
+    
+    def test_run_to_disposed_count(self, make_adapter):
+        """Stops as soon as the disposal target is reached"""
+        adapter = make_adapter()
+        result = adapter.engine.run_until(entities_disposed=20)
+        assert result['stop_reason'] == 'entities_disposed'
+        assert result['total_entities_processed'] == 20
+    
+    def test_continues_from_current_time(self, make_adapter):
+        """A second call continues where the first stopped"""
+        adapter = make_adapter()
+        adapter.engine.run_until(until=100)
+        result = adapter.engine.run_until(until=200)
+        assert result['start_time'] == 100
+        assert result['simulation_time'] == 200
+    
+    def test_no_events_and_max_events(self, make_adapter):
+        """An empty model stops immediately; max_events bounds the run"""
+        adapter = make_adapter([{'id': '1', 'name': '공정1', 'maxCapacity': 1, 'script': '// 대기'}])
+        assert adapter.engine.run_until(entities_disposed=1)['stop_reason'] == 'no_events'
+        
+        adapter = make_adapter()
+        result = adapter.engine.run_until(entities_disposed=1000, max_events=50)
+        assert (result['stop_reason'], result['events_processed']) == ('max_events', 50)
+    
+    def test_adapter_snapshot(self, make_adapter):
+        """The adapter materializes one full snapshot at the end only when asked"""
+        adapter = make_adapter()
+        result = adapter.run_until(RunUntilRequest(until=60))
+        assert result.final_time == 60
+        assert result.final_state is not None
+        assert result.final_state.entities_processed_total == result.total_entities_processed
+        
+        result = adapter.run_until(RunUntilRequest(until=120, include_snapshot=False))
+        assert result.final_state is None
@@ -0,0 +1,119 @@
+"""
+Tests for the ahead-of-time script compiler
+"""
+
+import simpy
+from app.simple_block import IndependentBlock
+from app.simple_entity import SimpleEntity
+from app.simple_signal_manager import SimpleSignalManager
+from app.core.integer_variable_manager import IntegerVariableManager
+from app.core.unified_variable_accessor import UnifiedVariableAccessor
+from app.simple_script_compiler import (
+    compile_script, compile_delay, OP_NOP, OP_IF, OP_ELIF, OP_ELSE, OP_SIGNAL_SET, OP_UNKNOWN
+)
+
+
+def make_block(script_lines, signals=None, integers=None):
+    signal_manager = SimpleSignalManager()
+    signal_manager.initialize_signals(signals or {})
+    integer_manager = IntegerVariableManager()
+    integer_manager.initialize_variables(integers or {})
+    accessor = UnifiedVariableAccessor(signal_manager, integer_manager)
+    block = IndependentBlock("1", "공정1", script_lines, signal_manager, 10, integer_manager, accessor)
+    return block, signal_manager, integer_manager
+
+
+def run_block(block, entity=None):
+    env = simpy.Environment()
+    env.process(block.process_entity(env, entity))
+    env.run()
+    return env
+
+
+class TestCompileScript:
+    """Test the compiled instruction list"""
+    
+    def test_opcodes_and_operands(self):
+        """Lines are parsed once into opcodes with pre-parsed operands"""
+        program = compile_script(["// comment", "ready = true", "go to 공정2.L,10", "delay 3-5"])
+        opcodes = [instruction.opcode for instruction in program.instructions]
+        assert opcodes[:3] == [OP_NOP, OP_SIGNAL_SET, OP_UNKNOWN]
+        assert program.instructions[1].operand == ("ready", True)
+        assert (program.instructions[3].operand.low, program.instructions[3].operand.high) == (3.0, 5.0)
+    
+    def test_skip_targets(self):
+        """if/elif/else carry the line to resume at when their branch is not taken"""
+        program = compile_script([
+            "if a = true",
+            "\tx = true",
+            "elif b = true",
+            "\tx = false",
+            "else",
+            "\ty = true",
+            "z = true",
+        ])
+        instructions = program.instructions
+        assert [instructions[i].opcode for i in (0, 2, 4)] == [OP_IF, OP_ELIF, OP_ELSE]
+        assert (instructions[0].skip_target, instructions[0].ends_if_block) == (2, False)
+        assert (instructions[2].skip_target, instructions[2].ends_if_block) == (4, False)
+        assert (instructions[4].skip_target, instructions[4].ends_if_block) == (6, True)
+    
+    def test_delay_spec(self):
+        """Constant, range and malformed delays"""
+        assert (compile_delay("2.5").low, compile_delay("2.5").high) == (2.5, None)
+        assert (compile_delay("1-3").low, compile_delay("1-3").high) == (1.0, 3.0)
+        assert compile_delay("abc").low is None
+    
+    def test_block_flags(self):
+        """force execution and dispose are detected at compile time"""
+        program = compile_script(["force execution", "dispose product"])
+        assert program.force_execution
+        assert program.has_dispose
+
+
+class TestCompiledExecution:
+    """Test execution of compiled programs"""
+    
+    def test_if_elif_else_chain(self):
+        """Only the first matching branch runs"""
+        script = [
+            "if count > 5",
+            "\tresult = true",
+            "elif count = 3",
+            "\tint hits += 1",
+            "else",
+            "\tint misses += 1",
+            "int after += 1",
+        ]
+        block, signal_manager, integer_manager = make_block(script, {"result": False}, {"count": 3, "hits": 0, "misses": 0, "after": 0})
+        run_block(block)
+        assert signal_manager.get_signal("result") is False
+        assert integer_manager.get_variable("hits") == 1
+        assert integer_manager.get_variable("misses") == 0
+        assert integer_manager.get_variable("after") == 1
+    
+    def test_jump_and_product_types(self):
+        """jump loops back and product type commands update the entity"""
+        script = [
+            "int loops += 1",
+            "product type += done(green)",
+            "if loops < 3",
+            "\tjump to 1",
+            "product type -= done",
+        ]
+        block, _, integer_manager = make_block(script, {}, {"loops": 0})
+        entity = SimpleEntity()
+        block.add_entity(entity)
+        run_block(block, entity)
+        assert integer_manager.get_variable("loops") == 3
+        assert entity.color == "green"
+        assert "done" not in entity.custom_attributes
+    
+    def test_execute_script_matches_block_program(self):
+        """The string entry point compiles and runs the same program"""
+        block, signal_manager, _ = make_block(["delay 2", "ready = true"], {"ready": False})
+        env = simpy.Environment()
+        env.process(block.script_executor.execute_script("delay 2\nready = true", None, env, block))
+        env.run()
+        assert env.now == 2
+        assert signal_manager.get_signal("ready") is True
@@ -0,0 +1,194 @@
+"""
+Tests for the multi-session registry
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes import debug as debug_routes
+from app.routes import simulation as simulation_routes
+from app.session_actor import SessionActor
+from app.session_registry import DEFAULT_SESSION_ID, SessionRegistry, SessionLimitError
+
+
+def setup_session(session, blocks):
+    def setup(adapter):
+        adapter.engine.setup_simulation({'blocks': blocks, 'connections': []})
+        adapter.engine.set_debug_manager(adapter.global_debug_manager)
+    session.run_sync(setup, session.adapter)
+    return session.adapter
+
+
+class TestSessionRegistry:
+    """Test per-session engines, caps and eviction"""
+    
+    def test_sessions_are_isolated(self, line_blocks):
+        """Sessions with the same block ids keep separate engines and script state"""
+        registry = SessionRegistry(max_sessions=4)
+        first = setup_session(registry.get('a'), line_blocks)
+        second = setup_session(registry.get('b'), line_blocks)
+        assert registry.get('a').adapter is first
+        
+        first.engine.run_until(until=100)
+        second.engine.run_until(until=30)
+        assert first.engine.env.now == 100 and second.engine.env.now == 30
+        assert first.engine.script_state is not second.engine.script_state
+        assert first.engine.blocks['1'].script_state is first.engine.script_state
+        
+        first.global_debug_manager.set_breakpoint('2', 1)
+        assert not second.global_debug_manager.has_breakpoints()
+    
+    def test_lru_eviction_at_cap(self):
+        """At the cap the least recently used idle session is evicted"""
+        registry = SessionRegistry(max_sessions=2)
+        registry.get('a')
+        registry.get('b')
+        registry.get('a')
+        registry.get('c')
+        assert 'b' not in registry
+        assert 'a' in registry and 'c' in registry
+    
+    def test_busy_sessions_are_not_evicted(self):
+        """A session with a running command survives; when every session is busy the cap is enforced"""
+        registry = SessionRegistry(max_sessions=1)
+        release = threading.Event()
+        running = registry.get('a').actor.submit(release.wait)
+        with pytest.raises(SessionLimitError):
+            registry.get('b')
+        release.set()
+        running.result()
+        registry.get('b')
+        assert 'a' not in registry
+    
+    def test_idle_ttl(self):
+        """Sessions idle past the TTL are dropped on the next lookup"""
+        registry = SessionRegistry(max_sessions=4, idle_ttl=60)
+        registry.get('a').last_access -= 120
+        registry.get('b')
+        assert 'a' not in registry
+        assert [info['session_id'] for info in registry.list_sessions()] == ['b']
+        
+        with pytest.raises(KeyError):
+            registry.get('missing', create=False)
+    
+    def test_leased_session_is_not_evicted(self):
+        """A session handed to a request stays alive until the request releases it"""
+        registry = SessionRegistry(max_sessions=1)
+        session = registry.acquire('a')
+        with pytest.raises(SessionLimitError):
+            registry.get('b')
+        assert session.run_sync(lambda: 'ok') == 'ok'
+        registry.release(session)
+        registry.get('b')
+        assert 'a' not in registry and session.leases == 0
+    
+    def test_default_session_is_pinned(self):
+        """The default session survives LRU eviction and the idle TTL"""
+        registry = SessionRegistry(max_sessions=2, idle_ttl=60)
+        default = registry.get(DEFAULT_SESSION_ID)
+        registry.get('a')
+        registry.get('b')
+        assert DEFAULT_SESSION_ID in registry and 'a' not in registry
+        default.last_access -= 120
+        registry.get('b')
+        assert registry.get(DEFAULT_SESSION_ID) is default
+        registry.acquire('b')
+        with pytest.raises(SessionLimitError):
+            registry.get('c')
+    
+    def test_route_dependency_releases_lease(self, monkeypatch):
+        registry = SessionRegistry(max_sessions=2)
+        monkeypatch.setattr(simulation_routes, 'session_registry', registry)
+        dependency = simulation_routes.get_session(x_session_id='a')
+        session = next(dependency)
+        assert session.leases == 1 and session.busy
+        dependency.close()
+        assert session.leases == 0 and not session.busy
+    
+    def test_unset_session_routes_run_on_actor(self):
+        """Snapshot and execution-mode reads go through the session actor"""
+        registry = SessionRegistry(max_sessions=1)
+        session = registry.get('a')
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(simulation_routes.get_snapshot_endpoint(session=session))
+        assert error.value.status_code == 400
+        assert asyncio.run(simulation_routes.get_execution_mode(session=session)) == {'mode': 'default', 'config': {}}
+        session.close()
+        with pytest.raises(HTTPException):
+            asyncio.run(simulation_routes.get_execution_mode(session=session))
+    
+    def test_debug_routes_run_on_actor(self, line_blocks):
+        """Breakpoint changes and debug control reach the debug manager on the actor thread"""
+        registry = SessionRegistry(max_sessions=1)
+        session = registry.get('a')
+        adapter = setup_session(session, line_blocks)
+        debug_manager = adapter.engine.debug_manager
+        threads = set()
+        set_breakpoint = debug_manager.set_breakpoint
+        debug_manager.set_breakpoint = lambda *args: threads.add(threading.current_thread().name) or set_breakpoint(*args)
+        try:
+            response = asyncio.run(debug_routes.set_breakpoint_frontend(
+                debug_routes.BreakpointData(block_id='1', line_number=2, enabled=True), session=session))
+            assert response['breakpoints'] == {'1': [2]}
+            response = asyncio.run(debug_routes.set_breakpoints_batch({'2': [1, 3]}, session=session))
+            assert response['breakpoints'] == {'2': [1, 3]}
+            assert len(threads) == 1 and threading.current_thread().name not in threads
+            
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(debug_routes.debug_control(debug_routes.DebugControlRequest(action='continue'), session=session))
+            assert error.value.status_code == 400
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(debug_routes.manage_breakpoints(debug_routes.BreakpointRequest(action='set'), session=session))
+            assert error.value.status_code == 400
+        finally:
+            session.close()
+
+
+class TestSessionActor:
+    """Test the single-writer command queue"""
+    
+    def test_commands_run_in_order_on_one_thread(self):
+        """Commands submitted from several threads run one at a time on the actor thread"""
+        actor = SessionActor('t')
+        log, threads, active = [], set(), []
+        
+        def command(i):
+            active.append(i)
+            assert len(active) == 1
+            threads.add(threading.current_thread().name)
+            time.sleep(0.001)
+            log.append(i)
+            active.pop()
+        
+        futures = [actor.submit(command, i) for i in range(20)]
+        for future in futures:
+            future.result()
+        actor.shutdown()
+        assert log == list(range(20))
+        assert len(threads) == 1 and threading.current_thread().name not in threads
+        assert actor.pending == 0
+        with pytest.raises(RuntimeError):
+            actor.submit(command, 0)
+    
+    def test_event_loop_stays_responsive(self, line_blocks):
+        """A long engine run on the actor does not delay other coroutines on the loop"""
+        registry = SessionRegistry(max_sessions=1)
+        session = registry.get('a')
+        adapter = setup_session(session, line_blocks)
+        
+        async def scenario():
+            run = asyncio.create_task(session.run(adapter.engine.run_until, 20000))
+            worst = 0.0
+            while not run.done():
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                worst = max(worst, time.perf_counter() - started)
+            return await run, worst
+        
+        result, worst = asyncio.run(scenario())
+        assert result['stop_reason'] == 'time'
+        assert worst < 0.25
@@ -0,0 +1,107 @@
+"""
+Tests for event-driven wait wakeups
+"""
+
+import simpy
+from app.simple_signal_manager import SimpleSignalManager
+from app.core.integer_variable_manager import IntegerVariableManager
+
+
+class TestSignalSubscriptions:
+    """Test change subscriptions on the variable managers"""
+    
+    def test_signal_change_fires_event(self):
+        """Only an actual value change wakes subscribers"""
+        env = simpy.Environment()
+        signal_manager = SimpleSignalManager()
+        signal_manager.initialize_signals({"ready": False})
+        
+        event = env.event()
+        signal_manager.subscribe("ready", event)
+        signal_manager.set_signal("ready", False)
+        assert not event.triggered
+        
+        signal_manager.set_signal("ready", True)
+        assert event.triggered
+    
+    def test_integer_change_fires_event(self):
+        """Integer operations wake subscribers"""
+        env = simpy.Environment()
+        integer_manager = IntegerVariableManager()
+        integer_manager.initialize_variables({"count": 0})
+        
+        event = env.event()
+        integer_manager.subscribe("count", event)
+        integer_manager.perform_operation("count", "+=", 1)
+        assert event.triggered
+    
+    def test_reset_drops_subscriptions(self):
+        """Subscriptions from a previous run are discarded on reset"""
+        env = simpy.Environment()
+        signal_manager = SimpleSignalManager()
+        event = env.event()
+        signal_manager.subscribe("ready", event)
+        
+        signal_manager.reset()
+        signal_manager.set_signal("ready", True)
+        assert not event.triggered
+
+
+class TestEventDrivenWait:
+    """Test that wait parks on change events instead of polling"""
+    
+    def test_wait_resumes_at_exact_change_time(self, make_executor):
+        """wait resumes at the time of the change without 10ms ticks"""
+        env = simpy.Environment()
+        executor, signal_manager, _ = make_executor()
+        signal_manager.initialize_signals({"ready": False})
+        resumed = []
+        
+        def waiter():
+            yield from executor.execute_wait(env, "ready = true")
+            resumed.append(env.now)
+        
+        def setter():
+            yield env.timeout(2.345)
+            signal_manager.set_signal("ready", True)
+        
+        env.process(waiter())
+        env.process(setter())
+        env.run()
+        
+        assert resumed == [2.345]
+    
+    def test_wait_on_mixed_condition(self, make_executor):
+        """Integer and signal terms both trigger re-evaluation"""
+        env = simpy.Environment()
+        executor, signal_manager, integer_manager = make_executor()
+        signal_manager.initialize_signals({"ready": True})
+        integer_manager.initialize_variables({"count": 0})
+        resumed = []
+        
+        def waiter():
+            yield from executor.execute_wait(env, "ready = true and count >= 3")
+            resumed.append(env.now)
+        
+        def counter():
+            for _ in range(3):
+                yield env.timeout(1)
+                integer_manager.perform_operation("count", "+=", 1)
+        
+        env.process(waiter())
+        env.process(counter())
+        env.run()
+        
+        assert resumed == [3]
+    
+    def test_idle_wait_schedules_no_events(self, make_executor):
+        """A wait that never becomes true leaves the event queue empty"""
+        env = simpy.Environment()
+        executor, signal_manager, _ = make_executor()
+        signal_manager.initialize_signals({"ready": False})
+        
+        env.process(executor.execute_wait(env, "ready = true"))
+        env.run()
+        
+        # run() returns only when no events remain; polling would never stop
+        assert env.now == 0
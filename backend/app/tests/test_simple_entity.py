@@ -0,0 +1,88 @@
+"""
+Tests for the slotted entity and the entity pool
+"""
+
+from app import simple_simulation_engine
+from app.simple_entity import SimpleEntity, EntityPool, default_attributes
+
+
+class TestSimpleEntity:
+    """Test compact entities, sequential ids and pooling"""
+    
+    def test_lazy_containers(self):
+        """Attribute containers are created on first write only"""
+        entity = SimpleEntity()
+        assert not hasattr(entity, '__dict__')
+        assert entity.attribute_mask == 0 and entity._properties is None
+        assert not entity.has_attribute('flip')
+        assert entity.attribute_list() == [] and entity.get_property('k', 1) == 1
+        assert entity._properties is None
+        
+        entity.custom_attributes.add('flip')
+        entity.set_property('k', 2)
+        assert entity.has_attribute('flip') and entity.get_property('k') == 2
+        assert entity.to_dict()['id'] == str(entity.id)
+    
+    def test_sequential_ids_per_engine(self, make_adapter):
+        """Each engine numbers its entities from 1; results carry string ids"""
+        first, second = make_adapter(), make_adapter()
+        for adapter in (first, second):
+            adapter.engine.run_until(until=12)
+            states = adapter.engine._collect_simulation_results(False)['block_states']
+            ids = [entity['id'] for state in states.values() for entity in state['entities']]
+            assert ids == [str(adapter.engine.entity_pool.created)]
+        assert first.engine.entity_pool.created == second.engine.entity_pool.created == 2
+    
+    def test_pool_reuses_disposed_entities(self, make_adapter):
+        """With entity_pool enabled disposed entities are recycled under fresh ids"""
+        adapter = make_adapter(entity_pool=True)
+        adapter.engine.run_until(until=500)
+        pool = adapter.engine.entity_pool
+        assert pool.created == 1
+        assert pool.reused + len(pool.free) == adapter.engine.blocks['2'].total_processed
+        assert pool.reused > 80
+        
+        pool = EntityPool()
+        entity = pool.acquire()
+        pool.release(entity)
+        assert pool.free == [] and pool.acquire().id == 2
+
+
+TAGGING_BLOCKS = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ncreate product\nproduct type(0) = {tag}(red)\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+    {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': 'if product type = {tag}\n    dispose product'},
+]
+
+
+def tagging_blocks(tag):
+    return [{**block, 'script': block['script'].format(tag=tag)} for block in TAGGING_BLOCKS]
+
+
+class TestAttributeTable:
+    """Test that product type attribute bits are scoped to one engine"""
+    
+    def test_engines_do_not_share_attribute_names(self, make_engine):
+        first, second = make_engine(tagging_blocks('engine_a_tag')), make_engine(tagging_blocks('engine_b_tag'))
+        assert first.attributes.names == ['engine_a_tag'] and second.attributes.names == ['engine_b_tag']
+        assert 'engine_a_tag' not in default_attributes.bits and 'engine_b_tag' not in default_attributes.bits
+        
+        # Both names got bit 0 in their own engine; the sink condition matches only its own tag
+        for engine, tag in ((first, 'engine_a_tag'), (second, 'engine_b_tag')):
+            entity = engine.entity_pool.acquire()
+            entity.custom_attributes = [tag]
+            assert entity.attribute_mask == 1 and entity.attribute_list() == [tag]
+            engine.env.run(until=10)
+            assert engine.blocks['2'].total_processed > 0
+    
+    def test_table_is_bounded_across_setups(self, monkeypatch, make_engine):
+        """Past the cap the next setup starts a fresh table and recompiles"""
+        monkeypatch.setattr(simple_simulation_engine, 'MAX_ATTRIBUTE_NAMES', 2)
+        engine = make_engine(tagging_blocks('a'))
+        for tag in ('b', 'c'):
+            engine.setup_simulation({'blocks': tagging_blocks(tag), 'connections': []})
+        assert engine.attributes.names == ['a', 'b', 'c']
+        engine.setup_simulation({'blocks': [{**TAGGING_BLOCKS[1], 'script': TAGGING_BLOCKS[1]['script'].format(tag='d')}],
+                                 'connections': []})
+        assert engine.attributes.names == ['d']
+        engine.env.run(until=1)
@@ -0,0 +1,105 @@
+"""
+Tests for the WebSocket simulation stream
+"""
+
+import asyncio
+import json
+
+from app.simulation_stream import SimulationStream
+
+
+class FakeConnection:
+    """In-memory stand-in for the WebSocket send/receive pair"""
+    
+    def __init__(self):
+        self.sent = []
+        self.commands = asyncio.Queue()
+    
+    async def send(self, message):
+        json.dumps(message)
+        self.sent.append(message)
+    
+    async def receive(self):
+        return await self.commands.get()
+    
+    def of_type(self, kind):
+        return [message for message in self.sent if message['type'] == kind]
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestSimulationStream:
+    """Test throttled frames and client commands"""
+    
+    def test_frames_are_throttled_deltas(self, make_adapter):
+        """Frames are limited by max_fps while the engine runs ahead between them"""
+        async def scenario():
+            adapter = make_adapter()
+            connection = FakeConnection()
+            stream = SimulationStream(adapter, connection.send, max_fps=20, window=0)
+            task = asyncio.create_task(stream.serve(connection.receive))
+            await asyncio.sleep(0.3)
+            await connection.commands.put({'type': 'stop'})
+            await task
+            return adapter, connection
+        
+        adapter, connection = asyncio.run(scenario())
+        frames = connection.of_type('frame')
+        assert not frames[0]['is_delta']
+        assert all(frame['is_delta'] for frame in frames[1:])
+        assert 2 <= len(frames) <= 10
+        assert adapter.engine.env.now > frames[1]['time'] > 0
+    
+    def test_backpressure_window(self, make_adapter):
+        """Without acks no more than window frames are sent; acks release more"""
+        async def scenario():
+            adapter = make_adapter()
+            connection = FakeConnection()
+            stream = SimulationStream(adapter, connection.send, max_fps=100, window=2)
+            task = asyncio.create_task(stream.serve(connection.receive))
+            await asyncio.sleep(0.2)
+            blocked = len(connection.of_type('frame'))
+            await connection.commands.put({'type': 'ack', 'version': stream.version})
+            await wait_for(lambda: len(connection.of_type('frame')) > blocked)
+            await connection.commands.put({'type': 'stop'})
+            await task
+            return blocked, stream
+        
+        blocked, stream = asyncio.run(scenario())
+        assert blocked == 2
+        assert stream.frames_skipped > 0
+    
+    def test_pause_speed_and_breakpoint(self, make_adapter):
+        """Pause stops the engine, speed paces it, breakpoints report and resume"""
+        async def scenario():
+            adapter = make_adapter()
+            connection = FakeConnection()
+            stream = SimulationStream(adapter, connection.send, max_fps=50, speed=100, window=0)
+            task = asyncio.create_task(stream.serve(connection.receive))
+            await asyncio.sleep(0.2)
+            await connection.commands.put({'type': 'pause'})
+            await wait_for(lambda: connection.of_type('status')[-1]['state'] == 'paused')
+            paused_at = adapter.engine.env.now
+            await asyncio.sleep(0.1)
+            still = adapter.engine.env.now
+            
+            await connection.commands.put({'type': 'breakpoint', 'block_id': '2', 'line_number': 1, 'enabled': True})
+            await connection.commands.put({'type': 'resume'})
+            await wait_for(lambda: connection.of_type('status')[-1]['state'] == 'breakpoint')
+            await connection.commands.put({'type': 'breakpoint', 'block_id': '2', 'line_number': 1, 'enabled': False})
+            await connection.commands.put({'type': 'resume'})
+            await asyncio.sleep(0.1)
+            await connection.commands.put({'type': 'stop'})
+            await task
+            return paused_at, still, connection
+        
+        paused_at, still, connection = asyncio.run(scenario())
+        assert 5 <= paused_at <= 40
+        assert still == paused_at
+        assert connection.of_type('breakpoints')[-1]['breakpoints'] == {}
+        assert connection.of_type('frame')[-1]['time'] > paused_at
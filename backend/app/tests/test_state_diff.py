@@ -0,0 +1,143 @@
+"""
+Tests for incremental step responses
+"""
+
+LOG_LINE = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ndelay 5\ncreate product\nlog "created"\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+    {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': 'delay 20\ndispose product'},
+]
+# 배출 block recolours and retags entities in place, without moving them
+TAG_LINE = [
+    {'id': '1', 'name': '투입', 'maxCapacity': 1,
+     'script': 'force execution\ndelay 4\ncreate product\nproduct type += hot(red)\nint made += 1\ngo OUT to 배출.IN(0,1)\nexecute 배출'},
+    {'id': '2', 'name': '배출', 'maxCapacity': 10,
+     'script': 'signal busy = true\ndelay 3\nproduct type -= hot\nproduct type += cold(blue)\nsignal busy = false\ndelay 20\ndispose product'},
+]
+TAG_SIGNALS = [{'name': 'busy', 'type': 'boolean', 'value': False}, {'name': 'made', 'type': 'integer', 'value': 0}]
+
+
+def client_state(result):
+    """Client-side view of a full snapshot: entities, signals and block summaries"""
+    return {
+        'entities': {entity.id: entity for entity in result.active_entities},
+        'signals': dict(result.current_signals),
+        'globals': {signal['id']: signal for signal in result.globalSignals},
+        'blocks': {block_id: {**{key: value for key, value in state.items() if key != 'entities'},
+                              'entity_ids': [entity['id'] for entity in state['entities']]}
+                   for block_id, state in result.block_states.items()},
+    }
+
+
+def merge_delta(state, result):
+    """Client-side merge of every field of an incremental response"""
+    for entity_id in result.removed_entity_ids:
+        del state['entities'][entity_id]
+    state['entities'].update({entity.id: entity for entity in result.active_entities})
+    state['signals'].update(result.current_signals)
+    state['globals'].update({signal['id']: signal for signal in result.globalSignals})
+    state['blocks'].update(result.block_states)
+
+
+def apply_delta(state, result):
+    """Client-side merge of an incremental response"""
+    entities = state.setdefault('entities', {})
+    for entity_id in result.removed_entity_ids or []:
+        entities.pop(entity_id, None)
+    for entity in result.active_entities:
+        entities[entity.id] = entity.current_block_id
+    state.setdefault('logs', []).extend(result.script_logs)
+
+
+class TestStateDiff:
+    """Test the versioned diff protocol"""
+    
+    def test_full_snapshot_without_version(self, make_adapter):
+        """Without since_version every response is a full snapshot, as before"""
+        adapter = make_adapter(LOG_LINE)
+        first = adapter.step_simulation()
+        second = adapter.step_simulation()
+        assert not first.is_delta and not second.is_delta
+        assert (first.version, second.version) == (1, 2)
+        assert len(second.script_logs) >= len(first.script_logs)
+    
+    def test_deltas_reconstruct_full_state(self, make_adapter):
+        """Merging deltas gives the same entities and logs as a full snapshot"""
+        adapter = make_adapter(LOG_LINE)
+        result = adapter.step_simulation()
+        state = {}
+        apply_delta(state, result)
+        
+        for _ in range(30):
+            result = adapter.step_simulation(since_version=result.version)
+            assert result.is_delta
+            apply_delta(state, result)
+        
+        snapshot = adapter.get_snapshot()
+        assert state['entities'] == {e.id: e.current_block_id for e in snapshot.active_entities}
+        assert state['logs'] == snapshot.script_logs
+        assert len(state['logs']) > 1
+    
+    def test_delta_only_carries_changes(self, make_adapter):
+        """Unchanged entities, blocks and old logs are not resent"""
+        adapter = make_adapter(LOG_LINE)
+        result = adapter.step_simulation()
+        for _ in range(20):
+            result = adapter.step_simulation(since_version=result.version)
+        full = adapter.get_snapshot()
+        
+        result = adapter.step_simulation(since_version=full.version)
+        assert len(result.active_entities) < len(full.active_entities)
+        assert len(result.script_logs) <= 1
+        assert all('entities' not in state for state in result.block_states.values())
+    
+    def test_stale_version_gets_snapshot(self, make_adapter):
+        """A client that missed a response is resynchronized with a full snapshot"""
+        adapter = make_adapter(LOG_LINE)
+        first = adapter.step_simulation()
+        adapter.step_simulation(since_version=first.version)
+        result = adapter.step_simulation(since_version=first.version)
+        assert not result.is_delta
+        assert result.removed_entity_ids is None
+    
+    def test_in_place_changes_reconstruct_full_state(self, make_adapter):
+        """Colour, product type and signal changes without movement reach the client through deltas"""
+        adapter = make_adapter(TAG_LINE, globalSignals=TAG_SIGNALS)
+        result = adapter.step_simulation()
+        state = client_state(result)
+        recoloured = False
+        for step in range(60):
+            result = adapter.step_simulation(since_version=result.version)
+            merge_delta(state, result)
+            recoloured |= any(entity.color == 'blue' for entity in result.active_entities)
+            if step % 10 == 9:
+                result = adapter.get_snapshot()
+                assert state == client_state(result)
+        assert recoloured
+        assert state['globals']['int_made']['value'] > 1
+    
+    def test_delta_reads_only_changed_entities(self, make_adapter):
+        """A delta step builds response entries only for entities the journal saw change"""
+        adapter = make_adapter(LOG_LINE)
+        result = adapter.step_simulation()
+        for _ in range(20):
+            result = adapter.step_simulation(since_version=result.version)
+        engine = adapter.engine
+        assert len(engine.blocks['2'].entities_in_block) > 2
+        
+        built = []
+        entity_state = engine.entity_state
+        engine.entity_state = lambda entity: built.append(entity.id) or entity_state(entity)
+        result = adapter.step_simulation(since_version=result.version)
+        assert len(built) == len(result.active_entities) <= 2
+        assert 'entities' not in result.block_states.get('2', {})
+    
+    def test_batch_step_deltas(self, make_adapter):
+        """Batch steps chain deltas from one step to the next"""
+        adapter = make_adapter(LOG_LINE)
+        first = adapter.step_simulation()
+        batch = adapter.batch_step_simulation(5, since_version=first.version)
+        assert batch.version == first.version + 5
+        assert all(step['is_delta'] for step in batch.step_results)
+        assert [step['version'] for step in batch.step_results] == list(range(first.version + 1, batch.version + 1))
+        assert batch.active_entities == []
@@ -0,0 +1,68 @@
+"""
+Tests for MSER-5 warm-up detection and the batch-means stopping rule
+"""
+
+import random
+
+import pytest
+
+from app.models import RunUntilRequest
+from app.steady_state import SteadyStateMonitor, mser_truncation
+
+
+class TestMser:
+    """Test the MSER-5 truncation point"""
+    
+    def test_truncates_initial_transient(self):
+        rng = random.Random(3)
+        values = [i / 5 for i in range(50)] + [10 + rng.gauss(0, 1) for _ in range(250)]
+        cut = mser_truncation(values)
+        assert cut is not None and 40 <= cut < 150
+    
+    def test_stationary_series_keeps_everything(self):
+        rng = random.Random(4)
+        assert mser_truncation([rng.gauss(5, 1) for _ in range(200)]) <= 20
+    
+    def test_trend_needs_more_data(self):
+        """A series still trending has its minimum at the search limit - no valid cut yet"""
+        assert mser_truncation([float(i) for i in range(200)]) is None
+        assert mser_truncation([1.0] * 10) is None
+    
+    def test_monitor_validates_options(self):
+        with pytest.raises(ValueError):
+            SteadyStateMonitor(kpi='lead_time')
+        with pytest.raises(ValueError):
+            SteadyStateMonitor(tolerance=0)
+
+
+class TestSteadyStateRun:
+    """Test automatic statistics reset and early stopping in run_until"""
+    
+    @pytest.mark.parametrize('kernel', ['simpy', 'native'])
+    def test_stops_when_half_width_is_small(self, kernel, make_engine, random_line):
+        engine = make_engine(random_line, kernel, seed=11)
+        result = engine.run_until(until=10 ** 6, steady_state={'sample_interval': 60, 'tolerance': 0.02, 'batches': 10})
+        steady = result['steady_state']
+        assert result['stop_reason'] == 'steady_state' and steady['converged']
+        assert result['simulation_time'] < 10 ** 6
+        assert steady['half_width'] <= 0.02 * steady['mean']
+        # The estimate agrees with a long fixed-horizon run
+        reference = make_engine(random_line, kernel, seed=11).run_until(until=50000)['throughput_per_hour']
+        assert steady['ci_low'] - 2 * steady['half_width'] <= reference <= steady['ci_high'] + 2 * steady['half_width']
+        assert 0 <= steady['warmup_time'] <= steady['warmup_detected_at']
+        
+        # Block statistics were restarted when the warm-up was detected
+        sink = result['block_statistics']['2']
+        assert 0 < sink['departures'] < engine.blocks['2'].total_processed
+        assert sum(sink['state_time'].values()) == pytest.approx(result['simulation_time'] - steady['warmup_detected_at'])
+    
+    def test_runs_to_horizon_when_tolerance_is_not_met(self, make_engine, random_line):
+        result = make_engine(random_line, seed=11).run_until(until=3000, steady_state={'sample_interval': 60, 'tolerance': 1e-6})
+        assert result['stop_reason'] == 'time'
+        assert result['steady_state']['converged'] is False and result['steady_state']['samples'] == 50
+    
+    def test_adapter_request(self, make_adapter, random_line):
+        adapter = make_adapter(random_line, seed=2)
+        result = adapter.run_until(RunUntilRequest(steady_state={'kpi': 'wip', 'tolerance': 0.2, 'sample_interval': 30},
+                                                   include_snapshot=False))
+        assert result.stop_reason == 'steady_state' and result.steady_state['kpi'] == 'wip'
@@ -0,0 +1,87 @@
+"""
+Tests for the slot-indexed variable store
+"""
+
+import simpy
+
+from app.core.integer_variable_manager import IntegerVariableManager
+from app.core.variable_store import BOOLEAN, INTEGER, VariableStore
+from app.simple_condition_compiler import compile_condition, parse_condition
+from app.simple_signal_manager import SimpleSignalManager
+
+
+class TestVariableStore:
+    """Test slot resolution, versions and the manager facades"""
+    
+    def test_slots_survive_initialize_and_reset(self):
+        """A slot resolved before a variable exists keeps working across initialize/reset"""
+        store = VariableStore()
+        signals = SimpleSignalManager(store)
+        integers = IntegerVariableManager(store)
+        slot = store.slot(INTEGER, 'count')
+        assert store.values[slot] is None
+        
+        integers.initialize_variables({'count': 3})
+        assert store.slot(INTEGER, 'count') == slot
+        assert store.values[slot] == 3
+        integers.set_variable('count', 7)
+        integers.reset()
+        assert store.values[slot] == 3
+        
+        # Same name, separate namespace
+        signals.initialize_signals({'count': True})
+        assert store.slot(BOOLEAN, 'count') != slot
+        assert integers.get_variable('count') == 3
+        assert signals.get_signal('count') is True
+        
+        integers.initialize_variables({})
+        assert store.values[slot] is None
+        assert 'count' not in integers.variables
+        assert signals.signals.copy() == {'count': True}
+    
+    def test_versions(self):
+        """Only real changes bump the version; changed_since reports the touched slots"""
+        store = VariableStore()
+        signals = SimpleSignalManager(store)
+        signals.initialize_signals({'a': False, 'b': False})
+        version = store.version
+        
+        signals.set_signal('a', False)
+        assert store.version == version
+        signals.set_signal('b', True)
+        assert store.version == version + 1
+        assert store.changed_since(version) == [store.find(BOOLEAN, 'b')]
+    
+    def test_compiled_condition_reads_slots(self):
+        """Compiled conditions see later definitions and changes through their bound slots"""
+        store = VariableStore()
+        signals = SimpleSignalManager(store)
+        integers = IntegerVariableManager(store)
+        evaluate = compile_condition(parse_condition('count >= 2 and ready = true'), store, store)
+        assert not evaluate(None, None)
+        
+        signals.set_signal('ready', True)
+        integers.add_variable('count', 1)
+        assert not evaluate(None, None)
+        integers.perform_operation('count', '+=', 1)
+        assert evaluate(None, None)
+    
+    def test_subscription(self):
+        """Subscribers wake only on an actual change and are dropped on reset"""
+        env = simpy.Environment()
+        store = VariableStore()
+        signals = SimpleSignalManager(store)
+        signals.initialize_signals({'go': False})
+        
+        event = env.event()
+        signals.subscribe('go', event)
+        signals.set_signal('go', False)
+        assert not event.triggered
+        signals.set_signal('go', True)
+        assert event.triggered
+        
+        stale = env.event()
+        signals.subscribe('go', stale)
+        signals.reset()
+        signals.set_signal('go', True)
+        assert not stale.triggered
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+시뮬레이션 엔진 벤치마크
+HTTP 오버헤드 없이 엔진을 지정된 시뮬레이션 시간만큼 실행하고
+처리된 SimPy 이벤트 수와 실행 속도를 측정합니다.
+
+사용 예:
+    python benchmark_engine.py --horizon 3600 ../ex3_simple_v2.json ../병렬공정1.json
+    python benchmark_engine.py --script-passes 20000
+    python benchmark_engine.py --idle-blocks 0 10 50 200
+    python benchmark_engine.py --entities 100000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import simpy
+
+# 프로젝트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models import SimulationSetup
+from app.simple_block import IndependentBlock
+from app.simple_entity import EntityPool, SimpleEntity
+from app.simple_signal_manager import SimpleSignalManager
+from app.core.integer_variable_manager import IntegerVariableManager
+from app.core.unified_variable_accessor import UnifiedVariableAccessor
+from app.simple_engine_adapter import SimpleEngineAdapter
+from app.routes.simulation import convert_config_ids_to_strings, convert_global_signals_to_initial_signals
+
+DEFAULT_CONFIGS = ["../ex3_simple_v2.json", "../병렬공정1.json", "../simulation-config.json"]
+
+# 스크립트 마이크로벤치마크용 공정 스크립트 (엔티티 1개가 블록을 통과할 때 실행되는 전형적인 명령 조합)
+MICRO_SCRIPT = [
+    "// 공정 처리 스크립트",
+    "product type(0) = raw(blue)",
+    "if product type = raw",
+    "\tint count += 1",
+    "elif 완료 = true",
+    "\tdelay 1",
+    "else",
+    "\t완료 = true",
+    "product type += done(green)",
+    "product type -= raw",
+    "int total += count",
+    "if total >= 0 and 완료 = false",
+    "\t완료 = true",
+    "wait 완료 = true",
+    "delay 0.5-1.5",
+    "완료 = false",
+]
+
+# 유휴 블록 확장성 벤치마크용 모델: 5초마다 제품을 만들어 배출 블록으로 보내는 라인 하나
+IDLE_SOURCE_SCRIPT = "force execution\ndelay 5\ncreate product\ngo OUT to 배출.IN(0,1)\nexecute 배출"
+IDLE_SINK_SCRIPT = "dispose product"
+
+
+def load_simple_config(config_path: str) -> dict:
+    """/simulation/setup과 동일한 변환 과정을 거쳐 엔진 설정을 만든다"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_data = json.load(f)
+    
+    config_data = convert_config_ids_to_strings(config_data)
+    config_data["initial_signals"] = convert_global_signals_to_initial_signals(config_data)
+    
+    adapter = SimpleEngineAdapter()
+    try:
+        setup = SimulationSetup(**config_data)
+        return adapter.convert_setup_to_simple_format(setup)
+    except Exception:
+        # 구형 설정 파일은 엔진에 직접 전달
+        return config_data
+
+
+def run_benchmark(config_path: str, horizon: float) -> dict:
+    """설정 파일 하나를 horizon초까지 실행하고 측정값을 반환"""
+    simple_config = load_simple_config(config_path)
+    
+    adapter = SimpleEngineAdapter()
+    adapter.reset_simulation()
+    engine = adapter.engine
+    engine.setup_simulation(simple_config)
+    
+    result = run_engine(engine, horizon)
+    result['config'] = os.path.basename(config_path)
+    return result
+
+
+def run_engine(engine, horizon: float) -> dict:
+    """설정된 엔진을 horizon초까지 실행하며 이벤트 수와 최대 이벤트 큐 크기를 측정"""
+    env = engine.env
+    events = 0
+    max_queue = 0
+    start = time.perf_counter()
+    while env.peek() <= horizon:
+        env.step()
+        events += 1
+        # 시작 시점의 프로세스 초기화 이벤트는 제외하고 측정
+        if env.now > 0 and len(env._queue) > max_queue:
+            max_queue = len(env._queue)
+    wall = time.perf_counter() - start
+    
+    return {
+        'horizon': horizon,
+        'events': events,
+        'max_queue': max_queue,
+        'wall_time': wall,
+        'events_per_sim_second': events / horizon if horizon else 0.0,
+        'sim_seconds_per_wall_second': horizon / wall if wall else float('inf'),
+        'entities_processed': sum(block.total_processed for block in engine.blocks.values()),
+    }
+
+
+def run_idle_scaling_benchmark(idle_blocks: int, horizon: float) -> dict:
+    """생산 라인 하나에 할 일이 없는 블록 idle_blocks개를 추가하여 실행"""
+    blocks = [
+        {'id': '1', 'name': '투입', 'maxCapacity': 1, 'script': IDLE_SOURCE_SCRIPT},
+        {'id': '2', 'name': '배출', 'maxCapacity': 10, 'script': IDLE_SINK_SCRIPT},
+    ]
+    for index in range(idle_blocks):
+        blocks.append({'id': str(index + 3), 'name': f'유휴{index + 1}', 'maxCapacity': 1, 'script': '// 대기'})
+    
+    adapter = SimpleEngineAdapter()
+    adapter.reset_simulation()
+    engine = adapter.engine
+    engine.setup_simulation({'blocks': blocks, 'connections': []})
+    
+    result = run_engine(engine, horizon)
+    result['idle_blocks'] = idle_blocks
+    return result
+
+
+def run_script_microbenchmark(passes: int) -> dict:
+    """블록 하나에서 MICRO_SCRIPT를 passes회 실행하고 1회당 실행 비용을 측정"""
+    signal_manager = SimpleSignalManager()
+    signal_manager.initialize_signals({'완료': False})
+    integer_manager = IntegerVariableManager()
+    integer_manager.initialize_variables({'count': 0, 'total': 0})
+    variable_accessor = UnifiedVariableAccessor(signal_manager, integer_manager)
+    
+    block = IndependentBlock('1', '공정1', MICRO_SCRIPT, signal_manager, 1, integer_manager, variable_accessor)
+    entity = SimpleEntity()
+    block.add_entity(entity)
+    
+    env = simpy.Environment()
+    
+    def driver():
+        for _ in range(passes):
+            yield from block.process_entity(env, entity)
+    
+    env.process(driver())
+    start = time.perf_counter()
+    env.run()
+    wall = time.perf_counter() - start
+    
+    return {
+        'passes': passes,
+        'wall_time': wall,
+        'us_per_pass': wall / passes * 1e6 if passes else 0.0,
+    }
+
+
+def run_entity_benchmark(count: int) -> dict:
+    """엔티티 count개의 메모리(살아 있는 엔티티 1개당 바이트)와 생성 속도를 EntityPool 재사용 유무별로 측정"""
+    # 메모리: 엔티티를 모두 살려 둔 상태에서 할당된 바이트 (목록 자체 제외)
+    entities = [None] * count
+    pool = EntityPool()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(count):
+        entities[index] = pool.acquire()
+    bytes_per_entity = (tracemalloc.get_traced_memory()[0] - before) / count if count else 0.0
+    tracemalloc.stop()
+    del entities
+    
+    # 생성 속도: 생성 직후 배출하는 라인처럼 acquire/release 반복 (재사용이 꺼져 있으면 매번 새로 할당)
+    rates = {}
+    for enabled in (False, True):
+        pool = EntityPool(enabled=enabled)
+        start = time.perf_counter()
+        for _ in range(count):
+            pool.release(pool.acquire())
+        wall = time.perf_counter() - start
+        rates[enabled] = {'wall_time': wall, 'per_second': count / wall if wall else float('inf'),
+                          'created': pool.created, 'reused': pool.reused}
+    
+    return {
+        'entities': count,
+        'bytes_per_entity': bytes_per_entity,
+        'unpooled': rates[False],
+        'pooled': rates[True],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시뮬레이션 엔진 벤치마크")
+    parser.add_argument('configs', nargs='*', default=DEFAULT_CONFIGS, help="설정 파일 경로")
+    parser.add_argument('--horizon', type=float, default=3600.0, help="시뮬레이션 시간(초)")
+    parser.add_argument('--script-passes', type=int, default=0, help="스크립트 마이크로벤치마크 반복 횟수 (0이면 생략)")
+    parser.add_argument('--idle-blocks', type=int, nargs='*', default=[], help="유휴 블록 확장성 벤치마크의 유휴 블록 수 목록")
+    parser.add_argument('--entities', type=int, default=0, help="엔티티 메모리/생성 속도 벤치마크의 엔티티 수 (0이면 생략)")
+    args = parser.parse_args()
+    
+    # 로그 출력이 측정값을 왜곡하지 않도록 비활성화
+    logging.disable(logging.CRITICAL)
+    
+    print(f"{'config':32s} {'events':>10s} {'max queue':>10s} {'wall(s)':>9s} {'events/sim-s':>13s} {'sim-s/wall-s':>13s} {'processed':>10s}")
+    for config_path in args.configs:
+        result = run_benchmark(config_path, args.horizon)
+        print(f"{result['config']:32s} {result['events']:>10d} {result['max_queue']:>10d} {result['wall_time']:>9.2f} "
+              f"{result['events_per_sim_second']:>13.1f} {result['sim_seconds_per_wall_second']:>13.1f} "
+              f"{result['entities_processed']:>10d}")
+    
+    if args.idle_blocks:
+        print(f"\n{'idle blocks':>11s} {'events':>10s} {'max queue':>10s} {'wall(s)':>9s} {'events/sim-s':>13s} {'processed':>10s}")
+        for idle_blocks in args.idle_blocks:
+            result = run_idle_scaling_benchmark(idle_blocks, args.horizon)
+            print(f"{result['idle_blocks']:>11d} {result['events']:>10d} {result['max_queue']:>10d} {result['wall_time']:>9.2f} "
+                  f"{result['events_per_sim_second']:>13.1f} {result['entities_processed']:>10d}")
+    
+    if args.script_passes:
+        result = run_script_microbenchmark(args.script_passes)
+        print(f"\nscript microbenchmark: {result['passes']} passes, {result['wall_time']:.2f}s, "
+              f"{result['us_per_pass']:.1f} us/pass")
+    
+    if args.entities:
+        result = run_entity_benchmark(args.entities)
+        print(f"\nentity benchmark: {result['entities']} entities, {result['bytes_per_entity']:.0f} bytes/entity")
+        for mode in ('unpooled', 'pooled'):
+            rate = result[mode]
+            print(f"  {mode:9s} {rate['per_second']:>12,.0f} entities/s  "
+                  f"(created {rate['created']}, reused {rate['reused']}, {rate['wall_time']:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
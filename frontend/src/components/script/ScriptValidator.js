@@ -102,9 +102,12 @@ function validateScriptLine(line, lowerLine, lineNum, props) {
   else if (line.includes('product type +=') || line.includes('product type -=')) {
     // product type 명령은 유효함 - 에러 없음
   }
-  else if (line.trim() === 'create product' || line.trim() === 'dispose product' || line.trim() === 'force execution') {
+  else if (line.trim() === 'create product' || line.trim() === 'dispose product' || line.trim() === 'force execution' || line.trim() === 'yield') {
     // 엔티티 관련 명령어는 유효함 - 에러 없음
   }
+  else if (lowerLine.startsWith('seize ') || lowerLine.startsWith('release ')) {
+    // 공유 자원 점유/반환 (seize 작업자 [priority N] / release 작업자)
+  }
   else {
     errors.push(`라인 ${lineNum}: 인식되지 않는 명령어 "${line}"`)
   }
@@ -321,14 +324,41 @@ function validateSingleWaitCondition(condition, lineNum, props) {
   return errors
 }
 
+// go ... to any(...) 디스패치 규칙 (backend dispatch.DISPATCH_RULES와 같음)
+const DISPATCH_RULES = ['first_free', 'round_robin', 'shortest_queue', 'least_utilized']
+
 /**
  * go 문 검증 (새로운 형식: go R to 블록.커넥터(0,3))
  */
 function validateGotoStatement(line, lineNum, props) {
   const errors = []
   
-  // 새로운 go 형식 파싱: go R to 블록.커넥터(0,3)
-  const goPattern = /^go\s+([^\s]+)\s+to\s+([^(]+)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?$/i
+  // 디스패치 형식: go R to any(블록1.커넥터, 블록2.커넥터)(0,3) [by 규칙] [wait [priority N]]
+  const anyPattern = /^go\s+([^\s]+)\s+to\s+any\(([^)]*)\)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+by\s+(\w+))?(?:\s+wait(?:\s+priority\s+-?\d+)?)?$/i
+  const anyMatch = line.match(anyPattern)
+  if (anyMatch) {
+    const rule = anyMatch[5]
+    if (rule && !DISPATCH_RULES.includes(rule.toLowerCase())) {
+      errors.push(`라인 ${lineNum}: 알 수 없는 디스패치 규칙 "${rule}" (사용 가능: ${DISPATCH_RULES.join(', ')})`)
+    }
+    const candidates = anyMatch[2].split(',').map(c => c.trim()).filter(c => c)
+    if (candidates.length === 0) {
+      errors.push(`라인 ${lineNum}: any()에 후보 블록이 없습니다 (예: go R to any(공정1.L, 공정2.L))`)
+    }
+    for (const candidate of candidates) {
+      const [blockName, connectorName] = candidate.split('.')
+      const targetBlock = props.allBlocks.find(b => b.name === blockName.trim())
+      if (!targetBlock) {
+        errors.push(`라인 ${lineNum}: 존재하지 않는 블록: ${blockName}`)
+      } else if (connectorName && !targetBlock.connectionPoints?.some(cp => cp.name === connectorName.trim())) {
+        errors.push(`라인 ${lineNum}: 블록 "${blockName}"에 "${connectorName}" 커넥터가 없습니다`)
+      }
+    }
+    return errors
+  }
+  
+  // 새로운 go 형식 파싱: go R to 블록.커넥터(0,3) [wait [priority N]]
+  const goPattern = /^go\s+([^\s]+)\s+to\s+([^(]+?)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+wait(?:\s+priority\s+-?\d+)?)?$/i
   const match = line.match(goPattern)
   
   if (!match) {
@@ -633,7 +663,10 @@ function parseScriptLineToAction(line, lowerLine, lineNumber, actionCounter, pro
   else if (line.includes('product type +=') || line.includes('product type -=')) {
     return parseProductTypeAction(line, actionCounter)
   }
-  else if (line.trim() === 'create product' || line.trim() === 'dispose product' || line.trim() === 'force execution') {
+  else if (line.trim() === 'create product' || line.trim() === 'dispose product' || line.trim() === 'force execution' || line.trim() === 'yield') {
+    return parseScriptAction(line, actionCounter)
+  }
+  else if (lowerLine.startsWith('seize ') || lowerLine.startsWith('release ')) {
     return parseScriptAction(line, actionCounter)
   }
   else {
@@ -255,6 +255,29 @@ export function useBlocks() {
       }
     }
     
+    // "go 커넥터명 to any(블록명.커넥터명, ...)" 패턴 찾기 (디스패치 후보마다 연결)
+    const goAnyRegex = /go\s+([^\s]+)\s+to\s+any\(([^)]*)\)/gi
+    
+    while ((match = goAnyRegex.exec(script)) !== null) {
+      const fromConnector = sourceBlock?.connectionPoints?.find(cp => cp.name === match[1].trim())
+      if (!fromConnector) continue
+      
+      for (const candidate of match[2].split(',')) {
+        const [targetBlockName, targetConnectorName] = candidate.trim().split('.')
+        const targetBlock = blocks.value.find(b => b.name === targetBlockName)
+        const targetConnector = targetBlock?.connectionPoints?.find(cp => cp.name === targetConnectorName)
+        if (targetConnector) {
+          connections.push({
+            from_block_id: String(sourceBlockId),
+            from_connector_id: fromConnector.id,
+            to_block_id: String(targetBlock.id),
+            to_connector_id: targetConnector.id,
+            from_conditional_script: true
+          })
+        }
+      }
+    }
+    
     // "go from 커넥터명 to 블록명.커넥터명" 패턴 찾기 (이전 형식 - 하위 호환성)
     const goFromToRegex = /go\s+from\s+([^\s]+)\s+to\s+([^.\s]+)\.([^,\s]+)/gi
     goFromToRegex.lastIndex = 0 // 정규식 재설정
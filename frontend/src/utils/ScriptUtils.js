@@ -190,9 +190,24 @@ export function validateScript(script, allSignals, allBlocks, currentBlock, enti
         validateSingleWaitCondition(waitPart, lineNum, errors, allSignals)
       }
     }
+    else if (/^go\s+[^\s]+\s+to\s+any\(/i.test(line)) {
+      // 디스패치 형식: go R to any(공정1.L, 공정2.L) [by 규칙] [wait [priority N]]
+      const anyPattern = /^go\s+([^\s]+)\s+to\s+any\(([^)]*)\)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+by\s+(first_free|round_robin|shortest_queue|least_utilized))?(?:\s+wait(?:\s+priority\s+-?\d+)?)?$/i
+      const anyMatch = line.match(anyPattern)
+      if (!anyMatch) {
+        errors.push(`라인 ${lineNum}: 잘못된 go any 형식 (예: go R to any(공정1.L, 공정2.L) by round_robin wait)`)
+      } else {
+        for (const candidate of anyMatch[2].split(',').map(c => c.trim()).filter(c => c)) {
+          const blockName = candidate.split('.')[0].trim()
+          if (!allBlocks.find(b => b.name.toLowerCase() === blockName.toLowerCase())) {
+            errors.push(`라인 ${lineNum}: 존재하지 않는 블록: ${blockName}`)
+          }
+        }
+      }
+    }
     else if (lowerLine.startsWith('go ') && !lowerLine.startsWith('go to ')) {
       // 새로운 "go R to 공정1.L(0,3)" 형식
-      const goPattern = /^go\s+([^\s]+)\s+to\s+([^(]+)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?$/i
+      const goPattern = /^go\s+([^\s]+)\s+to\s+([^(]+?)(?:\((\d+)(?:,\s*(\d+(?:\.\d+)?))?\))?(?:\s+wait(?:\s+priority\s+-?\d+)?)?$/i
       const match = line.match(goPattern)
       
       if (!match) {
@@ -322,6 +337,15 @@ export function validateScript(script, allSignals, allBlocks, currentBlock, enti
     else if (lowerLine === 'dispose product') {
       // dispose product 명령은 항상 유효함
     }
+    else if (lowerLine === 'yield') {
+      // yield 명령(명시적 양보 지점)은 항상 유효함
+    }
+    else if (lowerLine.startsWith('seize ') || lowerLine.startsWith('release ')) {
+      // 공유 자원 점유/반환 (seize 작업자 [priority N] / release 작업자)
+      if (!/^(seize\s+\S.*?(\s+priority\s+-?\d+)?|release\s+\S.*)$/i.test(line.trim())) {
+        errors.push(`라인 ${lineNum}: 잘못된 자원 명령 형식 (예: seize 작업자 priority 1, release 작업자)`)
+      }
+    }
     else if (lowerLine === 'force execution') {
       // force execution 명령은 첫 번째 줄에만 유효함
       if (lineNum !== 1) {